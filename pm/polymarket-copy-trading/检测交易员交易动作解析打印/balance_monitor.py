@@ -72,6 +72,8 @@ class IntegratedMonitor:
         self.position_cache = {}
         self.trader_positions_cache = {}
         self.shared_positions_cache = {}
+        # 交易员持仓缓存修订号，每次保存递增，供调用方判断派生索引是否需要重建
+        self.trader_positions_revision = 0
 
         self.api_url = "https://data-api.polymarket.com/positions"
         self.config = get_config()
@@ -400,6 +402,7 @@ class IntegratedMonitor:
     def save_trader_positions_to_cache(self, trader_positions: Dict[str, List[Dict]]):
         """保存交易员持仓数据到内存变量"""
         self.trader_positions_cache = trader_positions
+        self.trader_positions_revision += 1
 
     async def update_trader_positions(self):
         """更新所有交易员的持仓数据（已禁用，改为只更新共同持仓）"""
@@ -88,6 +88,9 @@ class SecureConfig:
         # ===== 监控配置 =====
         self.order_check_interval: int = 10
 
+        # ===== 性能配置 =====
+        self.clob_thread_pool_size: int = 12
+
         # ===== 调试配置 =====
         self.enable_debug_logging: bool = False
 
@@ -225,6 +228,11 @@ class SecureConfig:
             self.order_check_interval = int(os.getenv("ORDER_CHECK_INTERVAL", "10"))
         except ValueError:
             self.order_check_interval = 10
+
+        try:
+            self.clob_thread_pool_size = max(1, int(os.getenv("CLOB_THREAD_POOL_SIZE", "12")))
+        except ValueError:
+            self.clob_thread_pool_size = 12
         
         # 市场标题黑名单
         try:
@@ -18,21 +18,229 @@ import os
 import sys
 import logging
 import math
+import itertools
+import tempfile
+import contextvars
+import functools
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
 from dataclasses import dataclass, asdict
 from config import Config, logger, TRADER_NICKNAME_CACHE
 from enrichment_service import EnrichmentService
 
+# 可选：orjson 解析更快，未安装时回退到 aiohttp 自带的标准库 json 解析
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+async def _read_json(response: aiohttp.ClientResponse):
+    """读取并解析响应体 JSON"""
+    if HAS_ORJSON:
+        return orjson.loads(await response.read())
+    return await response.json()
+
+_compact_json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+def _loads(raw: bytes):
+    """解析 JSON 字节串"""
+    if HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _dumps(obj) -> str:
+    """紧凑 JSON 序列化（用于日志 payload）"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return _compact_json_encoder.encode(obj)
+
+def _dumps_file(obj) -> bytes:
+    """缩进 2 格的 UTF-8 JSON（用于 data/ 缓存文件，格式与 json.dump(indent=2, ensure_ascii=False) 一致）"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+# 去重集合上限：信号有效期只有 SIGNAL_EXPIRY 秒，更早的哈希即使被淘汰也会被时效检查拦截
+PROCESSED_SIGNALS_MAX = 100_000
+
+# 订单记录上限：超过后优先淘汰最早的终态订单（filled/cancelled/expired），没有终态订单时淘汰最早的
+ORDERS_CACHE_MAX = 10_000
+ORDER_TERMINAL_STATUSES = frozenset(('filled', 'cancelled', 'expired'))
+
+# 后台持仓更新队列上限：超过后丢弃新的更新请求，避免API异常时无限堆积
+POSITION_UPDATE_QUEUE_SIZE = 1024
+
+# data/ 下 JSON 缓存文件的落盘间隔（秒）：期间的多次更新合并为一次写入
+CACHE_FLUSH_INTERVAL = 0.25
+
+# JSON 缓存文件目录（相对当前工作目录）
+DATA_DIR = "data"
+
+# 余额/持仓查询结果的缓存有效期（秒），见 TradeExecutionService._cached_lookup
+# 同一交易员/token 的连续信号复用一次查询；我们下单成功或持仓刷新后会主动失效
+BALANCE_LOOKUP_TTL = 0.5
+POSITION_LOOKUP_TTL = 0.5
+TRADER_POSITION_LOOKUP_TTL = 2.0
+# 查询缓存条目上限：超过后淘汰最早写入的（条目最多只有效 TRADER_POSITION_LOOKUP_TTL 秒）
+LOOKUP_CACHE_MAX = 4096
+
+# CLOB API 凭证复用时长（秒）：期间下单不再重新派生；服务端返回 401 时提前失效并重试一次
+API_CREDS_TTL = 600
+
+# CLOB 允许的下单价格区间（服务端拒绝 >0.99）
+PRICE_CAP_MIN = 0.001
+PRICE_CAP_MAX = 0.99
+
+# BUY 最小下单约束（按已观测到的服务端硬性规则）：最小股数 5，最小名义金额 $1
+BUY_MIN_SHARES = 5.0
+BUY_MIN_NOTIONAL = 1.0
+
+# 交易员显示信息缓存: 原始地址 -> "昵称 (地址)"
+# 只缓存已命中昵称的地址；昵称在启动后才写入 TRADER_NICKNAME_CACHE，未命中时不缓存以免固化为纯地址
+_TRADER_DISPLAY_CACHE: Dict[str, str] = {}
+
 def get_trader_display_info(trader_address: str) -> str:
     """获取交易员显示信息（昵称或地址）"""
     if not trader_address:
         return "未知交易员"
-    
-    trader_address = trader_address.lower()
-    if trader_address in TRADER_NICKNAME_CACHE:
-        return f"{TRADER_NICKNAME_CACHE[trader_address]} ({trader_address})"
-    return trader_address
+
+    cached = _TRADER_DISPLAY_CACHE.get(trader_address)
+    if cached is not None:
+        return cached
+
+    address_lower = trader_address.lower()
+    nickname = TRADER_NICKNAME_CACHE.get(address_lower)
+    if nickname is None:
+        return address_lower
+
+    display = f"{nickname} ({address_lower})"
+    _TRADER_DISPLAY_CACHE[trader_address] = display
+    return display
+
+def _net_position_from_activities(activities: List[Dict[str, Any]], token_id: str):
+    """
+    按 token 汇总 data-api /activity 记录的净持仓（买入 - 卖出）。
+
+    返回 (net_position, matching_activities)。
+    先按 asset 过滤再解析 side/size，不匹配的记录不做任何字符串/浮点转换。
+    """
+    net_position = 0.0
+    matching_activities = 0
+    for activity in activities:
+        if str(activity.get('asset', '')) != token_id:
+            continue
+
+        matching_activities += 1
+        side = activity.get('side', '').upper()
+        if side == 'BUY':
+            net_position += float(activity.get('size', 0))
+        elif side == 'SELL':
+            net_position -= float(activity.get('size', 0))
+
+    return net_position, matching_activities
+
+def _clamp_premium_price(is_buy: bool, price_f: float, premium: float) -> float:
+    """
+    溢价定价的纯数值核心（不含日志/跳过判断）。
+
+    - BUY: price + premium，clamp 到 [0.001, 0.99]
+    - SELL: price - premium，clamp 到 [0.01, 0.99]
+    """
+    if is_buy:
+        return min(max(price_f + premium, PRICE_CAP_MIN), PRICE_CAP_MAX)
+    return min(max(price_f - premium, 0.01), PRICE_CAP_MAX)
+
+def _build_orderbook_extractor(orderbook) -> Optional[Callable[[Any, str], Optional[float]]]:
+    """
+    按 orderbook 的实际结构生成取价函数 extract(orderbook, 'asks'|'bids') -> 最优价（该侧为空时返回 None）。
+
+    py-clob-client 不同版本返回 OrderBookSummary 对象或 dict，价位可能是对象 / dict / (price, size) 元组；
+    结构在进程内不会变化，探测一次后由调用方缓存，避免每次取价都走 hasattr/isinstance 判断。
+    无法判断结构（如两侧都为空）时返回 None，下次再探测。
+    """
+    if isinstance(orderbook, dict):
+        def get_levels(ob, key):
+            return ob.get(key) or []
+    elif hasattr(orderbook, 'bids') and hasattr(orderbook, 'asks'):
+        def get_levels(ob, key):
+            return getattr(ob, key) or []
+    else:
+        return None
+
+    levels = get_levels(orderbook, 'asks') or get_levels(orderbook, 'bids')
+    if not levels:
+        return None
+
+    sample = levels[0]
+    if hasattr(sample, 'price'):
+        def level_price(level):
+            return float(level.price)
+    elif isinstance(sample, (list, tuple)):
+        def level_price(level):
+            return float(level[0])
+    elif isinstance(sample, dict):
+        def level_price(level):
+            return float(level['price'])
+    else:
+        return None
+
+    def extract(ob, key):
+        side_levels = get_levels(ob, key)
+        return level_price(side_levels[0]) if side_levels else None
+
+    return extract
+
+def _buy_minimum_shares(amount: float, price: float):
+    """
+    BUY 最小股数规则的纯数值核心（不含日志/跳过判断，price 必须 > 0）。
+
+    返回 (raw_shares, final_shares, final_amount)：
+    raw_shares = amount / price，final_shares = max(raw_shares, BUY_MIN_SHARES)，final_amount = final_shares * price
+    """
+    raw_shares = amount / price
+    final_shares = raw_shares if raw_shares > BUY_MIN_SHARES else BUY_MIN_SHARES
+    return raw_shares, final_shares, final_shares * price
+
+async def _to_thread(executor, func, *args):
+    """
+    在 executor（为 None 时用事件循环默认线程池）中执行同步调用（asyncio.to_thread 的精简版）。
+
+    仍会 copy_context()（与 asyncio.to_thread 相同），但上下文为空时直接提交 func，
+    省去 functools.partial + ctx.run 的包装；有 contextvar 时与 asyncio.to_thread 行为一致。
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    if not ctx:
+        return await loop.run_in_executor(executor, func, *args)
+    return await loop.run_in_executor(executor, functools.partial(ctx.run, func, *args))
+
+@functools.lru_cache(maxsize=None)
+def _data_path(name: str) -> str:
+    """data/<name> 的路径（缓存文件名是固定的几个，拼接结果直接复用）"""
+    return os.path.join(DATA_DIR, name)
+
+def _atomic_write_json(path: str, data) -> None:
+    """写入 JSON 文件：先写同目录临时文件再 os.replace，读取方不会读到写了一半的文件"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_dumps_file(data))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _is_auth_error(e: Exception) -> bool:
+    """判断下单异常是否为 API 凭证失效（HTTP 401）"""
+    return getattr(e, 'status_code', None) == 401 or 'unauthorized' in str(e).lower()
 
 # Polymarket CLOB client
 try:
@@ -59,9 +267,9 @@ except ImportError as e:
     BUY = 'BUY'
     SELL = 'SELL'
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradeSignal:
-    """交易信号数据结构"""
+    """交易信号数据结构（构造后不可变；去重状态由 TradeExecutionService.processed_signals 维护）"""
     # 来源信息
     source_address: str        # 交易员地址 (maker/taker)
     original_tx_hash: str      # 原始交易哈希
@@ -83,7 +291,7 @@ class TradeSignal:
     price: float = None       # 交易员成交价格 (每股价格)
     shares: float = None      # 购买/卖出股数
 
-@dataclass
+@dataclass(slots=True)
 class OrderStatus:
     """订单状态数据结构"""
     order_id: str            # 订单ID
@@ -106,9 +314,12 @@ class TradeExecutionService:
         self.memory_monitor = memory_monitor  # 内存监控实例
 
         # 内存缓存数据结构
-        self.processed_signals = set()  # 去重集合: signal_tx_hash
-        self.orders_cache = {}          # 订单状态缓存: order_id -> OrderStatus
+        self.processed_signals = OrderedDict()  # 去重LRU: signal_tx_hash -> None（上限 PROCESSED_SIGNALS_MAX）
+        self._signal_inflight: Dict[str, asyncio.Future] = {}  # 处理中的信号: signal_tx_hash -> 结果 Future（singleflight）
+        self.orders_cache = OrderedDict()  # 订单状态LRU: order_id -> OrderStatus（经 _store_order / _set_order_status 修改，上限 ORDERS_CACHE_MAX）
+        self._order_status_counts = Counter()  # 各状态订单数: status -> count，与 orders_cache 同步维护
         self.positions_cache = {}       # 持仓信息缓存: token_id -> position_info
+        self._client_order_seq = itertools.count(1)  # client_order_id 序号（进程内递增；与毫秒时间戳组合，跨重启也不重复）
 
         # 钱包切换配置
         wallet_switch = config.wallet_switch
@@ -129,25 +340,103 @@ class TradeExecutionService:
             self.wallet_type = "本地钱包(默认)"
             logger.warning(f"[TRADE] 无效的钱包切换配置 {wallet_switch}，使用默认本地钱包")
 
+        # 代理钱包模式下单由代理钱包扣款，余额检查时不预留 gas 费
+        self._is_proxy_wallet = self.wallet_type == "代理钱包"
+
+        # 查询我们余额使用的地址：优先当前钱包，否则按 PROXY_WALLET_ADDRESS -> LOCAL_WALLET_ADDRESS 兜底
+        self._our_balance_address = self.proxy_wallet or config.proxy_wallet_address or config.local_wallet_address
+
         # 策略配置
         self.copy_ratio = config.copy_ratio
         self.signal_expiry = config.signal_expiry
+        # MIN_TRADE_RATIO 在 Config 中已转换为小数（0.1% -> 0.001），直接作为乘数使用
+        self._min_trade_ratio_frac = float(config.min_trade_ratio)
+        # MAX_TRADER_USAGE_CAP 为小数(如0.1)，这里预先换算为百分比(10.0)以匹配 trader_usage_ratio
+        self._max_cap_pct = config.max_trader_usage_cap * 100
+        self._max_order_size = config.max_order_size  # 最大订单限制
+        self._min_order_size = config.min_order_size  # 最小订单限制，可能为None表示无限制
 
         # HTTP会话 (支持HTTP/2)
         self.session: Optional[aiohttp.ClientSession] = None
 
+        # ClobClient 实例及其取 orderbook 的方法（首次使用时创建，见 _get_clob_client）
+        self._clob_client = None
+        self._ob_fn = None
+        # API 凭证有效期（monotonic 时间），见 _ensure_api_creds
+        self._api_creds_expiry = 0.0
+        self._api_creds_lock = asyncio.Lock()
+
+        # 同步 CLOB 调用专用的线程池（start() 中创建，由 _to_thread 显式传入，不替换事件循环默认线程池）
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # 下单后的持仓/余额刷新队列（start() 中创建后台消费任务）
+        self._update_queue: Optional[asyncio.Queue] = None
+        self._update_task: Optional[asyncio.Task] = None
+
+        # 未传入 memory_monitor 时的兜底监控实例（懒加载，只创建一次）
+        self._fallback_monitor = None
+
+        # 交易员持仓索引（由交易员持仓缓存派生，见 _get_trader_position_index）
+        self._trader_index: Dict[str, Dict[str, dict]] = {}
+        self._trader_index_revision = None
+
+        # 余额缓存的小写地址索引: (balance_cache 对象, 条目数, {小写地址: 原始 key})，见 _find_balance_key
+        self._balance_addr_index: Optional[tuple] = None
+
+        # 余额/持仓查询缓存LRU: (类型, 地址/token...) -> (monotonic 时间, 结果)（上限 LOOKUP_CACHE_MAX）
+        # 进行中的查询: key -> Future，同一 key 的并发调用共享一次查询（single-flight）
+        self._lookup_cache: OrderedDict = OrderedDict()
+        self._lookup_inflight: Dict[tuple, asyncio.Future] = {}
+
+        # orderbook 取价函数（首次取价时按返回结构探测，见 _build_orderbook_extractor）
+        self._ob_extractor: Optional[Callable[[Any, str], Optional[float]]] = None
+
+        # data/position_cache.json 的解析快照，按文件 mtime 失效（见 _load_position_cache_file）
+        self._pos_cache_snap: Optional[dict] = None
+        self._pos_cache_mtime: Optional[int] = None
+
+        # data/ 下 JSON 缓存文件的内存副本: 文件名 -> dict；修改后标记为 dirty，由 _flush_caches_later 合并落盘
+        self._cache_mem: Dict[str, dict] = {}
+        self._dirty_caches = set()
+        self._unstamped_records: List[dict] = []  # timestamp 待落盘时统一填写的缓存条目（见 _mark_cache_dirty）
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+        # 持仓列表的 token 索引: 来源 -> (positions 列表, {token_id: position})，见 _positions_by_token
+        self._pos_token_index: Dict[str, tuple] = {}
+
         logger.info("[TRADE] 交易执行服务已初始化")
         logger.info(f"[TRADE] 使用钱包类型: {self.wallet_type}")
         logger.info(f"[TRADE] 当前钱包地址: {self.proxy_wallet}")
         logger.info(f"[TRADE] 跟单比例: {self.copy_ratio}")
         logger.info(f"[TRADE] 信号有效期: {self.signal_expiry}秒")
 
-    async def start(self):
-        """启动交易服务"""
-        if not self.session:
-            # 创建支持HTTP/2的会话
+    def _get_monitor(self):
+        """
+        获取内存监控实例。
+
+        优先使用传入的 memory_monitor；否则使用兜底 IntegratedMonitor（通常是空数据）。
+        兜底实例由 start() 预先创建，取价等热路径上只做属性读取；start() 之前调用时在此按需创建。
+        """
+        if self.memory_monitor:
+            return self.memory_monitor
+        if self._fallback_monitor is None:
+            from balance_monitor import IntegratedMonitor
+            self._fallback_monitor = IntegratedMonitor()
+        return self._fallback_monitor
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """
+        获取共享 HTTP 会话（本服务所有 HTTP 请求统一复用，保持连接池与 keep-alive）。
+
+        正常由 start() 创建；若热路径方法在 start() 之前被调用，则在此按需创建。
+        """
+        if self.session is None or self.session.closed:
+            # 显式设置连接池大小与 DNS 缓存，突发信号下的连接复用行为可预期
             connector = aiohttp.TCPConnector(
-                force_close=False,
+                limit=100,
+                limit_per_host=32,
+                ttl_dns_cache=300,
                 enable_cleanup_closed=True,
                 keepalive_timeout=300
             )
@@ -161,20 +450,91 @@ class TradeExecutionService:
                     'User-Agent': 'Polymarket-CopyTrading/1.0'
                 }
             )
+        return self.session
+
+    async def start(self):
+        """启动交易服务"""
+        self._ensure_session()
+
+        # 固定大小、常驻的CLOB线程池：同步 CLOB 调用都显式提交到这里，
+        # 与 asyncio.to_thread 等使用默认线程池的调用（如自动赎回）互不占用
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.config.clob_thread_pool_size,
+                thread_name_prefix="clob",
+            )
+
+        # 提前确定内存监控实例，避免首个信号在取价路径上导入并创建兜底 IntegratedMonitor
+        if not self.memory_monitor:
+            logger.warning("[TRADE] 未传入 memory_monitor，使用兜底 IntegratedMonitor（无预加载数据）")
+        self._get_monitor()
+
+        if self._update_task is None:
+            self._update_queue = asyncio.Queue(maxsize=POSITION_UPDATE_QUEUE_SIZE)
+            self._update_task = asyncio.create_task(self._position_update_worker())
 
         logger.info("[TRADE] 交易服务已启动")
 
     async def stop(self):
         """停止交易服务"""
+        # 取消等待中的延迟落盘，立即写出尚未落盘的缓存
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        self._flush_task = None
+        await self._flush_caches()
+
+        if self._update_task:
+            self._update_task.cancel()
+            try:
+                await self._update_task
+            except asyncio.CancelledError:
+                pass
+            self._update_task = None
+            self._update_queue = None
+
         if self.session:
             await self.session.close()
             self.session = None
 
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
         logger.info("[TRADE] 交易服务已停止")
 
     async def execute_copy_trade(self, signal):
         """
-        执行跟单交易（下单主链路入口）。
+        执行跟单交易（singleflight 包装）。
+
+        processed_signals 只在下单成功后才标记，同一 original_tx_hash 的信号若在处理期间再次到达，
+        会绕过去重完整走一遍 定价+签名+提交。这里让后到者直接等待首个调用的结果，不重复下单。
+        """
+        key = signal.original_tx_hash
+        inflight = self._signal_inflight.get(key)
+        if inflight is not None:
+            logger.info("[VALIDATE] 相同信号正在处理中，等待其结果: %s", key)
+            return await asyncio.shield(inflight)
+
+        fut = asyncio.get_running_loop().create_future()
+        self._signal_inflight[key] = fut
+        try:
+            result = await self._execute_copy_trade(signal)
+            fut.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            # 主链路内部已吞掉普通异常，这里只需把取消传递给等待者
+            fut.cancel()
+            raise
+        finally:
+            del self._signal_inflight[key]
+
+    async def _execute_copy_trade(self, signal):
+        """
+        执行跟单交易（下单主链路）。
 
         运行逻辑（高层流程）：
         1) 校验信号有效性：去重 + 时效（[`TradeExecutionService._validate_signal()`](trade_execution_service.py:300)）
@@ -201,24 +561,33 @@ class TradeExecutionService:
         - marketable BUY 最小名义金额：$1（即使本地估算>=1，服务端也可能因量化/费用/撮合规则判定不足）
         """
         try:
-            logger.info(f"\n[TRADE] 开始处理跟单信号...")
-            logger.info(f"[TRADE] 交易员: {get_trader_display_info(signal.source_address)}")
-            logger.info(f"[TRADE] 市场: {signal.market_info.get('market_slug', 'Unknown')}")
-            logger.info(f"[TRADE] 方向: {signal.side}")
-            logger.info(f"[TRADE] 金额: {signal.amount_usdc:.2f} USDC")
+            # 市场信息只读取一次，后续日志/黑名单/通知信息复用
+            market_info = signal.market_info
+            market_title = market_info.get('market_slug')
+            market_name = market_title if market_title is not None else 'Unknown'
+            outcome = market_info.get('outcome', 'Unknown')
+
+            logger.info("\n[TRADE] 开始处理跟单信号...")
+            logger.info("[TRADE] 交易员: %s", get_trader_display_info(signal.source_address))
+            logger.info("[TRADE] 市场: %s", market_name)
+            logger.info("[TRADE] 方向: %s", signal.side)
+            logger.info("[TRADE] 金额: %.2f USDC", signal.amount_usdc)
 
             # 用于通知显示的比例 (BUY: 占余额比例, SELL: 占持仓比例)
             display_ratio = 0.0
+            # BUY 在持仓检查阶段并发获取交易员余额与下单价格，后续直接复用
+            trader_balance = None
+            order_price = None
 
             # 1. 信号验证 (去重 + 时效)
             if not await self._validate_signal(signal):
                 return False
 
             # 检查市场标题黑名单
-            market_title = signal.market_info.get('market_slug', '')
+            market_title_lower = (market_title or '').lower()
             for blacklist_item in self.config.market_title_blacklist:
-                if blacklist_item.lower() in market_title.lower():
-                    logger.info(f"[TRADE] 市场标题 '{market_title}' 包含黑名单关键词 '{blacklist_item}'，跳过跟单")
+                if blacklist_item.lower() in market_title_lower:
+                    logger.info("[TRADE] 市场标题 '%s' 包含黑名单关键词 '%s'，跳过跟单", market_title, blacklist_item)
                     return False
 
             # 2. 持仓检查
@@ -247,31 +616,36 @@ class TradeExecutionService:
                     # 限制最大100%
                     if display_ratio > 100: display_ratio = 100.0
                         
-                    logger.info(f"[TRADE] 交易员卖出比例: {display_ratio:.2f}% (持仓{trader_position_info['total_shares']:.2f}股)")
+                    logger.info("[TRADE] 交易员卖出比例: %.2f%% (持仓%.2f股)", display_ratio, trader_position_info['total_shares'])
                 else:
-                    logger.info(f"[TRADE] 交易员无持仓数据，使用固定比例策略")
+                    logger.info("[TRADE] 交易员无持仓数据，使用固定比例策略")
 
             elif signal.side == "BUY":
-                # 买入：检查交易员和我们的持仓情况
-                trader_has_position = await self._check_trader_position(signal.token_id, signal.source_address)
-                logger.info(f"[TRADE] 交易员持仓检查: {'有持仓' if trader_has_position else '无持仓'}")
+                # 买入：交易员持仓、我们的持仓、交易员余额、下单价格互不依赖，并发查询
+                trader_has_position, our_position_shares, trader_balance, order_price = await asyncio.gather(
+                    self._check_trader_position(signal.token_id, signal.source_address),
+                    self._get_position_shares(signal.token_id),
+                    self._get_trader_usdc_balance(signal.source_address),
+                    self._get_current_price(signal),
+                )
+                logger.info("[TRADE] 交易员持仓检查: %s", '有持仓' if trader_has_position else '无持仓')
 
                 # 规则：先做“交易员本次下单占其余额比例”过滤（小于 0.1% 不跟）
                 # - 阈值配置：[`Config.MIN_TRADE_RATIO`](检测交易员交易动作解析打印/config.py:100)（默认 0.1，按“百分比 0.1%”解释，即 0.1/100）
                 # - 与交易员是否已有持仓无关：先过滤，再进入后续算参
-                if await self._should_skip_buy_due_to_trader_balance_threshold(signal):
+                if await self._should_skip_buy_due_to_trader_balance_threshold(signal, trader_balance):
                     return False
 
-                # 检查我们自己的持仓（用于后续策略选择）
-                our_position_shares = await self._get_position_shares(signal.token_id)
+                # 我们自己的持仓（用于后续策略选择）
                 if our_position_shares > 0:
-                    logger.info(f"[POSITION] Token ID {signal.token_id[:10]}... 我们有持仓: {our_position_shares:.2f} 股")
+                    logger.info("[POSITION] Token ID %s... 我们有持仓: %.2f 股", signal.token_id[:10], our_position_shares)
                 else:
                     # logger.info(f"[POSITION] Token ID {signal.token_id[:10]}... 我们无持仓")  # 已删除日志输出
                     pass  # 无持仓时什么都不做
 
-            # 3. 获取当前市场价格
-            order_price = await self._get_current_price(signal)
+            # 3. 获取当前市场价格（BUY 已在持仓检查阶段并发获取）
+            if signal.side != "BUY":
+                order_price = await self._get_current_price(signal)
             if not order_price:
                 return False
 
@@ -287,7 +661,8 @@ class TradeExecutionService:
 
             # 准备交易员信息 (用于合并通知)
             try:
-                trader_balance = await self._get_trader_usdc_balance(signal.source_address)
+                if trader_balance is None:
+                    trader_balance = await self._get_trader_usdc_balance(signal.source_address)
                 
                 # 如果是BUY，在这里计算余额比例
                 if signal.side == "BUY":
@@ -300,19 +675,19 @@ class TradeExecutionService:
                     'action_type': signal.side,
                     'trader_address': signal.source_address,
                     'balance': trader_balance,
-                    'outcome': signal.market_info.get('outcome', 'Unknown'),
+                    'outcome': outcome,
                     'price': signal.price if signal.price else 0,
                     'ratio': display_ratio,
-                    'market_name': signal.market_info.get('market_slug', 'Unknown'),
+                    'market_name': market_name,
                     'amount_usdc': signal.amount_usdc
                 }
             except Exception as e:
-                logger.error(f"[TRADE] 获取交易员信息失败: {e}")
+                logger.error("[TRADE] 获取交易员信息失败: %s", e)
                 trader_info = {}
 
             # 检查订单参数是否有效
             if not order_params:
-                logger.info(f"[TRADE] 订单参数无效，跳过此跟单信号")
+                logger.info("[TRADE] 订单参数无效，跳过此跟单信号")
                 return False
 
             # 5. 执行GTC限价单
@@ -325,25 +700,99 @@ class TradeExecutionService:
                 order_id, taking_amount = None, None
             
             if not order_id:
-                # 即使下单失败也要更新持仓数据
-                await self._update_positions_after_trade(signal)
+                # 即使下单失败也要更新持仓数据（后台执行，不阻塞下一个信号）
+                await self._schedule_position_update(signal)
                 return False
 
             # 6. 记录处理状态
-            self.processed_signals.add(signal.original_tx_hash)
+            self._mark_signal_processed(signal.original_tx_hash)
 
-            logger.info(f"[TRADE] 跟单信号处理成功，订单ID: {order_id}")
+            logger.info("[TRADE] 跟单信号处理成功，订单ID: %s", order_id)
             return True
 
         except Exception as e:
-            logger.error(f"[TRADE] 执行跟单失败: {e}")
+            logger.error("[TRADE] 执行跟单失败: %s", e)
             # 异常情况下也要更新持仓数据
             try:
-                await self._update_positions_after_trade(signal)
+                await self._schedule_position_update(signal)
             except Exception as update_error:
-                logger.warning(f"[UPDATE] 异常情况下持仓更新也失败: {update_error}")
+                logger.warning("[UPDATE] 异常情况下持仓更新也失败: %s", update_error)
             return False
 
+    async def _schedule_position_update(self, signal):
+        """
+        将持仓/余额刷新放入后台队列，由 _position_update_worker 串行执行。
+
+        - 队列已满时丢弃本次刷新（下一次成交或定时刷新会覆盖）
+        - start() 之前调用时没有后台任务，退回到直接执行
+        """
+        if self._update_queue is None:
+            await self._update_positions_after_trade(signal)
+            return
+        try:
+            self._update_queue.put_nowait(signal)
+        except asyncio.QueueFull:
+            logger.warning("[UPDATE] 持仓更新队列已满，丢弃本次更新: %s", signal.original_tx_hash)
+
+    async def _position_update_worker(self):
+        """后台消费持仓更新队列"""
+        while True:
+            signal = await self._update_queue.get()
+            try:
+                await self._update_positions_after_trade(signal)
+            except Exception as e:
+                logger.warning("[UPDATE] 后台持仓更新失败: %s", e)
+            finally:
+                self._update_queue.task_done()
+
+    async def _cached_lookup(self, key: tuple, ttl: float, fetch):
+        """
+        带 TTL 的查询缓存：key 对应结果在 ttl 秒内直接返回，否则调用 fetch() 重新获取。
+
+        同一 key 的并发调用共享同一个进行中的 Future，只有第一个调用真正发起查询；
+        等待方被取消时不会取消共享的查询（shield）。
+        """
+        entry = self._lookup_cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+
+        fut = self._lookup_inflight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(self._fill_lookup(key, fetch))
+            self._lookup_inflight[key] = fut
+            fut.add_done_callback(functools.partial(self._lookup_done, key))
+        return await asyncio.shield(fut)
+
+    def _lookup_done(self, key: tuple, fut: asyncio.Future):
+        # 失效后 key 可能已指向新的查询，只移除自己
+        if self._lookup_inflight.get(key) is fut:
+            del self._lookup_inflight[key]
+
+    async def _fill_lookup(self, key: tuple, fetch):
+        """执行查询并写入缓存（由 _cached_lookup 以 Future 形式共享）"""
+        value = await fetch()
+        # 查询期间 key 被失效时结果可能是下单前的数据，不写回缓存
+        if self._lookup_inflight.get(key) is asyncio.current_task():
+            cache = self._lookup_cache
+            cache[key] = (time.monotonic(), value)
+            cache.move_to_end(key)
+            if len(cache) > LOOKUP_CACHE_MAX:
+                cache.popitem(last=False)
+        return value
+
+    def _invalidate_lookups(self, *keys: tuple):
+        """使指定的查询缓存失效（下单成功/持仓刷新后调用），进行中的旧查询不再被复用"""
+        for key in keys:
+            self._lookup_cache.pop(key, None)
+            self._lookup_inflight.pop(key, None)
+
+    def _mark_signal_processed(self, tx_hash: str):
+        """记录已处理信号；超过 PROCESSED_SIGNALS_MAX 时淘汰最早的记录，避免长期运行内存无限增长"""
+        self.processed_signals[tx_hash] = None
+        self.processed_signals.move_to_end(tx_hash)
+        if len(self.processed_signals) > PROCESSED_SIGNALS_MAX:
+            self.processed_signals.popitem(last=False)
+
     async def _validate_signal(self, signal) -> bool:
         """
         验证信号有效性（下单前的硬性门槛）。
@@ -379,12 +828,12 @@ class TradeExecutionService:
     async def _check_position(self, token_id: str) -> bool:
         """检查持仓 (仅针对卖出) - 使用数据API计算持仓"""
         try:
-            logger.info(f"[POSITION] 检查持仓状态: Token ID {token_id}")
+            logger.info("[POSITION] 检查持仓状态: Token ID %s", token_id)
 
             # 获取我们的钱包地址
             our_wallet = self.proxy_wallet
             if not our_wallet:
-                logger.error(f"[POSITION] 未配置钱包地址，无法检查持仓")
+                logger.error("[POSITION] 未配置钱包地址，无法检查持仓")
                 return False
 
             # 使用数据API查询我们的交易记录来计算持仓，避免依赖CLOB API
@@ -394,42 +843,27 @@ class TradeExecutionService:
                 'limit': 100  # 获取最近的交易记录
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        activities = await response.json()
-
-                        # 计算净持仓: 买入 - 卖出，只计算指定token的记录
-                        net_position = 0.0
-                        matching_activities = 0
-                        for activity in activities:
-                            # 过滤：只处理指定token的记录
-                            activity_asset = str(activity.get('asset', ''))
-                            if activity_asset != token_id:
-                                continue
-
-                            matching_activities += 1
-                            side = activity.get('side', '').upper()
-                            shares = float(activity.get('size', 0))
-
-                            if side == 'BUY':
-                                net_position += shares
-                            elif side == 'SELL':
-                                net_position -= shares
-
-                        has_position = net_position > 0
-                        if matching_activities > 0:
-                            logger.info(f"[POSITION] Token ID {token_id[:10]}... 找到{matching_activities}条匹配记录，持仓: {net_position:.2f} 股")
-                        else:
-                            logger.info(f"[POSITION] Token ID {token_id[:10]}... 无交易记录，无持仓")
+            session = self._ensure_session()
+            async with session.get(url, params=params) as response:
+                if response.status == 200:
+                    activities = await _read_json(response)
+
+                    # 计算净持仓: 买入 - 卖出，只计算指定token的记录
+                    net_position, matching_activities = _net_position_from_activities(activities, token_id)
 
-                        return has_position
+                    has_position = net_position > 0
+                    if matching_activities > 0:
+                        logger.info("[POSITION] Token ID %s... 找到%d条匹配记录，持仓: %.2f 股", token_id[:10], matching_activities, net_position)
                     else:
-                        logger.error(f"[POSITION] 数据API请求失败: HTTP {response.status}")
-                        return False
+                        logger.info("[POSITION] Token ID %s... 无交易记录，无持仓", token_id[:10])
+
+                    return has_position
+                else:
+                    logger.error("[POSITION] 数据API请求失败: HTTP %s", response.status)
+                    return False
 
         except Exception as e:
-            logger.error(f"[POSITION] 持仓计算失败: {e}")
+            logger.error("[POSITION] 持仓计算失败: %s", e)
             return False
 
     async def _check_trader_position(self, token_id: str, trader_address: str) -> bool:
@@ -444,45 +878,31 @@ class TradeExecutionService:
                 'limit': 100  # 获取最近的交易记录
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        activities = await response.json()
-
-                        # 计算交易员的净持仓，只计算指定token的记录
-                        net_position = 0.0
-                        matching_activities = 0
-                        for activity in activities:
-                            # 过滤：只处理指定token的记录
-                            activity_asset = str(activity.get('asset', ''))
-                            if activity_asset != token_id:
-                                continue
-
-                            matching_activities += 1
-                            side = activity.get('side', '').upper()
-                            shares = float(activity.get('size', 0))
-
-                            if side == 'BUY':
-                                net_position += shares
-                            elif side == 'SELL':
-                                net_position -= shares
-
-                        has_position = net_position > 0
-                        if matching_activities > 0:
-                            logger.info(f"[POSITION] 交易员 {get_trader_display_info(trader_address)} Token {token_id[:10]}... 持仓: {net_position:.2f} 股")
-                        else:
-                            logger.info(f"[POSITION] 交易员 {get_trader_display_info(trader_address)} Token {token_id[:10]}... 无交易记录")
+            session = self._ensure_session()
+            async with session.get(url, params=params) as response:
+                if response.status == 200:
+                    activities = await _read_json(response)
+
+                    # 计算交易员的净持仓，只计算指定token的记录
+                    net_position, matching_activities = _net_position_from_activities(activities, token_id)
 
-                        return has_position
+                    has_position = net_position > 0
+                    trader_display = get_trader_display_info(trader_address)
+                    if matching_activities > 0:
+                        logger.info("[POSITION] 交易员 %s Token %s... 持仓: %.2f 股", trader_display, token_id[:10], net_position)
                     else:
-                        logger.error(f"[POSITION] 交易员持仓查询失败: HTTP {response.status}")
-                        return False
+                        logger.info("[POSITION] 交易员 %s Token %s... 无交易记录", trader_display, token_id[:10])
+
+                    return has_position
+                else:
+                    logger.error("[POSITION] 交易员持仓查询失败: HTTP %s", response.status)
+                    return False
 
         except Exception as e:
-            logger.error(f"[POSITION] 交易员持仓检查失败: {e}")
+            logger.error("[POSITION] 交易员持仓检查失败: %s", e)
             return False
 
-    async def _should_skip_buy_due_to_trader_balance_threshold(self, signal: TradeSignal) -> bool:
+    async def _should_skip_buy_due_to_trader_balance_threshold(self, signal: TradeSignal, trader_balance: Optional[float] = None) -> bool:
         """
         BUY 信号的"交易员余额阈值过滤"。
 
@@ -492,6 +912,9 @@ class TradeExecutionService:
         - 例外：如果交易员本次下单金额超过大额阈值（LARGE_ORDER_THRESHOLD），则跳过此限制
         - 优先级：如果交易员配置了单独的最小下单金额（TRADER_MIN_ORDER_SIZES），则跳过 MIN_TRADE_RATIO 检查
 
+        参数：
+        - trader_balance：调用方已获取的交易员余额；为 None 时在需要时再查询
+
         阈值定义：
         - 阈值百分比读取自 [`Config.MIN_TRADE_RATIO`](检测交易员交易动作解析打印/config.py:100)
           - 默认 0.1，按"百分比 0.1%"解释，因此这里要除以 100。
@@ -533,14 +956,18 @@ class TradeExecutionService:
                 )
                 return False
 
-            trader_balance = await self._get_trader_usdc_balance(signal.source_address)
-            min_trade_ratio_percent = self.config.min_trade_ratio * 100
-            min_trade_amount = float(trader_balance) * (min_trade_ratio_percent / 100.0)
+            # 未启用比例阈值时无需查询交易员余额
+            if self._min_trade_ratio_frac <= 0:
+                return False
+
+            if trader_balance is None:
+                trader_balance = await self._get_trader_usdc_balance(signal.source_address)
+            min_trade_amount = float(trader_balance) * self._min_trade_ratio_frac
 
             if signal.amount_usdc < min_trade_amount:
                 logger.info(
                     f"[TRADE] 交易员有持仓但本次下单金额 {signal.amount_usdc:.2f} USDC "
-                    f"< 交易员余额 {float(trader_balance):.2f} USDC 的 {min_trade_ratio_percent:.3f}% 阈值 "
+                    f"< 交易员余额 {float(trader_balance):.2f} USDC 的 {self._min_trade_ratio_frac * 100:.3f}% 阈值 "
                     f"({min_trade_amount:.2f} USDC)，跳过该订单"
                 )
                 return True
@@ -555,7 +982,37 @@ class TradeExecutionService:
             logger.warning(f"[TRADE] 交易员余额阈值过滤计算失败，继续执行该订单: {e}")
             return False
 
+    def _get_trader_position_index(self) -> Dict[str, Dict[str, dict]]:
+        """
+        获取交易员持仓索引: {小写地址: {token_id: position}}。
+
+        索引由 memory_monitor 的交易员持仓缓存派生，仅在缓存对象或其修订号变化时重建，
+        查找从逐个比较地址/遍历持仓变为两次哈希。
+        """
+        monitor = self._get_monitor()
+        trader_positions_cache = monitor.get_trader_positions_cache()
+        revision = (id(trader_positions_cache), getattr(monitor, 'trader_positions_revision', 0), len(trader_positions_cache))
+        if revision != self._trader_index_revision:
+            trader_index = {}
+            for cached_addr, positions in trader_positions_cache.items():
+                by_token = trader_index.setdefault(cached_addr.lower(), {})
+                for position in positions:
+                    # 兼容不同的字段名 (API返回的是 asset 不是 token_id)；同一 token 保留第一条
+                    asset_id = position.get("asset") or position.get("token_id")
+                    by_token.setdefault(asset_id, position)
+            self._trader_index = trader_index
+            self._trader_index_revision = revision
+        return self._trader_index
+
     async def _get_trader_position_detail(self, token_id: str, trader_address: str) -> dict:
+        """获取交易员详细的持仓信息（TRADER_POSITION_LOOKUP_TTL 内复用上次结果）"""
+        return await self._cached_lookup(
+            ("trader_position", trader_address.lower(), token_id),
+            TRADER_POSITION_LOOKUP_TTL,
+            lambda: self._load_trader_position_detail(token_id, trader_address),
+        )
+
+    async def _load_trader_position_detail(self, token_id: str, trader_address: str) -> dict:
         """获取交易员详细的持仓信息 - 从内存变量读取"""
         try:
             # 默认返回值
@@ -564,95 +1021,63 @@ class TradeExecutionService:
                 'avg_price': 0.0,
                 'total_cost': 0.0
             }
+            trader_display = get_trader_display_info(trader_address)
 
-            # 获取交易员持仓缓存
-            if self.memory_monitor:
-                trader_positions_cache = self.memory_monitor.get_trader_positions_cache()
-            else:
-                # 兜底：如果没有传入内存监控，创建新实例
-                from balance_monitor import IntegratedMonitor
-                monitor = IntegratedMonitor()
-                trader_positions_cache = monitor.get_trader_positions_cache()
+            # 获取交易员持仓索引: 小写地址 -> {token_id: position}
+            trader_index = self._get_trader_position_index()
 
             # 检查交易员持仓缓存是否存在
-            if not trader_positions_cache:
+            if not trader_index:
                 logger.warning(f"[POSITION] 交易员持仓缓存为空，尝试从API获取...")
                 # 缓存未命中，调用API获取并更新缓存
                 try:
                     await self._fetch_trader_positions(trader_address)
                     # 重新从缓存读取
-                    if self.memory_monitor:
-                        trader_positions_cache = self.memory_monitor.get_trader_positions_cache()
-                    else:
-                        from balance_monitor import IntegratedMonitor
-                        monitor = IntegratedMonitor()
-                        trader_positions_cache = monitor.get_trader_positions_cache()
+                    trader_index = self._get_trader_position_index()
                     logger.info(f"[POSITION] 已从API获取并缓存交易员持仓数据")
                 except Exception as api_e:
                     logger.warning(f"[POSITION] 从API获取交易员持仓失败: {api_e}")
                     return result
 
             # 查找交易员（大小写不敏感）
-            target_trader_key = None
-            if trader_address in trader_positions_cache:
-                target_trader_key = trader_address
-            else:
-                trader_address_lower = trader_address.lower()
-                for cached_addr in trader_positions_cache:
-                    if cached_addr.lower() == trader_address_lower:
-                        target_trader_key = cached_addr
-                        break
-            
-            if not target_trader_key:
-                logger.warning(f"[POSITION] 未找到交易员 {get_trader_display_info(trader_address)} 的持仓数据，尝试从API获取...")
+            trader_address_lower = trader_address.lower()
+            trader_positions = trader_index.get(trader_address_lower)
+
+            if trader_positions is None:
+                logger.warning(f"[POSITION] 未找到交易员 {trader_display} 的持仓数据，尝试从API获取...")
                 # 缓存未命中，调用API获取并更新缓存
                 try:
                     await self._fetch_trader_positions(trader_address)
-                    # 重新从缓存读取
-                    if self.memory_monitor:
-                        trader_positions_cache = self.memory_monitor.get_trader_positions_cache()
-                    else:
-                        from balance_monitor import IntegratedMonitor
-                        monitor = IntegratedMonitor()
-                        trader_positions_cache = monitor.get_trader_positions_cache()
-                    # 再次查找
-                    if trader_address in trader_positions_cache:
-                        target_trader_key = trader_address
-                    else:
-                        for cached_addr in trader_positions_cache:
-                            if cached_addr.lower() == trader_address_lower:
-                                target_trader_key = cached_addr
-                                break
-                    if target_trader_key:
+                    # 重新从缓存读取并再次查找
+                    trader_positions = self._get_trader_position_index().get(trader_address_lower)
+                    if trader_positions is not None:
                         logger.info(f"[POSITION] 已从API获取并缓存交易员持仓数据")
                 except Exception as api_e:
                     logger.warning(f"[POSITION] 从API获取交易员持仓失败: {api_e}")
                 
-                if not target_trader_key:
+                if trader_positions is None:
                     return result
 
             # 查找指定token的持仓
-            for position in trader_positions_cache[target_trader_key]:
-                # 兼容不同的字段名 (API返回的是 asset 不是 token_id)
-                asset_id = position.get("asset") or position.get("token_id")
-                if asset_id == token_id:
-                    size = float(position.get("size", 0))
-                    avg_price = float(position.get("avg_price", 0))
-                    total_bought = float(position.get("total_bought", 0))
-
-                    # 计算总成本（基于平均价格和总买入量）
-                    total_cost = avg_price * total_bought if avg_price > 0 and total_bought > 0 else 0.0
-
-                    result = {
-                        'total_shares': size,
-                        'avg_price': avg_price,
-                        'total_cost': total_cost
-                    }
+            position = trader_positions.get(token_id)
+            if position is not None:
+                size = float(position.get("size", 0))
+                avg_price = float(position.get("avg_price", 0))
+                total_bought = float(position.get("total_bought", 0))
+
+                # 计算总成本（基于平均价格和总买入量）
+                total_cost = avg_price * total_bought if avg_price > 0 and total_bought > 0 else 0.0
+
+                result = {
+                    'total_shares': size,
+                    'avg_price': avg_price,
+                    'total_cost': total_cost
+                }
 
-                    logger.info(f"[POSITION] 从内存读取交易员 {get_trader_display_info(trader_address)} Token {token_id[:8]}... 持仓: {size:.2f}股, 平均价格 ${avg_price:.4f}")
-                    return result
+                logger.info(f"[POSITION] 从内存读取交易员 {trader_display} Token {token_id[:8]}... 持仓: {size:.2f}股, 平均价格 ${avg_price:.4f}")
+                return result
 
-            logger.info(f"[POSITION] 交易员 {get_trader_display_info(trader_address)} 未持有 Token {token_id[:8]}...")
+            logger.info(f"[POSITION] 交易员 {trader_display} 未持有 Token {token_id[:8]}...")
             return result
 
         except Exception as e:
@@ -660,16 +1085,18 @@ class TradeExecutionService:
             return {'total_shares': 0.0, 'avg_price': 0.0, 'total_cost': 0.0}
 
     async def _get_position_shares(self, token_id: str, show_warning: bool = True) -> float:
+        """获取指定token的持仓股数（POSITION_LOOKUP_TTL 内复用上次结果）"""
+        return await self._cached_lookup(
+            ("position", token_id),
+            POSITION_LOOKUP_TTL,
+            lambda: self._load_position_shares(token_id, show_warning),
+        )
+
+    async def _load_position_shares(self, token_id: str, show_warning: bool = True) -> float:
         """获取指定token的持仓股数 - 从内存变量读取"""
         try:
             # 使用传入的内存监控实例
-            if self.memory_monitor:
-                position_cache = self.memory_monitor.get_position_cache()
-            else:
-                # 兜底：如果没有传入内存监控，创建新实例（通常是空数据）
-                from balance_monitor import IntegratedMonitor
-                monitor = IntegratedMonitor()
-                position_cache = monitor.get_position_cache()
+            position_cache = self._get_monitor().get_position_cache()
 
             if not position_cache or not position_cache.get('positions'):
                 if show_warning:
@@ -678,12 +1105,7 @@ class TradeExecutionService:
                 try:
                     await self._fetch_and_cache_positions()
                     # 重新从缓存读取
-                    if self.memory_monitor:
-                        position_cache = self.memory_monitor.get_position_cache()
-                    else:
-                        from balance_monitor import IntegratedMonitor
-                        monitor = IntegratedMonitor()
-                        position_cache = monitor.get_position_cache()
+                    position_cache = self._get_monitor().get_position_cache()
                     logger.info(f"[POSITION] 已从API获取并缓存持仓数据")
                 except Exception as api_e:
                     logger.warning(f"[POSITION] 从API获取持仓失败: {api_e}")
@@ -723,38 +1145,38 @@ class TradeExecutionService:
             offset = 0
             limit = 100
             
-            async with aiohttp.ClientSession() as session:
-                while True:
-                    params = {
-                        'user': our_address,
-                        'limit': limit,
-                        'offset': offset
-                    }
-                    
-                    async with session.get(api_url, params=params) as response:
-                        if response.status == 200:
-                            positions = await response.json()
-                            if not positions:
-                                break
-                            
-                            all_positions.extend(positions)
-                            
-                            # 查找指定token的持仓
-                            for position in positions:
-                                asset_id = position.get("asset") or position.get("token_id")
-                                if asset_id == token_id:
-                                    size = float(position.get("size", 0))
-                                    logger.info(f"[POSITION] 实时查询持仓 Token {token_id[:8]}...: {size:.6f} 股")
-                                    return size
-                            
-                            # 如果返回的持仓数量少于limit，说明已经获取完所有数据
-                            if len(positions) < limit:
-                                break
-                            
-                            offset += limit
-                        else:
-                            logger.warning(f"[POSITION] 实时查询持仓失败: HTTP {response.status}")
+            session = self._ensure_session()
+            while True:
+                params = {
+                    'user': our_address,
+                    'limit': limit,
+                    'offset': offset
+                }
+
+                async with session.get(api_url, params=params) as response:
+                    if response.status == 200:
+                        positions = await _read_json(response)
+                        if not positions:
                             break
+
+                        all_positions.extend(positions)
+
+                        # 查找指定token的持仓
+                        for position in positions:
+                            asset_id = position.get("asset") or position.get("token_id")
+                            if asset_id == token_id:
+                                size = float(position.get("size", 0))
+                                logger.info(f"[POSITION] 实时查询持仓 Token {token_id[:8]}...: {size:.6f} 股")
+                                return size
+
+                        # 如果返回的持仓数量少于limit，说明已经获取完所有数据
+                        if len(positions) < limit:
+                            break
+
+                        offset += limit
+                    else:
+                        logger.warning(f"[POSITION] 实时查询持仓失败: HTTP {response.status}")
+                        break
             
             # 未找到该token的持仓
             return 0.0
@@ -775,9 +1197,6 @@ class TradeExecutionService:
         - SELL: trader_price - sell_premium, min 0.01.
         """
         try:
-            cap_min = 0.001
-            cap_max = 0.99
-            
             price_f = float(trader_price)
             
             if side == "BUY":
@@ -796,15 +1215,12 @@ class TradeExecutionService:
                     premium = self.config.buy_premium
                 
                 raw_price = price_f + premium
-                controlled_price = min(max(raw_price, cap_min), cap_max)
+                final_price = _clamp_premium_price(True, price_f, premium)
                 
             else:
                 premium = self.config.sell_premium
                 raw_price = price_f - premium
-                controlled_price = max(raw_price, 0.01)
-                controlled_price = min(controlled_price, cap_max)
-
-            final_price = controlled_price
+                final_price = _clamp_premium_price(False, price_f, premium)
                 
             logger.info(
                 f"[PRICE] {side} 溢价计算: base={price_f:.6f}, premium={premium}, "
@@ -837,10 +1253,10 @@ class TradeExecutionService:
         """
         try:
             # 1. 优先使用信号中的交易员价格 (最高优先级)
-            trader_price = getattr(signal, 'price', None)
+            trader_price = signal.price
             if trader_price is None:
                 # 如果信号中没有价格信息，尝试从交易金额计算
-                if hasattr(signal, 'amount_usdc') and hasattr(signal, 'shares') and signal.shares is not None:
+                if signal.shares is not None:
                     if signal.shares > 0:
                         trader_price = signal.amount_usdc / signal.shares
                         logger.info(f"[PRICE] 从交易金额计算交易员价格: {trader_price:.6f}")
@@ -848,31 +1264,38 @@ class TradeExecutionService:
             if trader_price is not None:
                 return self._calculate_price_with_premium(signal.side, trader_price)
 
+            # 提前在后台发起 orderbook 请求，网络往返与下面的内存缓存查询重叠；缓存命中时取消
+            ob_task = None
+            ob_error = None
+            if HAS_CLOB:
+                try:
+                    if self._ob_fn is None:
+                        self._get_clob_client()  # 首次调用时创建客户端并绑定 _ob_fn
+                    ob_task = asyncio.create_task(_to_thread(self._executor, self._ob_fn, signal.token_id))
+                except Exception as e:
+                    ob_error = e
+
             # 2. 如果没有交易员价格，对于卖出订单，尝试使用持仓缓存价格
             if signal.side == "SELL":
+                calculated_price = None
                 try:
                     # 使用内存监控实例获取持仓缓存
-                    if self.memory_monitor:
-                        position_cache = self.memory_monitor.get_position_cache()
-                    else:
-                        # 兜底：如果没有传入内存监控，创建新实例
-                        from balance_monitor import IntegratedMonitor
-                        monitor = IntegratedMonitor()
-                        position_cache = monitor.get_position_cache()
+                    position_cache = self._get_monitor().get_position_cache()
                     if position_cache and position_cache.get('positions'):
-                        for position in position_cache.get("positions", []):
-                            asset_id = position.get("asset") or position.get("token_id")
-                            if asset_id == signal.token_id:
-                                cache_price = position.get("curPrice")
-                                if cache_price and cache_price > 0:
-                                    # 使用提取的函数计算溢价价格 (SELL: price - 0.02)
-                                    logger.info(f"[PRICE] 卖出订单使用内存缓存价格作为基准: {float(cache_price):.6f}")
-                                    calculated_price = self._calculate_price_with_premium("SELL", cache_price)
-                                    if calculated_price is not None:
-                                        return calculated_price
+                        position = self._positions_by_token("memory", position_cache["positions"]).get(signal.token_id)
+                        cache_price = position.get("curPrice") if position else None
+                        if cache_price and cache_price > 0:
+                            # 使用提取的函数计算溢价价格 (SELL: price - 0.02)
+                            logger.info(f"[PRICE] 卖出订单使用内存缓存价格作为基准: {float(cache_price):.6f}")
+                            calculated_price = self._calculate_price_with_premium("SELL", cache_price)
                 except Exception as e:
                     logger.warning(f"[PRICE] 从内存持仓缓存获取价格失败: {e}")
 
+                if calculated_price is not None:
+                    if ob_task is not None:
+                        ob_task.cancel()
+                    return calculated_price
+
             # logger.info(f"[PRICE] 获取市场价格: Token ID {signal.token_id}")  # 已删除日志输出
 
             # 检查依赖
@@ -884,69 +1307,35 @@ class TradeExecutionService:
             #     return None
 
             try:
-                client = self._get_clob_client()
-                # 尝试 get_orderbook，若失败则尝试 get_order_book (旧版本兼容)
-                try:
-                    orderbook = await asyncio.to_thread(client.get_orderbook, signal.token_id)
-                except AttributeError:
-                    orderbook = await asyncio.to_thread(client.get_order_book, signal.token_id)
-
-                # 解析 orderbook 结构 - OrderBookSummary 对象使用属性访问
-                try:
-                    # 尝试使用属性访问
-                    bids = orderbook.bids if hasattr(orderbook, 'bids') else []
-                    asks = orderbook.asks if hasattr(orderbook, 'asks') else []
-                except AttributeError:
-                    # 如果属性访问失败，尝试字典访问（兼容旧版本）
-                    if isinstance(orderbook, dict):
-                        bids = orderbook.get('bids', [])
-                        asks = orderbook.get('asks', [])
-                    else:
-                        logger.warning(f"[PRICE] 无法解析 orderbook 类型: {type(orderbook)}")
-                        return None
-
-                if not bids and not asks:
-                    logger.warning("[PRICE] 获取的订单簿为空")
-                    return None
-
-                if signal.side == "BUY":
-                    if not asks:
-                        logger.warning("[PRICE] 无卖单盘口数据")
-                        return None
-                    # 处理asks数据 - 可能是对象列表或元组列表
-                    try:
-                        if asks and hasattr(asks[0], 'price'):
-                            best_ask = float(asks[0].price)
-                        elif isinstance(asks[0], (list, tuple)):
-                            best_ask = float(asks[0][0])
-                        elif isinstance(asks[0], dict):
-                            best_ask = float(asks[0]['price'])
-                        else:
-                            logger.warning(f"[PRICE] 无法解析asks数据格式: {type(asks[0])}")
+                if ob_task is None:
+                    raise ob_error
+                orderbook = await ob_task
+
+                # 解析 orderbook：BUY 取 best ask，SELL 取 best bid
+                side_key = 'asks' if signal.side == "BUY" else 'bids'
+                current_price = None
+                for _ in range(2):
+                    if self._ob_extractor is None:
+                        self._ob_extractor = _build_orderbook_extractor(orderbook)
+                        if self._ob_extractor is None:
+                            logger.warning(f"[PRICE] 订单簿为空或无法解析结构: {type(orderbook)}")
                             return None
-                        current_price = best_ask
-                    except (IndexError, KeyError, ValueError, TypeError) as e:
-                        logger.warning(f"[PRICE] 解析asks价格失败: {e}")
-                        return None
-                else:  # SELL
-                    if not bids:
-                        logger.warning("[PRICE] 无买单盘口数据")
-                        return None
-                    # 处理bids数据
                     try:
-                        if bids and hasattr(bids[0], 'price'):
-                            best_bid = float(bids[0].price)
-                        elif isinstance(bids[0], (list, tuple)):
-                            best_bid = float(bids[0][0])
-                        elif isinstance(bids[0], dict):
-                            best_bid = float(bids[0]['price'])
-                        else:
-                            logger.warning(f"[PRICE] 无法解析bids数据格式: {type(bids[0])}")
-                            return None
-                        current_price = best_bid
-                    except (IndexError, KeyError, ValueError, TypeError) as e:
-                        logger.warning(f"[PRICE] 解析bids价格失败: {e}")
+                        current_price = self._ob_extractor(orderbook, side_key)
+                        break
+                    except (AttributeError, IndexError, KeyError, TypeError):
+                        # 返回结构与缓存的取价函数不符，重新探测一次
+                        self._ob_extractor = None
+                    except ValueError as e:
+                        logger.warning(f"[PRICE] 解析{side_key}价格失败: {e}")
                         return None
+                else:
+                    logger.warning(f"[PRICE] 无法解析{side_key}数据格式: {type(orderbook)}")
+                    return None
+
+                if current_price is None:
+                    logger.warning("[PRICE] 无卖单盘口数据" if signal.side == "BUY" else "[PRICE] 无买单盘口数据")
+                    return None
             except Exception as e:
                 logger.warning(f"[PRICE] 获取价格失败: {e}")
                 return None
@@ -955,20 +1344,16 @@ class TradeExecutionService:
             if signal.side == "SELL":
                     # 卖出时，从我们的持仓缓存获取当前价格
                     try:
-                        position_cache_file = os.path.join("data", "position_cache.json")
-                        with open(position_cache_file, 'r', encoding='utf-8') as f:
-                            position_data = json.load(f)
-
-                        for position in position_data.get("positions", []):
-                            asset_id = position.get("asset") or position.get("token_id")
-                            if asset_id == signal.token_id:
-                                cache_price = position.get("curPrice")
-                                if cache_price and cache_price > 0:
-                                    # 使用提取的函数计算溢价价格 (SELL: price - 0.02)
-                                    logger.info(f"[PRICE] 从持仓缓存获取价格作为基准: {float(cache_price):.6f}")
-                                    calculated_price = self._calculate_price_with_premium("SELL", cache_price)
-                                    if calculated_price is not None:
-                                        return calculated_price
+                        position_data = self._load_position_cache_file()
+
+                        position = self._positions_by_token("file", position_data.get("positions", [])).get(signal.token_id)
+                        cache_price = position.get("curPrice") if position else None
+                        if cache_price and cache_price > 0:
+                            # 使用提取的函数计算溢价价格 (SELL: price - 0.02)
+                            logger.info(f"[PRICE] 从持仓缓存获取价格作为基准: {float(cache_price):.6f}")
+                            calculated_price = self._calculate_price_with_premium("SELL", cache_price)
+                            if calculated_price is not None:
+                                return calculated_price
                     except Exception as e:
                         logger.warning(f"[PRICE] 从持仓缓存获取价格失败: {e}")
 
@@ -976,18 +1361,15 @@ class TradeExecutionService:
 
             # 最终兜底：无论来自 trader_price 定价还是盘口 best_bid/best_ask，都强制 clamp 到 [0.001, 0.99]
             # 以避免出现 price=0.999 的情况（你最新要求“最高只能到 0.99”）。
-            cap_min = 0.001
-            cap_max = 0.99
-            try:
-                raw_price = float(current_price)
-            except Exception:
-                logger.warning(f"[PRICE] 最终价格无法转为 float: {current_price}")
-                return None
-
-            current_price = min(max(raw_price, cap_min), cap_max)
-            if abs(current_price - raw_price) > 1e-12:
+            # current_price 来自盘口取价函数，已是 float
+            raw_price = current_price
+            if raw_price < PRICE_CAP_MIN:
+                current_price = PRICE_CAP_MIN
+            elif raw_price > PRICE_CAP_MAX:
+                current_price = PRICE_CAP_MAX
+            if current_price != raw_price:
                 logger.info(
-                    f"[PRICE] 最终价格触发 clamp: raw={raw_price:.6f} => clamped={current_price:.6f} (range=[{cap_min:.6f},{cap_max:.6f}])"
+                    f"[PRICE] 最终价格触发 clamp: raw={raw_price:.6f} => clamped={current_price:.6f} (range=[{PRICE_CAP_MIN:.6f},{PRICE_CAP_MAX:.6f}])"
                 )
 
             logger.info(f"[PRICE] 最终下单价格: {current_price:.6f}")
@@ -997,6 +1379,92 @@ class TradeExecutionService:
             logger.warning(f"[PRICE] 获取价格失败: {e}")
             return None
 
+    def _positions_by_token(self, source: str, positions: List[dict]) -> Dict[str, dict]:
+        """
+        返回持仓列表按 token_id 建立的索引，同一来源的列表对象未更换时复用上次的索引。
+
+        持仓缓存每次刷新都会整体替换 positions 列表（IntegratedMonitor.save_positions / 文件快照），
+        因此按列表对象判断是否需要重建即可；同一 token 出现多次时保留第一条，与原先线性扫描的命中顺序一致。
+        """
+        cached = self._pos_token_index.get(source)
+        if cached is not None and cached[0] is positions:
+            return cached[1]
+
+        index: Dict[str, dict] = {}
+        for position in positions:
+            index.setdefault(position.get("asset") or position.get("token_id"), position)
+        self._pos_token_index[source] = (positions, index)
+        return index
+
+    def _load_position_cache_file(self) -> dict:
+        """
+        读取 data/position_cache.json。
+
+        本进程写过的话直接返回内存副本；否则按文件 mtime 复用上次的解析结果。
+        """
+        cached = self._cache_mem.get("position_cache.json")
+        if cached is not None:
+            return cached
+
+        position_cache_file = _data_path("position_cache.json")
+        try:
+            mtime = os.stat(position_cache_file).st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        if self._pos_cache_snap is None or mtime != self._pos_cache_mtime:
+            with open(position_cache_file, 'rb') as f:
+                raw = f.read()
+            self._pos_cache_snap = _loads(raw)
+            self._pos_cache_mtime = mtime
+        return self._pos_cache_snap
+
+    def _get_file_cache(self, name: str) -> dict:
+        """返回 data/<name> 的内存副本（首次访问时从磁盘加载）"""
+        cache = self._cache_mem.get(name)
+        if cache is None:
+            try:
+                with open(_data_path(name), 'rb') as f:
+                    cache = _loads(f.read())
+            except FileNotFoundError:
+                cache = {}
+            self._cache_mem[name] = cache
+        return cache
+
+    def _mark_cache_dirty(self, name: str, record: Optional[dict] = None):
+        """
+        标记缓存文件待写入；CACHE_FLUSH_INTERVAL 内的多次修改合并为一次落盘。
+
+        record: 本次写入的条目，其 "timestamp" 由 _flush_caches 在落盘时统一填写（一次 isoformat 覆盖整批）
+        """
+        self._dirty_caches.add(name)
+        if record is not None:
+            self._unstamped_records.append(record)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_caches_later())
+
+    async def _flush_caches_later(self):
+        """延迟落盘任务：等待一个间隔后写出全部 dirty 缓存，期间又有新修改则继续下一轮"""
+        while self._dirty_caches:
+            await asyncio.sleep(CACHE_FLUSH_INTERVAL)
+            await self._flush_caches()
+
+    async def _flush_caches(self):
+        """把 dirty 缓存写入 data/ 目录（线程池中执行原子写）"""
+        async with self._flush_lock:
+            names, self._dirty_caches = self._dirty_caches, set()
+            records, self._unstamped_records = self._unstamped_records, []
+            if records:
+                now_iso = datetime.now().isoformat()
+                for record in records:
+                    record["timestamp"] = now_iso
+            for name in names:
+                # 浅拷贝：各条目都是整体替换而非原地修改，写盘期间事件循环继续更新不会互相影响
+                data = dict(self._cache_mem[name])
+                try:
+                    await _to_thread(None, _atomic_write_json, _data_path(name), data)
+                except Exception as e:
+                    logger.warning("[CACHE] 写入缓存文件 %s 失败: %s", name, e)
+
     def _apply_buy_minimums(self, target_amount: float, order_price: float) -> Optional[float]:
         """
         BUY 最小下单规则（按你最新口径）：
@@ -1020,19 +1488,13 @@ class TradeExecutionService:
             if price <= 0:
                 return None
 
-            min_shares = 5.0
-            min_amount = 1.0
-
             amt = float(target_amount)
-            raw_shares = amt / price if price > 0 else 0.0
-            final_shares = max(raw_shares, min_shares)
+            raw_shares, final_shares, final_amount = _buy_minimum_shares(amt, price)
 
-            final_amount = final_shares * price
-
-            if final_amount < min_amount:
+            if final_amount < BUY_MIN_NOTIONAL:
                 logger.info(
                     f"[ORDER] BUY 最小资金不满足：max(shares={raw_shares:.6f}, 5)={final_shares:.6f} "
-                    f"=> amount={final_amount:.6f} < {min_amount:.2f} USDC，跳过该订单"
+                    f"=> amount={final_amount:.6f} < {BUY_MIN_NOTIONAL:.2f} USDC，跳过该订单"
                 )
                 return None
 
@@ -1081,19 +1543,17 @@ class TradeExecutionService:
             if signal.side == "SELL":
                 # 卖出订单：基于持仓份额比例
                 logger.info(f"[ORDER] 卖出订单：基于持仓份额比例计算")
-                trader_balance = 1000.0
-                our_balance = 1000.0
-                trader_usage_ratio = 0
 
-                # 获取我们的持仓
-                our_position_shares = await self._get_position_shares(signal.token_id)
+                # 并发获取我们的持仓和交易员持仓（用于计算比例）
+                our_position_shares, trader_pos = await asyncio.gather(
+                    self._get_position_shares(signal.token_id),
+                    self._get_trader_position_detail(signal.token_id, signal.source_address),
+                )
                 if our_position_shares <= 0:
                     msg = "无持仓可供卖出"
                     logger.warning(f"[ORDER] {msg}，跳过")
                     return None, calc_details, msg
 
-                # 获取交易员持仓（用于计算比例）
-                trader_pos = await self._get_trader_position_detail(signal.token_id, signal.source_address)
                 trader_total = trader_pos.get('total_shares', 0)
 
                 # 计算交易员卖出股数
@@ -1144,9 +1604,11 @@ class TradeExecutionService:
                 logger.info(f"[ORDER] 最终卖出: {our_sell_shares:.4f}股 (持仓: {our_position_shares:.4f})")
 
             else:  # BUY 买入逻辑
-                # 买入时需要检查余额
-                trader_balance = await self._get_trader_usdc_balance(signal.source_address)
-                our_balance = await self._get_our_usdc_balance()
+                # 买入时需要检查余额（两个查询互不依赖，并发执行）
+                trader_balance, our_balance = await asyncio.gather(
+                    self._get_trader_usdc_balance(signal.source_address),
+                    self._get_our_usdc_balance(),
+                )
 
                 # 计算交易员余额使用比例
                 if trader_balance > 0:
@@ -1170,8 +1632,8 @@ class TradeExecutionService:
                 if trader_usage_ratio > 0:
                     # 风控规则1：限制交易员使用比例不超过配置上限 (默认10%)
                     # 如果交易员梭哈(100%)，我们只跟配置的上限比例
-                    # config配置为小数(如0.1)，此处转换为百分比(10.0)以匹配 trader_usage_ratio
-                    max_cap = self.config.max_trader_usage_cap * 100
+                    # config配置为小数(如0.1)，__init__ 中已转换为百分比(10.0)以匹配 trader_usage_ratio
+                    max_cap = self._max_cap_pct
                     effective_ratio = min(trader_usage_ratio, max_cap)
                     
                     # 记录风控触发
@@ -1197,8 +1659,9 @@ class TradeExecutionService:
                     if target_amount < original_target:
                         logger.info(f"[RISK] 计算金额 {original_target:.2f} 超过交易员下单金额 {signal.amount_usdc:.2f}，限制为交易员金额")
                     
-                    logger.info(f"[ORDER] 买入按比例: 我们的余额({our_balance:.2f}) × {effective_ratio:.3f}% (原{trader_usage_ratio:.2f}%) = {proportional_amount:.2f} USDC")
-                    logger.info(f"[ORDER] 应用跟单比例 {copy_ratio}x 后，最终下单金额: {target_amount:.2f} USDC")
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(f"[ORDER] 买入按比例: 我们的余额({our_balance:.2f}) × {effective_ratio:.3f}% (原{trader_usage_ratio:.2f}%) = {proportional_amount:.2f} USDC")
+                        logger.info(f"[ORDER] 应用跟单比例 {copy_ratio}x 后，最终下单金额: {target_amount:.2f} USDC")
                     
                     calc_details = (
                         f"交易员使用比例: {trader_usage_ratio:.2f}% (风控限制后: {effective_ratio:.2f}%)\n"
@@ -1285,8 +1748,8 @@ class TradeExecutionService:
                         calc_details += f"\n股数上限调整: 最大可买{max_shares_can_buy:.2f}股，调整为{target_amount:.2f} USDC"
 
             # 5. 应用订单大小限制（买入和卖出使用不同逻辑）
-            max_order_size = self.config.max_order_size  # 最大订单限制
-            min_order_size = self.config.min_order_size  # 最小订单限制，可能为None表示无限制
+            max_order_size = self._max_order_size
+            min_order_size = self._min_order_size
 
             if signal.side == "SELL":
                 # 卖出订单：基于实际持仓价值
@@ -1307,12 +1770,7 @@ class TradeExecutionService:
   
             # 6. 特殊检查：对于卖出订单，确保不会超过持仓数量
             if signal.side == "SELL":
-                # 重新获取持仓数量进行最终验证
-                our_position_shares = await self._get_position_shares(signal.token_id)
-                if our_position_shares <= 0:
-                    msg = "卖出订单：无持仓"
-                    logger.warning(f"[ORDER] {msg}，跳过此交易")
-                    return None, calc_details, msg
+                # our_position_shares 已在卖出分支开头获取并校验 > 0，这里直接复用，不再重复查询
 
                 # 计算当前持仓价值（以当前市场价格计算）
                 position_value_usdc = our_position_shares * order_price if order_price else 0
@@ -1327,14 +1785,14 @@ class TradeExecutionService:
             # 7. 检查账户余额（仅对买入订单有效，卖出不需要USDC余额）
             if signal.side == "BUY":
                 # 根据钱包类型决定是否预留gas费
-                if hasattr(self, 'wallet_type') and self.wallet_type == "代理钱包":
+                if self._is_proxy_wallet:
                     max_affordable = our_balance  # 代理钱包模式不需要预留gas费
                 else:
                     max_affordable = our_balance * 0.9  # 本地钱包模式保留10%作为gas费
 
                 # 检查余额是否足够支付计算出的跟单金额
                 if max_affordable < target_amount:
-                    wallet_type_text = "代理钱包" if (hasattr(self, 'wallet_type') and self.wallet_type == "代理钱包") else "本地钱包"
+                    wallet_type_text = "代理钱包" if self._is_proxy_wallet else "本地钱包"
                     msg = f"{wallet_type_text}余额不足，可用余额 {max_affordable:.2f} USDC 小于跟单金额 {target_amount:.2f} USDC"
                     logger.warning(f"[ORDER] {msg}，跳过此交易")
                     return None, calc_details, msg
@@ -1400,14 +1858,15 @@ class TradeExecutionService:
                 'order_type': 'MARKET' if is_market_order else order_type,  # 根据配置选择订单类型
                 'reduce_only': False,
                 'time_in_force': order_type,  # FOK/FAK/GTD/GTC
-                'client_order_id': f"copy_{int(time.time())}_{signal.original_tx_hash[:8]}"
+                'client_order_id': f"copy_{int(time.time() * 1000)}_{next(self._client_order_seq)}_{signal.original_tx_hash[:8]}"
             }
 
-            logger.info(f"[ORDER] 订单参数计算完成")
-            logger.info(f"[ORDER] 目标金额: {target_amount:.6f} USDC")
-            logger.info(f"[ORDER] 实际金额: {order_amount:.6f} USDC")
-            logger.info(f"[ORDER] 下单股数: {shares:.6f} 股")
-            logger.info(f"[ORDER] 下单价格: {order_price:.6f}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"[ORDER] 订单参数计算完成")
+                logger.info(f"[ORDER] 目标金额: {target_amount:.6f} USDC")
+                logger.info(f"[ORDER] 实际金额: {order_amount:.6f} USDC")
+                logger.info(f"[ORDER] 下单股数: {shares:.6f} 股")
+                logger.info(f"[ORDER] 下单价格: {order_price:.6f}")
 
             return order_params, calc_details, None
 
@@ -1422,14 +1881,40 @@ class TradeExecutionService:
         返回：
         - ClobClient：可用于下单、查询等操作
         """
+        if self._clob_client is not None:
+            return self._clob_client
+
         if not HAS_CLOB:
             raise ImportError("py-clob-client is not installed. Please install it with 'pip install py-clob-client'")
-        
-        # 使用 config.py 中的统一创建函数（支持懒加载缓存）
+
+        # 使用 config.py 中的统一创建函数，结果绑定在实例上，后续下单/取价直接复用
         from config import create_clob_client
-        return create_clob_client(
+        client = create_clob_client(
             config=self.config
         )
+        # 新版 py-clob-client 提供 get_orderbook，旧版只有 get_order_book；创建时确定一次
+        self._ob_fn = getattr(client, 'get_orderbook', None) or client.get_order_book
+        # create_clob_client 创建时已派生并设置凭证；派生失败时 creds 为空，由首次下单补上
+        if getattr(client, 'creds', None) is not None:
+            self._api_creds_expiry = time.monotonic() + API_CREDS_TTL
+        self._clob_client = client
+        return client
+
+    async def _ensure_api_creds(self, client, force: bool = False):
+        """
+        确保 client 已设置可用的 API 凭证。
+
+        凭证在 API_CREDS_TTL 内直接复用；过期或 force=True（服务端返回 401）时重新派生。
+        派生过程加锁，并发下单只会触发一次派生。
+        """
+        if not force and time.monotonic() < self._api_creds_expiry:
+            return
+        async with self._api_creds_lock:
+            if not force and time.monotonic() < self._api_creds_expiry:
+                return
+            creds = await _to_thread(self._executor, client.create_or_derive_api_creds)
+            client.set_api_creds(creds)
+            self._api_creds_expiry = time.monotonic() + API_CREDS_TTL
 
     async def _place_gtc_order(self, order_params):
         """
@@ -1453,68 +1938,75 @@ class TradeExecutionService:
         注意事项：
         - 价格上限：服务端 max=0.99，因此本函数在下单前会校验 0.001 <= price <= 0.99
         """
+        # 日志级别在一次下单过程中不会变化，只判断一次
+        info_enabled = logger.isEnabledFor(logging.INFO)
+
+        # 入口处统一转换为 float，之后 price / size_usdc / shares 均按 float 使用
         try:
-            logger.info(f"[PLACE] 开始下单...")
-            # logger.info(f"[PLACE] Token ID: {order_params['token_id']}")  # 已删除日志输出
-            logger.info(f"[PLACE] 方向: {order_params['side']}")
-            # 根据买卖方向显示对应的价格描述
-            side = BUY if order_params['side'] == 'BUY' else SELL
-            price_text = "买入价格" if side == BUY else "卖出价格"
-            logger.info(f"[PLACE] {price_text}: {order_params['price']:.6f}")
+            price = float(order_params['price'])
+            size_usdc = float(order_params['size'])
+            shares = order_params.get('shares')
+            shares = float(shares) if shares is not None else (size_usdc / price if price > 0 else 0.0)
+            notional = shares * price
+        except (TypeError, ValueError):
+            logger.error(
+                "[PLACE] Invalid order params price=%s, size=%s, shares=%s, cannot place order",
+                order_params.get('price'), order_params.get('size'), order_params.get('shares'),
+            )
+            return None
+
+        try:
+            if info_enabled:
+                logger.info("[PLACE] 开始下单...")
+                # logger.info(f"[PLACE] Token ID: {order_params['token_id']}")  # 已删除日志输出
+                logger.info("[PLACE] 方向: %s", order_params['side'])
+                # 根据买卖方向显示对应的价格描述
+                price_text = "买入价格" if order_params['side'] == 'BUY' else "卖出价格"
+                logger.info("[PLACE] %s: %.6f", price_text, price)
 
-            # 显示股数而不是USDC金额
-            shares = order_params.get('shares', order_params['size'] / order_params['price'] if order_params['price'] > 0 else 0)
-            logger.info(f"[PLACE] 股数: {float(shares):.6f}")
+                # 显示股数而不是USDC金额
+                logger.info("[PLACE] 股数: %.6f", shares)
 
             # 检查必要依赖
             if not HAS_CLOB:
                 logger.error("[PLACE] py-clob-client 未安装，无法下单")
                 return None
 
-            # 实盘下单
-            price = order_params['price']
-            size_usdc = order_params['size']
-
             # CLOB 价格约束：min 0.001 - max 0.99（服务端会拒绝 >0.99）
-            if price is None or not isinstance(price, (int, float)) or price < 0.001 or price > 0.99:
-                logger.error(f"[PLACE] Invalid price {price}, cannot place order (price must be 0.001 <= price <= 0.99)")
+            if price < PRICE_CAP_MIN or price > PRICE_CAP_MAX:
+                logger.error("[PLACE] Invalid price %s, cannot place order (price must be 0.001 <= price <= 0.99)", price)
                 return None
 
             # 特殊处理：对于卖出订单，直接使用持仓股数，不进行激进定价
             side = BUY if order_params['side'] == 'BUY' else SELL
             if side == SELL:
-                # 卖出时直接使用我们计算的持仓股数，不进行价格调整
-                # 从order_params中获取shares，这是基于持仓计算出的正确股数
-                shares = order_params.get('shares', size_usdc / price if price > 0 else 0)
-                logger.info(f"[PLACE] 卖出订单使用持仓股数: {shares:.2f}股")
+                # 卖出时直接使用我们计算的持仓股数（order_params.shares，基于持仓计算），不进行价格调整
+                logger.info("[PLACE] 卖出订单使用持仓股数: %.2f股", shares)
             else:
                 # BUY：客户端预检（按已观测到的服务端硬性规则）
                 # - marketable BUY 最小名义金额：$1
                 # - 最小股数：5
-                shares = order_params.get('shares', size_usdc / price if price > 0 else 0)
-
-                if shares is None or not isinstance(shares, (int, float)) or shares <= 0:
-                    logger.error(f"[PLACE] Invalid shares {shares}, cannot place order (shares must be > 0)")
+                if shares <= 0:
+                    logger.error("[PLACE] Invalid shares %s, cannot place order (shares must be > 0)", shares)
                     return None
 
-                notional = float(shares) * float(price)
                 logger.info(
-                    f"[PLACE] BUY 下单参数确认: price={float(price):.6f}, shares={float(shares):.6f}, notional={notional:.6f}"
+                    "[PLACE] BUY 下单参数确认: price=%.6f, shares=%.6f, notional=%.6f", price, shares, notional
                 )
 
-                min_buy_notional = 1.0
-                min_buy_shares = 5.0
+                min_buy_notional = BUY_MIN_NOTIONAL
+                min_buy_shares = BUY_MIN_SHARES
 
                 # 添加浮点数精度容差
-                if float(shares) < min_buy_shares - 0.000001:
+                if shares < min_buy_shares - 0.000001:
                     logger.info(
-                        f"[PLACE] BUY shares={float(shares):.6f} < min_buy_shares={min_buy_shares:.0f}，跳过下单"
+                        "[PLACE] BUY shares=%.6f < min_buy_shares=%.0f，跳过下单", shares, min_buy_shares
                     )
                     return None
 
                 if notional < min_buy_notional:
                     logger.info(
-                        f"[PLACE] BUY notional={notional:.6f} < min_buy_notional={min_buy_notional:.6f}，跳过下单"
+                        "[PLACE] BUY notional=%.6f < min_buy_notional=%.6f，跳过下单", notional, min_buy_notional
                     )
                     return None
 
@@ -1525,7 +2017,7 @@ class TradeExecutionService:
                     amount=shares, # MarketOrderArgs 使用 amount 表示股数
                     side=side,
                 )
-                logger.info(f"[PLACE] 构建市价单参数: {shares} 股")
+                logger.info("[PLACE] 构建市价单参数: %s 股", shares)
             else:
                 # 限价单参数
                 time_in_force = order_params.get('time_in_force', 'GTD')
@@ -1540,7 +2032,7 @@ class TradeExecutionService:
                         side=side,
                         expiration=expiration_timestamp,
                     )
-                    logger.info(f"[PLACE] 构建GTD限价单参数: {shares} 股, 过期时间: {expiration_timestamp} (有效期: {self.config.order_expiry_seconds}秒)")
+                    logger.info("[PLACE] 构建GTD限价单参数: %s 股, 过期时间: %s (有效期: %s秒)", shares, expiration_timestamp, self.config.order_expiry_seconds)
                 else:
                     # GTC 订单不需要设置过期时间
                     order_args = OrderArgs(
@@ -1549,164 +2041,167 @@ class TradeExecutionService:
                         size=shares,
                         side=side,
                     )
-                    logger.info(f"[PLACE] 构建GTC限价单参数: {shares} 股")
+                    logger.info("[PLACE] 构建GTC限价单参数: %s 股", shares)
 
             # ===== 下单入参打印（用于排查“到底提交了什么”）=====
-            try:
-                notional = float(shares) * float(price)
-            except Exception:
-                notional = None
-
-            try:
-                logger.info(
-                    "[PLACE-PAYLOAD] order_params="
-                    + json.dumps(
-                        {
-                            "token_id": str(order_params.get("token_id")),
-                            "side": str(order_params.get("side")),
-                            "price": float(price) if isinstance(price, (int, float)) else price,
-                            "size_usdc_intended": float(order_params.get("size")) if isinstance(order_params.get("size"), (int, float)) else order_params.get("size"),
-                            "shares_submitted": float(shares) if isinstance(shares, (int, float)) else shares,
-                            "notional_estimated": float(notional) if isinstance(notional, (int, float)) else notional,
-                            "client_order_id": str(order_params.get("client_order_id")),
-                        },
-                        ensure_ascii=False,
-                        separators=(",", ":"),
+            if info_enabled:
+                try:
+                    logger.info(
+                        "[PLACE-PAYLOAD] order_params="
+                        + _dumps(
+                            {
+                                "token_id": str(order_params.get("token_id")),
+                                "side": str(order_params.get("side")),
+                                "price": price,
+                                "size_usdc_intended": size_usdc,
+                                "shares_submitted": shares,
+                                "notional_estimated": notional,
+                                "client_order_id": str(order_params.get("client_order_id")),
+                            }
+                        )
                     )
-                )
-            except Exception as e:
-                logger.warning(f"[PLACE-PAYLOAD] 打印 order_params 失败: {e}")
+                except Exception as e:
+                    logger.warning("[PLACE-PAYLOAD] 打印 order_params 失败: %s", e)
 
-            try:
-                logger.info(
-                    "[PLACE-PAYLOAD] order_args="
-                    + json.dumps(
-                        {
-                            "token_id": str(order_args.token_id),
-                            "side": str(order_args.side),
-                            "price": float(order_args.price),
-                            "size_shares": float(order_args.size),
-                            "notional_estimated": float(order_args.size) * float(order_args.price),
-                        },
-                        ensure_ascii=False,
-                        separators=(",", ":"),
+                try:
+                    logger.info(
+                        "[PLACE-PAYLOAD] order_args="
+                        + _dumps(
+                            {
+                                "token_id": str(order_args.token_id),
+                                "side": str(order_args.side),
+                                "price": order_args.price,
+                                "size_shares": order_args.size,
+                                "notional_estimated": notional,
+                            }
+                        )
                     )
-                )
-            except Exception as e:
-                logger.warning(f"[PLACE-PAYLOAD] 打印 order_args 失败: {e}")
+                except Exception as e:
+                    logger.warning("[PLACE-PAYLOAD] 打印 order_args 失败: %s", e)
 
             client = self._get_clob_client()
 
-            # 使用quick_sell.py的成功逻辑：重新生成API凭证并直接提交
-            try:
-                # 重新生成API凭证
-                creds = await asyncio.to_thread(client.create_or_derive_api_creds)
-                client.set_api_creds(creds)
-                # logger.info(f"[PLACE] API凭证重新生成成功: {creds.api_key[:8]}...")  # 已删除日志输出
-            except Exception as e:
-                logger.error(f"[PLACE] API凭证生成失败: {e}")
-                return None
-
+            # API 凭证在有效期内复用（见 _ensure_api_creds）；需要派生时与订单签名（本地私钥）并发执行
             # 同步方法在异步环境中执行，使用线程池避免阻塞事件循环
             if order_params.get('order_type') == 'MARKET':
-                signed_order = await asyncio.to_thread(client.create_market_order, order_args)
+                sign_task = _to_thread(self._executor, client.create_market_order, order_args)
             else:
-                signed_order = await asyncio.to_thread(client.create_order, order_args)
+                sign_task = _to_thread(self._executor, client.create_order, order_args)
+            creds_result, signed_order = await asyncio.gather(
+                self._ensure_api_creds(client),
+                sign_task,
+                return_exceptions=True,
+            )
+
+            if isinstance(creds_result, BaseException):
+                logger.error("[PLACE] API凭证生成失败: %s", creds_result)
+                return None
+
+            if isinstance(signed_order, BaseException):
+                raise signed_order
 
             # ===== 签名订单打印（不含任何私钥；仅签名结果/结构）=====
-            try:
-                if isinstance(signed_order, dict):
-                    logger.info(
-                        "[PLACE-PAYLOAD] signed_order(dict)="
-                        + json.dumps(signed_order, ensure_ascii=False, separators=(",", ":"))
-                    )
-                else:
-                    logger.info(f"[PLACE-PAYLOAD] signed_order(type)={type(signed_order)} value={signed_order}")
-            except Exception as e:
-                logger.warning(f"[PLACE-PAYLOAD] 打印 signed_order 失败: {e}")
+            if info_enabled:
+                try:
+                    if isinstance(signed_order, dict):
+                        logger.info("[PLACE-PAYLOAD] signed_order(dict)=" + _dumps(signed_order))
+                    else:
+                        logger.info("[PLACE-PAYLOAD] signed_order(type)=%s value=%s", type(signed_order), signed_order)
+                except Exception as e:
+                    logger.warning("[PLACE-PAYLOAD] 打印 signed_order 失败: %s", e)
 
             # 直接使用post_order提交（quick_sell.py成功方式）
             try:
                 order_type = order_params.get('time_in_force', 'GTD')
                 if order_type == 'FOK':
-                    resp = await asyncio.to_thread(client.post_order, signed_order, ClobOrderType.FOK)
-                    logger.info(f"[PLACE] 订单提交成功 (FOK市价单)")
+                    clob_order_type, type_text = ClobOrderType.FOK, "FOK市价单"
                 elif order_type == 'FAK':
-                    resp = await asyncio.to_thread(client.post_order, signed_order, ClobOrderType.FAK)
-                    logger.info(f"[PLACE] 订单提交成功 (FAK市价单)")
+                    clob_order_type, type_text = ClobOrderType.FAK, "FAK市价单"
                 elif order_type == 'GTC':
-                    resp = await asyncio.to_thread(client.post_order, signed_order, ClobOrderType.GTC)
-                    logger.info(f"[PLACE] 订单提交成功 (GTC限价单，需手动撤单)")
+                    clob_order_type, type_text = ClobOrderType.GTC, "GTC限价单，需手动撤单"
                 else:
                     # 默认使用 GTD 订单类型（平台自动撤单）
-                    resp = await asyncio.to_thread(client.post_order, signed_order, ClobOrderType.GTD)
-                    logger.info(f"[PLACE] 订单提交成功 (GTD限价单，平台自动撤单)")
+                    clob_order_type, type_text = ClobOrderType.GTD, "GTD限价单，平台自动撤单"
+
                 try:
-                    logger.info(
-                        "[PLACE-PAYLOAD] post_order_resp="
-                        + json.dumps(resp, ensure_ascii=False, separators=(",", ":"))
-                    )
-                except Exception:
-                    logger.info(f"[PLACE-PAYLOAD] post_order_resp(type)={type(resp)} value={resp}")
+                    resp = await _to_thread(self._executor, client.post_order, signed_order, clob_order_type)
+                except Exception as e:
+                    if not _is_auth_error(e):
+                        raise
+                    # 缓存的凭证已失效：重新派生后重试一次
+                    logger.warning("[PLACE] API凭证失效，重新派生后重试: %s", e)
+                    await self._ensure_api_creds(client, force=True)
+                    resp = await _to_thread(self._executor, client.post_order, signed_order, clob_order_type)
+                logger.info("[PLACE] 订单提交成功 (%s)", type_text)
+                if info_enabled:
+                    try:
+                        logger.info("[PLACE-PAYLOAD] post_order_resp=%s", _dumps(resp))
+                    except Exception:
+                        logger.info("[PLACE-PAYLOAD] post_order_resp(type)=%s value=%s", type(resp), resp)
             except Exception as e:
-                logger.error(f"[PLACE] 订单提交失败: {e}")
-                logger.error(f"[PLACE] 异常类型: {type(e).__name__}")
+                logger.error("[PLACE] 订单提交失败: %s", e)
+                logger.error("[PLACE] 异常类型: %s", type(e).__name__)
                 import traceback
-                logger.error(f"[PLACE] 堆栈跟踪: {traceback.format_exc()}")
+                logger.error("[PLACE] 堆栈跟踪: %s", traceback.format_exc())
                 return None
 
             # 使用quick_sell.py的响应判断逻辑
             if resp and isinstance(resp, dict) and resp.get('success'):
                 order_id = resp.get('orderID')
                 if not order_id:
-                    logger.error(f"[PLACE] 实盘下单返回缺少 orderID: {resp}")
+                    logger.error("[PLACE] 实盘下单返回缺少 orderID: %s", resp)
                     return None
 
                 status = resp.get('status', 'N/A')
                 taking_amount = resp.get('takingAmount', '0')
 
-                logger.info(f"[PLACE] 实盘下单成功，订单ID: {order_id}")
-                logger.info(f"[PLACE] 订单状态: {status}")
+                logger.info("[PLACE] 实盘下单成功，订单ID: %s", order_id)
+                logger.info("[PLACE] 订单状态: %s", status)
 
                 # 注意：Polymarket/py-clob-client 的响应字段 takingAmount 在 BUY 场景下更像“成交股数”
                 # 你的现象：price≈0.934 时，takingAmount=5 但你期望成交金额≈4.67（=5股*0.934）
                 # 因此这里按 side 做区分打印，并给出“成交金额(按 shares*price 计算)”以对齐你关注的金额口径。
-                try:
-                    taking_amount_f = float(taking_amount)
-                except Exception:
-                    taking_amount_f = None
-
-                if side == BUY:
-                    if taking_amount_f is not None:
-                        est_notional_usdc = taking_amount_f * float(price)
-                        logger.info(f"[PLACE] 成交股数(takingAmount): {taking_amount_f:.6f} 股")
-                        logger.info(f"[PLACE] 成交金额(按 shares*price 计算): {est_notional_usdc:.6f} USDC")
+                if info_enabled:
+                    try:
+                        taking_amount_f = float(taking_amount)
+                    except Exception:
+                        taking_amount_f = None
+
+                    if side == BUY:
+                        if taking_amount_f is not None:
+                            est_notional_usdc = taking_amount_f * price
+                            logger.info("[PLACE] 成交股数(takingAmount): %.6f 股", taking_amount_f)
+                            logger.info("[PLACE] 成交金额(按 shares*price 计算): %.6f USDC", est_notional_usdc)
+                        else:
+                            logger.info("[PLACE] 成交股数(takingAmount): %s (raw)", taking_amount)
                     else:
-                        logger.info(f"[PLACE] 成交股数(takingAmount): {taking_amount} (raw)")
-                else:
-                    # SELL 场景下保持原语义（通常 takingAmount 更接近 USDC）
-                    logger.info(f"[PLACE] 成交金额(takingAmount): {taking_amount} USDC")
+                        # SELL 场景下保持原语义（通常 takingAmount 更接近 USDC）
+                        logger.info("[PLACE] 成交金额(takingAmount): %s USDC", taking_amount)
+
+                    logger.info("[PLACE] 下单股数: %s 股", shares)
 
-                logger.info(f"[PLACE] 下单股数: {shares} 股")
+                # 下单后我们的余额/该 token 持仓已变化，丢弃缓存的查询结果
+                self._invalidate_lookups(("our_balance",), ("position", order_params['token_id']))
 
                 # 创建订单状态记录
-                self.orders_cache[order_id] = OrderStatus(
+                created_at = time.time()
+                self._store_order(OrderStatus(
                     order_id=order_id,
                     token_id=order_params['token_id'],
                     side=order_params['side'],
                     amount=size_usdc,
                     filled_amount=0,
                     price=price,
-                    created_at=time.time(),
+                    created_at=created_at,
                     status='pending',
-                    expires_at=time.time() + self.config.order_expiry_seconds,
+                    expires_at=created_at + self.config.order_expiry_seconds,
                     original_signal=order_params['client_order_id']
-                )
+                ))
 
                 # 返回 order_id 和 taking_amount
                 return order_id, taking_amount
             else:
-                logger.error(f"[PLACE] 实盘下单失败: {resp}")
+                logger.error("[PLACE] 实盘下单失败: %s", resp)
                 return None
 
         except Exception as e:
@@ -1714,22 +2209,30 @@ class TradeExecutionService:
 
             # 精确匹配余额不足的错误信息
             if "not enough balance / allowance" in error_msg:
-                logger.error(f"[PLACE] 下单失败: 余额不足或授权不足")
-                logger.error(f"[BALANCE] ⚠️  余额检查提醒:")
-                logger.error(f"[BALANCE]    - 当前尝试交易金额: {size_usdc:.2f} USDC")
-                logger.error(f"[BALANCE]    - 钱包地址: {self.config.proxy_wallet_address}")
-                logger.error(f"[BALANCE]    - 请检查:")
-                logger.error(f"[BALANCE]      1. USDC余额是否充足 (需要至少 {size_usdc:.2f} USDC)")
-                logger.error(f"[BALANCE]      2. USDC是否已授权给CLOB交易所")
-                logger.error(f"[BALANCE]    - 运行 check_balance.py 检查当前余额")
+                logger.error("[PLACE] 下单失败: 余额不足或授权不足")
+                logger.error("[BALANCE] ⚠️  余额检查提醒:")
+                logger.error("[BALANCE]    - 当前尝试交易金额: %.2f USDC", size_usdc)
+                logger.error("[BALANCE]    - 钱包地址: %s", self.config.proxy_wallet_address)
+                logger.error("[BALANCE]    - 请检查:")
+                logger.error("[BALANCE]      1. USDC余额是否充足 (需要至少 %.2f USDC)", size_usdc)
+                logger.error("[BALANCE]      2. USDC是否已授权给CLOB交易所")
+                logger.error("[BALANCE]    - 运行 check_balance.py 检查当前余额")
 
             else:
-                logger.error(f"[PLACE] 下单失败: {e}", exc_info=True)
+                logger.error("[PLACE] 下单失败: %s", e, exc_info=True)
 
             return None
 
     # API调用方法 (待实现)
     async def _get_trader_usdc_balance(self, trader_address):
+        """获取交易员 USDC 余额（BALANCE_LOOKUP_TTL 内复用上次结果）"""
+        return await self._cached_lookup(
+            ("trader_balance", trader_address.lower()),
+            BALANCE_LOOKUP_TTL,
+            lambda: self._load_trader_usdc_balance(trader_address),
+        )
+
+    async def _load_trader_usdc_balance(self, trader_address):
         """
         获取交易员 USDC 余额（用于“余额比例跟单”的分母）。
 
@@ -1741,21 +2244,13 @@ class TradeExecutionService:
         - 该余额仅用于计算比例与日志，不直接参与链上资金扣款。
         """
         try:
+            addr_short = trader_address[:8]  # 日志用短地址
+
             # 优先从内存变量读取
-            if hasattr(self, 'memory_monitor') and self.memory_monitor:
+            if self.memory_monitor:
                 balance_cache = self.memory_monitor.get_balance_cache()
                 
-                target_key = None
-                if balance_cache:
-                    if trader_address in balance_cache:
-                        target_key = trader_address
-                    else:
-                        # 大小写不敏感查找
-                        trader_lower = trader_address.lower()
-                        for k in balance_cache:
-                            if k.lower() == trader_lower:
-                                target_key = k
-                                break
+                target_key = self._find_balance_key(balance_cache, trader_address) if balance_cache else None
 
                 if target_key:
                     # 修复：BalanceRecord是对象，需要用.属性访问，而不是字典键访问
@@ -1764,7 +2259,7 @@ class TradeExecutionService:
                     
                     # 如果余额为0，可能是缓存过期或网络问题，尝试重新获取
                     if balance_usdc == 0:
-                        logger.warning(f"[BALANCE] 交易员 {trader_address[:8]}... 余额为0，尝试从API重新获取...")
+                        logger.warning("[BALANCE] 交易员 %s... 余额为0，尝试从API重新获取...", addr_short)
                         try:
                             await self._update_trader_balance(trader_address)
                             # 重新从缓存读取
@@ -1772,15 +2267,15 @@ class TradeExecutionService:
                             if balance_cache and target_key in balance_cache:
                                 balance_record = balance_cache[target_key]
                                 balance_usdc = float(balance_record.balance)
-                                logger.info(f"[BALANCE] 交易员 {trader_address[:8]}... 余额: {balance_usdc:.2f} USDC (重新获取)")
+                                logger.info("[BALANCE] 交易员 %s... 余额: %.2f USDC (重新获取)", addr_short, balance_usdc)
                                 return balance_usdc
                         except Exception as api_e:
-                            logger.warning(f"[BALANCE] 重新获取交易员余额失败: {api_e}")
+                            logger.warning("[BALANCE] 重新获取交易员余额失败: %s", api_e)
                     else:
-                        logger.info(f"[BALANCE] 交易员 {trader_address[:8]}... 余额: {balance_usdc:.2f} USDC (从内存读取)")
+                        logger.info("[BALANCE] 交易员 %s... 余额: %.2f USDC (从内存读取)", addr_short, balance_usdc)
                     return balance_usdc
                 else:
-                    logger.warning(f"[BALANCE] 交易员 {trader_address[:8]}... 余额信息不存在于内存中，尝试从API获取...")
+                    logger.warning("[BALANCE] 交易员 %s... 余额信息不存在于内存中，尝试从API获取...", addr_short)
                     # 缓存未命中，调用API获取并更新缓存
                     try:
                         await self._update_trader_balance(trader_address)
@@ -1789,24 +2284,28 @@ class TradeExecutionService:
                         if balance_cache and trader_address in balance_cache:
                             balance_record = balance_cache[trader_address]
                             balance_usdc = float(balance_record.balance)
-                            logger.info(f"[BALANCE] 交易员 {trader_address[:8]}... 余额: {balance_usdc:.2f} USDC (从API获取并缓存)")
+                            logger.info("[BALANCE] 交易员 %s... 余额: %.2f USDC (从API获取并缓存)", addr_short, balance_usdc)
                             return balance_usdc
                     except Exception as api_e:
-                        logger.warning(f"[BALANCE] 从API获取交易员余额失败: {api_e}")
+                        logger.warning("[BALANCE] 从API获取交易员余额失败: %s", api_e)
                     
                     if balance_cache:
-                        logger.warning(f"[BALANCE] 内存中可用地址示例: {list(balance_cache.keys())[:3]}...")
+                        logger.warning("[BALANCE] 内存中可用地址示例: %s...", list(balance_cache.keys())[:3])
                     return 1000.0  # 返回默认值避免程序中断
             else:
                 # 如果没有内存监控器，返回默认值
-                logger.warning(f"[BALANCE] 内存监控器不可用，使用默认余额")
+                logger.warning("[BALANCE] 内存监控器不可用，使用默认余额")
                 return 1000.0
 
         except Exception as e:
-            logger.warning(f"[BALANCE] 从内存获取交易员余额失败: {e}")
+            logger.warning("[BALANCE] 从内存获取交易员余额失败: %s", e)
             return 1000.0  # 返回默认值避免程序中断
 
     async def _get_our_usdc_balance(self):
+        """获取我们钱包的 USDC 余额（BALANCE_LOOKUP_TTL 内复用上次结果）"""
+        return await self._cached_lookup(("our_balance",), BALANCE_LOOKUP_TTL, self._load_our_usdc_balance)
+
+    async def _load_our_usdc_balance(self):
         """
         获取我们钱包的 USDC 余额（用于决定是否能下单/以及跟单金额上限）。
 
@@ -1819,37 +2318,19 @@ class TradeExecutionService:
         - 否则按环境变量 `PROXY_WALLET_ADDRESS` -> `LOCAL_WALLET_ADDRESS` 兜底
         """
         try:
-            # 获取我们的钱包地址（优先使用代理钱包地址）
-            our_address = None
-            if hasattr(self, 'proxy_wallet') and self.proxy_wallet:
-                our_address = self.proxy_wallet
-            else:
-                # 从配置获取代理钱包地址
-                our_address = self.config.proxy_wallet_address
+            # 获取我们的钱包地址（__init__ 中已按 proxy_wallet -> 代理 -> 本地 的顺序解析）
+            our_address = self._our_balance_address
 
-            # 如果没有代理钱包地址，尝试从本地钱包地址获取
             if not our_address:
-                our_address = self.config.local_wallet_address
-
-            if not our_address:
-                logger.error(f"[BALANCE] 未配置我们的钱包地址")
+                logger.error("[BALANCE] 未配置我们的钱包地址")
                 return 10.0  # 返回默认值避免程序中断
+            addr_short = our_address[:8]  # 日志用短地址
 
             # 优先从内存变量读取
-            if hasattr(self, 'memory_monitor') and self.memory_monitor:
+            if self.memory_monitor:
                 balance_cache = self.memory_monitor.get_balance_cache()
 
-                target_key = None
-                if balance_cache:
-                    if our_address in balance_cache:
-                        target_key = our_address
-                    else:
-                        # 大小写不敏感查找
-                        our_lower = our_address.lower()
-                        for k in balance_cache:
-                            if k.lower() == our_lower:
-                                target_key = k
-                                break
+                target_key = self._find_balance_key(balance_cache, our_address) if balance_cache else None
 
                 if target_key:
                     # 修复：BalanceRecord是对象，需要用.属性访问，而不是字典键访问
@@ -1858,7 +2339,7 @@ class TradeExecutionService:
                     
                     # 如果余额为0，可能是缓存过期或网络问题，尝试重新获取
                     if balance_usdc == 0:
-                        logger.warning(f"[BALANCE] 我们的钱包 {our_address[:8]}... 余额为0，尝试从API重新获取...")
+                        logger.warning("[BALANCE] 我们的钱包 %s... 余额为0，尝试从API重新获取...", addr_short)
                         try:
                             await self._fetch_and_cache_balance()
                             # 重新从缓存读取
@@ -1866,15 +2347,15 @@ class TradeExecutionService:
                             if balance_cache and target_key in balance_cache:
                                 balance_record = balance_cache[target_key]
                                 balance_usdc = float(balance_record.balance)
-                                logger.info(f"[BALANCE] 我们的钱包 {our_address[:8]}... 余额: {balance_usdc:.2f} USDC (重新获取)")
+                                logger.info("[BALANCE] 我们的钱包 %s... 余额: %.2f USDC (重新获取)", addr_short, balance_usdc)
                                 return balance_usdc
                         except Exception as api_e:
-                            logger.warning(f"[BALANCE] 重新获取我们的余额失败: {api_e}")
+                            logger.warning("[BALANCE] 重新获取我们的余额失败: %s", api_e)
                     else:
-                        logger.info(f"[BALANCE] 我们的钱包 {our_address[:8]}... 余额: {balance_usdc:.2f} USDC (从内存读取)")
+                        logger.info("[BALANCE] 我们的钱包 %s... 余额: %.2f USDC (从内存读取)", addr_short, balance_usdc)
                     return balance_usdc
                 else:
-                    logger.warning(f"[BALANCE] 我们的钱包 {our_address[:8]}... 余额信息不存在于内存中，尝试从API获取...")
+                    logger.warning("[BALANCE] 我们的钱包 %s... 余额信息不存在于内存中，尝试从API获取...", addr_short)
                     # 缓存未命中，调用API获取并更新缓存
                     try:
                         await self._fetch_and_cache_balance()
@@ -1883,34 +2364,78 @@ class TradeExecutionService:
                         if balance_cache and our_address in balance_cache:
                             balance_record = balance_cache[our_address]
                             balance_usdc = float(balance_record.balance)
-                            logger.info(f"[BALANCE] 我们的钱包 {our_address[:8]}... 余额: {balance_usdc:.2f} USDC (从API获取并缓存)")
+                            logger.info("[BALANCE] 我们的钱包 %s... 余额: %.2f USDC (从API获取并缓存)", addr_short, balance_usdc)
                             return balance_usdc
                     except Exception as api_e:
-                        logger.warning(f"[BALANCE] 从API获取我们的余额失败: {api_e}")
+                        logger.warning("[BALANCE] 从API获取我们的余额失败: %s", api_e)
                     return 10.0  # 返回默认值避免程序中断
             else:
                 # 如果没有内存监控器，返回默认值
-                logger.warning(f"[BALANCE] 内存监控器不可用，使用默认余额")
+                logger.warning("[BALANCE] 内存监控器不可用，使用默认余额")
                 return 10.0
 
         except Exception as e:
-            logger.warning(f"[BALANCE] 从内存获取我们的余额失败: {e}")
+            logger.warning("[BALANCE] 从内存获取我们的余额失败: %s", e)
             return 10.0  # 返回默认值避免程序中断
 
+    def _find_balance_key(self, balance_cache: dict, address: str) -> Optional[str]:
+        """
+        在余额缓存中查找地址对应的 key（精确匹配优先，其次大小写不敏感）。
+
+        小写地址索引按 balance_cache 对象和条目数复用：IntegratedMonitor.save_balances 整体替换字典，
+        新增地址会改变条目数，两种情况都会触发重建。
+        """
+        if address in balance_cache:
+            return address
+
+        cached = self._balance_addr_index
+        if cached is None or cached[0] is not balance_cache or cached[1] != len(balance_cache):
+            index: Dict[str, str] = {}
+            for k in balance_cache:
+                index.setdefault(k.lower(), k)
+            cached = self._balance_addr_index = (balance_cache, len(balance_cache), index)
+        return cached[2].get(address.lower())
+
     async def _get_account_balance(self):
         """获取账户余额（保留兼容性）"""
         return await self._get_our_usdc_balance()
 
-    def get_order_statistics(self):
-        """获取订单统计信息"""
-        total_orders = len(self.orders_cache)
-        pending_orders = sum(1 for order in self.orders_cache.values() if order.status == 'pending')
-        filled_orders = sum(1 for order in self.orders_cache.values() if order.status == 'filled')
+    def _store_order(self, order: OrderStatus):
+        """写入/覆盖订单记录，并同步状态计数"""
+        previous = self.orders_cache.get(order.order_id)
+        if previous is not None:
+            self._order_status_counts[previous.status] -= 1
+        self.orders_cache[order.order_id] = order
+        self.orders_cache.move_to_end(order.order_id)
+        self._order_status_counts[order.status] += 1
+        if len(self.orders_cache) > ORDERS_CACHE_MAX:
+            self._evict_order()
+
+    def _evict_order(self):
+        """淘汰一条订单记录：从最早的开始找终态订单，找不到则淘汰最早的一条"""
+        victim = next(
+            (oid for oid, o in self.orders_cache.items() if o.status in ORDER_TERMINAL_STATUSES),
+            None,
+        )
+        if victim is None:
+            victim = next(iter(self.orders_cache))
+        self._order_status_counts[self.orders_cache.pop(victim).status] -= 1
+
+    def _set_order_status(self, order_id: str, status: str):
+        """更新订单状态，并同步状态计数（未知订单忽略）"""
+        order = self.orders_cache.get(order_id)
+        if order is None or order.status == status:
+            return
+        self._order_status_counts[order.status] -= 1
+        self._order_status_counts[status] += 1
+        order.status = status
 
+    def get_order_statistics(self):
+        """获取订单统计信息（O(1)：状态计数随订单写入同步维护）"""
         return {
-            'total_orders': total_orders,
-            'pending_orders': pending_orders,
-            'filled_orders': filled_orders,
+            'total_orders': len(self.orders_cache),
+            'pending_orders': self._order_status_counts['pending'],
+            'filled_orders': self._order_status_counts['filled'],
             'processed_signals': len(self.processed_signals)
         }
 
@@ -1921,42 +2446,61 @@ class TradeExecutionService:
 
             # 通过 memory_monitor 更新内存缓存（与启动时保持一致）
             if self.memory_monitor:
+                monitor = self.memory_monitor
+                our_address = self.config.proxy_wallet_address or self.config.local_wallet_address
+                logger.info(f"[UPDATE] 并发更新目标交易员 {signal.source_address[:8]}... 与我们自己的持仓/余额")
+
+                # 四个查询互不依赖，并发执行；单个失败只跳过对应的缓存更新
+                fetches = [
+                    monitor.get_trader_positions(signal.source_address),
+                    monitor.get_trader_balance(signal.source_address),
+                ]
+                if our_address:
+                    fetches += [
+                        monitor.get_my_positions(our_address),
+                        monitor.get_trader_balance(our_address),
+                    ]
+                results = await asyncio.gather(*fetches, return_exceptions=True)
+                trader_positions, trader_balance = results[0], results[1]
+                our_positions, our_balance = (results[2], results[3]) if our_address else (None, None)
+
+                for label, result in (("交易员持仓", trader_positions), ("交易员余额", trader_balance),
+                                      ("我们的持仓", our_positions), ("我们的余额", our_balance)):
+                    if isinstance(result, BaseException):
+                        logger.warning(f"[UPDATE] 更新{label}失败: {result}")
+
                 # 1. 更新目标交易员的持仓
-                logger.info(f"[UPDATE] 更新目标交易员 {signal.source_address[:8]}... 的持仓")
-                from balance_monitor import IntegratedMonitor
-                monitor = IntegratedMonitor()
-                trader_positions = await monitor.get_trader_positions(signal.source_address)
-                current_cache = self.memory_monitor.get_trader_positions_cache()
-                current_cache[signal.source_address] = trader_positions
-                self.memory_monitor.save_trader_positions_to_cache(current_cache)
+                if not isinstance(trader_positions, BaseException):
+                    current_cache = monitor.get_trader_positions_cache()
+                    current_cache[signal.source_address] = trader_positions
+                    monitor.save_trader_positions_to_cache(current_cache)
 
                 # 2. 更新我们自己的持仓
-                logger.info(f"[UPDATE] 更新我们自己的持仓")
-                our_address = self.config.proxy_wallet_address or self.config.local_wallet_address
-                if our_address:
-                    our_positions = await monitor.get_my_positions(our_address)
-                    self.memory_monitor.save_positions(our_address, our_positions)
+                if our_address and not isinstance(our_positions, BaseException):
+                    monitor.save_positions(our_address, our_positions)
 
-                # 3. 更新余额数据（交易员）
-                logger.info(f"[UPDATE] 更新余额数据")
-                trader_balance = await monitor.get_trader_balance(signal.source_address)
-                current_balances = self.memory_monitor.get_balance_cache()
+                # 3. 更新余额数据（交易员 + 我们自己）
                 from balance_monitor import BalanceRecord
-                current_balances[signal.source_address] = BalanceRecord(
-                    balance=trader_balance,
-                    timestamp=datetime.now().isoformat()
-                )
-                self.memory_monitor.save_balances(current_balances)
-
-                # 4. 更新余额数据（我们自己）
-                if our_address:
-                    our_balance = await monitor.get_trader_balance(our_address)
+                current_balances = monitor.get_balance_cache()
+                now_iso = datetime.now().isoformat()
+                if not isinstance(trader_balance, BaseException):
+                    current_balances[signal.source_address] = BalanceRecord(
+                        balance=trader_balance,
+                        timestamp=now_iso
+                    )
+                if our_address and not isinstance(our_balance, BaseException):
                     current_balances[our_address] = BalanceRecord(
                         balance=our_balance,
-                        timestamp=datetime.now().isoformat()
+                        timestamp=now_iso
                     )
-                    self.memory_monitor.save_balances(current_balances)
+                monitor.save_balances(current_balances)
 
+                self._invalidate_lookups(
+                    ("trader_balance", signal.source_address.lower()),
+                    ("trader_position", signal.source_address.lower(), signal.token_id),
+                    ("our_balance",),
+                    ("position", signal.token_id),
+                )
                 logger.info(f"[UPDATE] 持仓数据更新完成（已更新内存缓存）")
             else:
                 logger.warning(f"[UPDATE] memory_monitor 未初始化，跳过缓存更新")
@@ -1992,21 +2536,21 @@ class TradeExecutionService:
             logger.debug(f"[BALANCE] RPC请求: {rpc_url}")
             logger.debug(f"[BALANCE] 请求参数: {data}")
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(rpc_url, json=data, timeout=10) as response:
-                    logger.debug(f"[BALANCE] 响应状态: {response.status}")
-                    if response.status == 200:
-                        result = await response.json()
-                        logger.debug(f"[BALANCE] 响应结果: {result}")
-                        if "result" in result and result["result"] and result["result"] != "0x":
-                            # USDC有6位小数
-                            balance_wei = int(result["result"], 16)
-                            return balance_wei / 1000000
-                        else:
-                            logger.warning(f"[BALANCE] RPC返回无效结果: {result}")
+            session = self._ensure_session()
+            async with session.post(rpc_url, json=data, timeout=10) as response:
+                logger.debug(f"[BALANCE] 响应状态: {response.status}")
+                if response.status == 200:
+                    result = await _read_json(response)
+                    logger.debug(f"[BALANCE] 响应结果: {result}")
+                    if "result" in result and result["result"] and result["result"] != "0x":
+                        # USDC有6位小数
+                        balance_wei = int(result["result"], 16)
+                        return balance_wei / 1000000
                     else:
-                        response_text = await response.text()
-                        logger.warning(f"[BALANCE] RPC请求失败: HTTP {response.status}, {response_text}")
+                        logger.warning(f"[BALANCE] RPC返回无效结果: {result}")
+                else:
+                    response_text = await response.text()
+                    logger.warning(f"[BALANCE] RPC请求失败: HTTP {response.status}, {response_text}")
             return 0.0
         except Exception as e:
             import traceback
@@ -2022,6 +2566,7 @@ class TradeExecutionService:
             all_positions = []
             offset = 0
             limit = 100  # API单次查询限制
+            addr_short = trader_address[:8]  # 日志用短地址
 
             while True:
                 params = {
@@ -2030,50 +2575,39 @@ class TradeExecutionService:
                     'offset': offset
                 }
 
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(api_url, params=params) as response:
-                        if response.status == 200:
-                            positions = await response.json()
-                            if not positions:
-                                break  # 没有更多数据了
-
-                            all_positions.extend(positions)
+                session = self._ensure_session()
+                async with session.get(api_url, params=params) as response:
+                    if response.status == 200:
+                        positions = await _read_json(response)
+                        if not positions:
+                            break  # 没有更多数据了
 
-                            # 如果返回的持仓数量少于limit，说明已经获取完所有数据
-                            if len(positions) < limit:
-                                break
+                        all_positions.extend(positions)
 
-                            offset += limit
-                        else:
-                            logger.warning(f"[POSITION] 获取交易员 {trader_address[:8]}... 持仓失败: HTTP {response.status}")
+                        # 如果返回的持仓数量少于limit，说明已经获取完所有数据
+                        if len(positions) < limit:
                             break
 
-            positions_data = all_positions
-
-            # 更新交易员持仓缓存
-            trader_positions_file = os.path.join("data", "trader_positions_cache.json")
-
-            # 确保 data 目录存在
-            os.makedirs(os.path.dirname(trader_positions_file), exist_ok=True)
+                        offset += limit
+                    else:
+                        logger.warning("[POSITION] 获取交易员 %s... 持仓失败: HTTP %s", addr_short, response.status)
+                        break
 
-            # 读取现有缓存
-            if os.path.exists(trader_positions_file):
-                with open(trader_positions_file, 'r', encoding='utf-8') as f:
-                    trader_positions_cache = json.load(f)
-            else:
-                trader_positions_cache = {}
+            positions_data = all_positions
 
-            # 更新缓存
+            # 更新交易员持仓缓存（内存副本，延迟合并落盘到 data/trader_positions_cache.json）
+            # 文件格式与 memory_monitor 一致（地址 -> 持仓列表）；按 token 查找走 _get_trader_position_index
+            trader_positions_cache = self._get_file_cache("trader_positions_cache.json")
+            if trader_positions_cache.get(trader_address) == positions_data:
+                logger.debug("[POSITION] 交易员 %s... 持仓无变化，跳过写入", addr_short)
+                return
             trader_positions_cache[trader_address] = positions_data
+            self._mark_cache_dirty("trader_positions_cache.json")
 
-            # 保存缓存
-            with open(trader_positions_file, 'w', encoding='utf-8') as f:
-                json.dump(trader_positions_cache, f, indent=2, ensure_ascii=False)
-
-            logger.info(f"[POSITION] 交易员 {trader_address[:8]}... 持仓缓存已更新: {len(positions_data)}个持仓")
+            logger.info("[POSITION] 交易员 %s... 持仓缓存已更新: %s个持仓", addr_short, len(positions_data))
 
         except Exception as e:
-            logger.warning(f"[POSITION] 获取交易员持仓失败: {e}")
+            logger.warning("[POSITION] 获取交易员持仓失败: %s", e)
 
     async def _fetch_and_cache_positions(self):
         """获取并缓存我们自己的持仓"""
@@ -2096,48 +2630,40 @@ class TradeExecutionService:
                     'offset': offset
                 }
 
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(api_url, params=params) as response:
-                        if response.status == 200:
-                            positions = await response.json()
-                            if not positions:
-                                break  # 没有更多数据了
-
-                            all_positions.extend(positions)
+                session = self._ensure_session()
+                async with session.get(api_url, params=params) as response:
+                    if response.status == 200:
+                        positions = await _read_json(response)
+                        if not positions:
+                            break  # 没有更多数据了
 
-                            # 如果返回的持仓数量少于limit，说明已经获取完所有数据
-                            if len(positions) < limit:
-                                break
+                        all_positions.extend(positions)
 
-                            offset += limit
-                        else:
-                            logger.warning(f"[POSITION] 获取我们持仓失败: HTTP {response.status}")
+                        # 如果返回的持仓数量少于limit，说明已经获取完所有数据
+                        if len(positions) < limit:
                             break
 
-            positions_data = all_positions
-
-            # 更新持仓缓存
-            position_cache_file = os.path.join("data", "position_cache.json")
+                        offset += limit
+                    else:
+                        logger.warning("[POSITION] 获取我们持仓失败: HTTP %s", response.status)
+                        break
 
-            # 确保 data 目录存在
-            os.makedirs(os.path.dirname(position_cache_file), exist_ok=True)
+            positions_data = all_positions
 
-            # 构建持仓缓存数据
-            position_cache = {
+            # 更新持仓缓存（整体替换内存副本，延迟落盘到 data/position_cache.json）
+            position_record = {
                 "wallet_address": our_address,
                 "positions": positions_data,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": None,  # 落盘时填写
                 "total_positions": len(positions_data)
             }
+            self._cache_mem["position_cache.json"] = position_record
+            self._mark_cache_dirty("position_cache.json", position_record)
 
-            # 保存缓存
-            with open(position_cache_file, 'w', encoding='utf-8') as f:
-                json.dump(position_cache, f, indent=2, ensure_ascii=False)
-
-            logger.info(f"[POSITION] 我们持仓缓存已更新: {len(positions_data)}个持仓")
+            logger.info("[POSITION] 我们持仓缓存已更新: %s个持仓", len(positions_data))
 
         except Exception as e:
-            logger.warning(f"[POSITION] 获取我们持仓失败: {e}")
+            logger.warning("[POSITION] 获取我们持仓失败: %s", e)
 
     async def _update_trader_balance(self, trader_address: str):
         """更新交易员余额缓存 - 通过RPC获取"""
@@ -2146,33 +2672,19 @@ class TradeExecutionService:
             USDC_CONTRACT = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"  # Polygon USDC
             balance_data = await self._get_balance_via_rpc(trader_address, USDC_CONTRACT)
 
-            # 更新余额缓存
-            balance_cache_file = os.path.join("data", "balance_cache.json")
-
-            # 确保 data 目录存在
-            os.makedirs(os.path.dirname(balance_cache_file), exist_ok=True)
-
-            # 读取现有缓存
-            if os.path.exists(balance_cache_file):
-                with open(balance_cache_file, 'r', encoding='utf-8') as f:
-                    balance_cache = json.load(f)
-            else:
-                balance_cache = {}
-
-            # 更新缓存
-            balance_cache[trader_address] = {
+            # 更新余额缓存（内存副本，延迟合并落盘到 data/balance_cache.json）
+            balance_cache = self._get_file_cache("balance_cache.json")
+            balance_record = {
                 "balance": float(balance_data),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": None  # 落盘时填写
             }
+            balance_cache[trader_address] = balance_record
+            self._mark_cache_dirty("balance_cache.json", balance_record)
 
-            # 保存缓存
-            with open(balance_cache_file, 'w', encoding='utf-8') as f:
-                json.dump(balance_cache, f, indent=2, ensure_ascii=False)
-
-            logger.info(f"[BALANCE] 交易员 {trader_address[:8]}... 余额已更新: {float(balance_data):.2f} USDC")
+            logger.info("[BALANCE] 交易员 %s... 余额已更新: %.2f USDC", trader_address[:8], float(balance_data))
 
         except Exception as e:
-            logger.warning(f"[BALANCE] 更新交易员余额失败: {e}")
+            logger.warning("[BALANCE] 更新交易员余额失败: %s", e)
 
     async def _fetch_and_cache_balance(self):
         """获取并缓存我们自己的余额 - 通过RPC获取"""
@@ -2186,30 +2698,16 @@ class TradeExecutionService:
             USDC_CONTRACT = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"  # Polygon USDC
             balance_data = await self._get_balance_via_rpc(our_address, USDC_CONTRACT)
 
-            # 更新余额缓存
-            balance_cache_file = os.path.join("data", "balance_cache.json")
-
-            # 确保 data 目录存在
-            os.makedirs(os.path.dirname(balance_cache_file), exist_ok=True)
-
-            # 读取现有缓存
-            if os.path.exists(balance_cache_file):
-                with open(balance_cache_file, 'r', encoding='utf-8') as f:
-                    balance_cache = json.load(f)
-            else:
-                balance_cache = {}
-
-            # 更新缓存
-            balance_cache[our_address] = {
+            # 更新余额缓存（内存副本，延迟合并落盘到 data/balance_cache.json）
+            balance_cache = self._get_file_cache("balance_cache.json")
+            balance_record = {
                 "balance": float(balance_data),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": None  # 落盘时填写
             }
+            balance_cache[our_address] = balance_record
+            self._mark_cache_dirty("balance_cache.json", balance_record)
 
-            # 保存缓存
-            with open(balance_cache_file, 'w', encoding='utf-8') as f:
-                json.dump(balance_cache, f, indent=2, ensure_ascii=False)
-
-            logger.info(f"[BALANCE] 我们余额已更新: {float(balance_data):.2f} USDC")
+            logger.info("[BALANCE] 我们余额已更新: %.2f USDC", float(balance_data))
 
         except Exception as e:
-            logger.warning(f"[BALANCE] 更新我们余额失败: {e}")
+            logger.warning("[BALANCE] 更新我们余额失败: %s", e)
@@ -7,22 +7,30 @@ Polymarket套利引擎 - 核心套利逻辑
 3. 价差套利: 监控价格波动，在价差足够大时执行套利
 """
 import asyncio
+import json
+import math
+from collections import deque
 import time
 import logging
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
-from decimal import Decimal
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import aiohttp
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# 并发拉取订单簿的上限，避免一次扫描同时向CLOB发出过多请求
+ORDERBOOK_FETCH_CONCURRENCY = 50
+
+MARKET_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+
+@dataclass(slots=True, frozen=True)
 class MarketPair:
     yes_token_id: str
     no_token_id: str
     market_slug: str
     condition_id: str
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PriceQuote:
     token_id: str
     bid_price: float
@@ -31,7 +39,7 @@ class PriceQuote:
     ask_size: float
     timestamp: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ArbitrageOpportunity:
     opportunity_type: str
     market_slug: str
@@ -45,14 +53,17 @@ class ArbitrageOpportunity:
     timestamp: float
 
 class ArbitrageEngine:
-    def __init__(self, config, clob_client, trade_executor):
+    def __init__(self, config, clob_client, trade_executor, session: Optional[aiohttp.ClientSession] = None):
         self.config = config
         self.clob_client = clob_client
         self.trade_executor = trade_executor
+        # 共享会话由调用方负责关闭；未传入时每次连接推送自建会话
+        self.session = session
         
         self.market_pairs: Dict[str, MarketPair] = {}
         self.price_cache: Dict[str, PriceQuote] = {}
-        self.opportunity_history: List[ArbitrageOpportunity] = []
+        # 只保留最近的机会记录，长时间运行内存不随机会数增长
+        self.opportunity_history: deque = deque(maxlen=getattr(config.arbitrage, 'history_size', 10000) or 10000)
         
         self.stats = {
             'opportunities_found': 0,
@@ -62,15 +73,49 @@ class ArbitrageEngine:
             'failed_trades': 0,
         }
         
+        self._book_semaphore = asyncio.Semaphore(ORDERBOOK_FETCH_CONCURRENCY)
+        self._hedge_tasks = set()
+        
+        # 订单簿/中间价短时缓存: token_id -> (写入时间, 数据)，TTL内的重复扫描直接复用
+        self._book_ttl = getattr(config.arbitrage, 'book_cache_ttl_ms', 200.0) / 1000
+        self._book_cache: Dict[str, Tuple[float, PriceQuote]] = {}
+        self._midpoint_cache: Dict[str, Tuple[float, Optional[float]]] = {}
+        
+        # WebSocket订单簿推送: token_id -> (买单 {价格: 数量}, 卖单 {价格: 数量})
+        self._token_markets: Dict[str, str] = {}
+        self._ws_books: Dict[str, Tuple[Dict[float, float], Dict[float, float]]] = {}
+        self._executing_markets = set()
+        self._opportunity_tasks = set()
+        # 同一市场两次派发之间至少间隔 price_check_interval 秒（monotonic），
+        # 避免订单簿持续交叉时每条推送都重复计数/重复下单
+        self._dispatch_cooldown = getattr(config.arbitrage, 'price_check_interval', 2.0)
+        self._last_dispatch: Dict[str, float] = {}
+        self.ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._reconnect_delay = 1
+        self._max_reconnect_delay = 30
+        
+        self._refresh_thresholds()
+        
         self._running = False
         logger.info("[ARBITRAGE] 套利引擎初始化完成")
 
+    def _refresh_thresholds(self):
+        """由配置派生扫描用阈值；配置变更后需重新调用"""
+        min_profit_threshold = self.config.arbitrage.min_profit_threshold
+        self._min_profit_pct = min_profit_threshold * 100
+        # 利润率 >= 阈值 等价于 价格和 <= 1/(1+阈值)
+        self._max_price_sum = 1.0 / (1.0 + min_profit_threshold) + 1e-12
+
     async def start(self):
+        self._refresh_thresholds()
         self._running = True
         logger.info("[ARBITRAGE] 套利引擎启动")
 
     async def stop(self):
         self._running = False
+        
+        if self.ws:
+            await self.ws.close()
         logger.info("[ARBITRAGE] 套利引擎停止")
 
     def register_market_pair(self, yes_token_id: str, no_token_id: str, 
@@ -81,55 +126,151 @@ class ArbitrageEngine:
             market_slug=market_slug,
             condition_id=condition_id,
         )
+        self._token_markets[yes_token_id] = market_slug
+        self._token_markets[no_token_id] = market_slug
         logger.info(f"[ARBITRAGE] 注册市场对: {market_slug}")
 
+    def _cached_book(self, token_id: str, now: float) -> Optional[PriceQuote]:
+        entry = self._book_cache.get(token_id)
+        if entry and now - entry[0] < self._book_ttl:
+            return entry[1]
+        return None
+
+    def invalidate_books(self, *token_ids: str):
+        """成交后丢弃相关token的缓存报价"""
+        for token_id in token_ids:
+            self._book_cache.pop(token_id, None)
+            self._midpoint_cache.pop(token_id, None)
+
     async def get_orderbook_prices(self, token_id: str) -> Optional[PriceQuote]:
+        cached = self._cached_book(token_id, time.monotonic())
+        if cached:
+            return cached
+        
         try:
-            orderbook = self.clob_client.get_order_book(token_id)
-            
-            if not orderbook or not orderbook.get('bids') or not orderbook.get('asks'):
-                return None
+            # clob_client 是同步HTTP客户端，放到线程中执行，多个token的请求才能真正并发
+            async with self._book_semaphore:
+                orderbook = await asyncio.to_thread(self.clob_client.get_order_book, token_id)
             
-            best_bid = orderbook['bids'][0] if orderbook['bids'] else None
-            best_ask = orderbook['asks'][0] if orderbook['asks'] else None
-            
-            if not best_bid or not best_ask:
-                return None
+            quote = self._quote_from_book(token_id, orderbook)
+            if quote:
+                self._book_cache[token_id] = (time.monotonic(), quote)
+            return quote
+        except Exception as e:
+            logger.warning("[ARBITRAGE] 获取订单簿失败 %s...: %s", token_id[:16], e)
+            return None
+
+    async def get_orderbook_prices_batch(self, token_ids: List[str]) -> Dict[str, PriceQuote]:
+        """一次请求批量获取多个token的订单簿报价；批量接口失败时退回逐个并发获取"""
+        now = time.monotonic()
+        quotes = {}
+        missing = []
+        for token_id in token_ids:
+            cached = self._cached_book(token_id, now)
+            if cached:
+                quotes[token_id] = cached
+            else:
+                missing.append(token_id)
+        token_ids = missing
+        if not token_ids:
+            return quotes
+        
+        try:
+            from py_clob_client.clob_types import BookParams
             
-            return PriceQuote(
-                token_id=token_id,
-                bid_price=float(best_bid['price']),
-                ask_price=float(best_ask['price']),
-                bid_size=float(best_bid['size']),
-                ask_size=float(best_ask['size']),
-                timestamp=time.time(),
-            )
+            params = [BookParams(token_id=token_id) for token_id in token_ids]
+            async with self._book_semaphore:
+                books = await asyncio.to_thread(self.clob_client.get_order_books, params)
         except Exception as e:
-            logger.warning(f"[ARBITRAGE] 获取订单簿失败 {token_id[:16]}...: {e}")
+            logger.warning(f"[ARBITRAGE] 批量获取订单簿失败，改为逐个获取: {e}")
+            results = await asyncio.gather(
+                *(self.get_orderbook_prices(token_id) for token_id in token_ids),
+                return_exceptions=True,
+            )
+            quotes.update(
+                (token_id, quote)
+                for token_id, quote in zip(token_ids, results)
+                if isinstance(quote, PriceQuote)
+            )
+            return quotes
+        
+        fetched_at = time.monotonic()
+        for token_id, book in zip(token_ids, books):
+            # 以返回的 asset_id 为准，不依赖返回顺序
+            asset_id = self._book_field(book, 'asset_id') or token_id
+            try:
+                quote = self._quote_from_book(asset_id, book)
+            except Exception as e:
+                logger.warning("[ARBITRAGE] 解析订单簿失败 %s...: %s", asset_id[:16], e)
+                continue
+            if quote:
+                quotes[asset_id] = quote
+                self._book_cache[asset_id] = (fetched_at, quote)
+        
+        self.price_cache.update(quotes)
+        return quotes
+
+    @staticmethod
+    def _book_field(obj, name):
+        # 兼容 dict 形式与 py-clob-client 的 OrderBookSummary/OrderSummary 对象
+        if isinstance(obj, dict):
+            return obj.get(name)
+        return getattr(obj, name, None)
+
+    @staticmethod
+    def _quote_from_book(token_id: str, orderbook) -> Optional[PriceQuote]:
+        # 每本订单簿只判断一次 dict/对象 形式，价格与数量在这里一次性转成 float
+        if isinstance(orderbook, dict):
+            bids = orderbook.get('bids')
+            asks = orderbook.get('asks')
+        else:
+            bids = getattr(orderbook, 'bids', None)
+            asks = getattr(orderbook, 'asks', None)
+        if not bids or not asks:
             return None
+        
+        b = bids[0]
+        a = asks[0]
+        if isinstance(b, dict):
+            return PriceQuote(token_id, float(b['price']), float(a['price']),
+                              float(b['size']), float(a['size']), time.time())
+        return PriceQuote(token_id, float(b.price), float(a.price),
+                          float(b.size), float(a.size), time.time())
 
     async def get_midpoint_prices(self, yes_token_id: str, no_token_id: str) -> Tuple[Optional[float], Optional[float]]:
         try:
-            yes_mid = self.clob_client.get_midpoint(yes_token_id)
-            no_mid = self.clob_client.get_midpoint(no_token_id)
-            
-            yes_price = float(yes_mid) if yes_mid else None
-            no_price = float(no_mid) if no_mid else None
-            
-            return yes_price, no_price
+            return self._get_midpoint(yes_token_id), self._get_midpoint(no_token_id)
         except Exception as e:
             logger.warning(f"[ARBITRAGE] 获取中间价失败: {e}")
             return None, None
 
+    def _get_midpoint(self, token_id: str) -> Optional[float]:
+        now = time.monotonic()
+        entry = self._midpoint_cache.get(token_id)
+        if entry and now - entry[0] < self._book_ttl:
+            return entry[1]
+        
+        mid = self.clob_client.get_midpoint(token_id)
+        price = float(mid) if mid else None
+        self._midpoint_cache[token_id] = (now, price)
+        return price
+
     async def scan_yes_no_arbitrage(self, market_slug: str) -> Optional[ArbitrageOpportunity]:
         if market_slug not in self.market_pairs:
             return None
         
         pair = self.market_pairs[market_slug]
         
-        yes_quote = await self.get_orderbook_prices(pair.yes_token_id)
-        no_quote = await self.get_orderbook_prices(pair.no_token_id)
+        yes_quote, no_quote = await asyncio.gather(
+            self.get_orderbook_prices(pair.yes_token_id),
+            self.get_orderbook_prices(pair.no_token_id),
+        )
         
+        return self._evaluate_pair(pair, yes_quote, no_quote)
+
+    def _evaluate_pair(self, pair: MarketPair, yes_quote: Optional[PriceQuote],
+                       no_quote: Optional[PriceQuote]) -> Optional[ArbitrageOpportunity]:
+        """根据已获取的YES/NO报价判断套利机会（不做任何网络请求）"""
         if not yes_quote or not no_quote:
             return None
         
@@ -144,19 +285,18 @@ class ArbitrageEngine:
             return None
         
         profit_percent = (1.0 - price_sum) / price_sum * 100
-        min_profit = self.config.arbitrage.min_profit_threshold * 100
         
-        if profit_percent < min_profit:
+        if profit_percent < self._min_profit_pct:
             return None
         
+        arb_config = self.config.arbitrage
         min_size = min(yes_quote.ask_size, no_quote.ask_size)
-        max_trade = self.config.arbitrage.max_trade_size
-        recommended_size = min(min_size * yes_ask, max_trade)
-        recommended_size = max(recommended_size, self.config.arbitrage.min_trade_size)
+        recommended_size = min(min_size * yes_ask, arb_config.max_trade_size)
+        recommended_size = max(recommended_size, arb_config.min_trade_size)
         
         opportunity = ArbitrageOpportunity(
             opportunity_type="YES_NO_ARBITRAGE",
-            market_slug=market_slug,
+            market_slug=pair.market_slug,
             yes_token_id=pair.yes_token_id,
             no_token_id=pair.no_token_id,
             yes_price=yes_ask,
@@ -197,15 +337,20 @@ class ArbitrageEngine:
             return None
 
     async def execute_yes_no_arbitrage(self, opportunity: ArbitrageOpportunity) -> bool:
-        logger.info(f"\n{'='*60}")
-        logger.info(f"[ARBITRAGE] 发现YES/NO套利机会!")
-        logger.info(f"[ARBITRAGE] 市场: {opportunity.market_slug}")
-        logger.info(f"[ARBITRAGE] YES价格: {opportunity.yes_price:.4f}")
-        logger.info(f"[ARBITRAGE] NO价格: {opportunity.no_price:.4f}")
-        logger.info(f"[ARBITRAGE] 价格总和: {opportunity.price_sum:.4f}")
-        logger.info(f"[ARBITRAGE] 利润率: {opportunity.profit_percent:.2f}%")
-        logger.info(f"[ARBITRAGE] 建议金额: ${opportunity.recommended_size:.2f}")
-        logger.info(f"{'='*60}\n")
+        # 执行路径上的日志使用惰性格式化，并把横幅合并为一条记录
+        logger.info(
+            "\n%s\n"
+            "[ARBITRAGE] 发现YES/NO套利机会!\n"
+            "[ARBITRAGE] 市场: %s\n"
+            "[ARBITRAGE] YES价格: %.4f\n"
+            "[ARBITRAGE] NO价格: %.4f\n"
+            "[ARBITRAGE] 价格总和: %.4f\n"
+            "[ARBITRAGE] 利润率: %.2f%%\n"
+            "[ARBITRAGE] 建议金额: $%.2f\n"
+            "%s\n",
+            '=' * 60, opportunity.market_slug, opportunity.yes_price, opportunity.no_price,
+            opportunity.price_sum, opportunity.profit_percent, opportunity.recommended_size, '=' * 60,
+        )
         
         try:
             trade_size = opportunity.recommended_size
@@ -213,30 +358,32 @@ class ArbitrageEngine:
             yes_shares = trade_size / opportunity.yes_price
             no_shares = trade_size / opportunity.no_price
             
-            logger.info(f"[ARBITRAGE] 执行买入YES: {yes_shares:.2f}股 @ {opportunity.yes_price:.4f}")
-            yes_result = await self.trade_executor.place_market_order(
-                token_id=opportunity.yes_token_id,
-                side="BUY",
-                amount=trade_size,
-                price=opportunity.yes_price * (1 + self.config.arbitrage.max_slippage),
-            )
-            
-            if not yes_result:
-                logger.error("[ARBITRAGE] 买入YES失败，放弃套利")
-                self.stats['failed_trades'] += 1
-                return False
+            # 两条腿并发签名后一起提交，缩短只成交一边的敞口窗口
+            max_slippage = self.config.arbitrage.max_slippage
+            yes_result, no_result = await self.trade_executor.place_market_order_pair([
+                (opportunity.yes_token_id, "BUY", trade_size, opportunity.yes_price * (1 + max_slippage)),
+                (opportunity.no_token_id, "BUY", trade_size, opportunity.no_price * (1 + max_slippage)),
+            ])
+            yes_ok = self._leg_succeeded(yes_result)
+            no_ok = self._leg_succeeded(no_result)
+            self.invalidate_books(opportunity.yes_token_id, opportunity.no_token_id)
             
-            logger.info(f"[ARBITRAGE] 执行买入NO: {no_shares:.2f}股 @ {opportunity.no_price:.4f}")
-            no_result = await self.trade_executor.place_market_order(
-                token_id=opportunity.no_token_id,
-                side="BUY",
-                amount=trade_size,
-                price=opportunity.no_price * (1 + self.config.arbitrage.max_slippage),
+            logger.info(
+                "[ARBITRAGE] 买入YES: %.2f股 @ %.4f -> %s\n[ARBITRAGE] 买入NO: %.2f股 @ %.4f -> %s",
+                yes_shares, opportunity.yes_price, '成功' if yes_ok else '失败 (%s)' % (yes_result,),
+                no_shares, opportunity.no_price, '成功' if no_ok else '失败 (%s)' % (no_result,),
             )
             
-            if not no_result:
-                logger.error("[ARBITRAGE] 买入NO失败! 已买入YES，需要手动对冲")
+            if not yes_ok or not no_ok:
                 self.stats['failed_trades'] += 1
+                if yes_ok:
+                    logger.error("[ARBITRAGE] 买入NO失败! 已买入YES，立即卖出YES对冲")
+                    self._schedule_hedge(opportunity.yes_token_id, yes_result, opportunity.yes_price)
+                elif no_ok:
+                    logger.error("[ARBITRAGE] 买入YES失败! 已买入NO，立即卖出NO对冲")
+                    self._schedule_hedge(opportunity.no_token_id, no_result, opportunity.no_price)
+                else:
+                    logger.error("[ARBITRAGE] YES/NO均未成交，放弃套利")
                 return False
             
             profit = trade_size * (1 - opportunity.price_sum)
@@ -244,45 +391,235 @@ class ArbitrageEngine:
             self.stats['total_profit'] += profit
             self.stats['total_volume'] += trade_size * 2
             
-            logger.info(f"[ARBITRAGE] 套利执行成功! 预计利润: ${profit:.2f}")
-            logger.info(f"[ARBITRAGE] 累计利润: ${self.stats['total_profit']:.2f}")
+            logger.info("[ARBITRAGE] 套利执行成功! 预计利润: $%.2f, 累计利润: $%.2f",
+                        profit, self.stats['total_profit'])
             
             return True
             
         except Exception as e:
-            logger.error(f"[ARBITRAGE] 套利执行失败: {e}")
+            logger.error("[ARBITRAGE] 套利执行失败: %s", e)
             self.stats['failed_trades'] += 1
             return False
 
+    @staticmethod
+    def _leg_succeeded(result) -> bool:
+        if result is None or isinstance(result, BaseException):
+            return False
+        return getattr(result, 'success', True)
+
+    def _schedule_hedge(self, token_id: str, buy_result, entry_price: float):
+        """单边成交时在后台卖出已成交的一边"""
+        task = asyncio.create_task(self._hedge_leg(token_id, buy_result, entry_price))
+        self._hedge_tasks.add(task)
+        task.add_done_callback(self._hedge_tasks.discard)
+
+    async def _filled_shares(self, buy_result) -> float:
+        """
+        买入腿实际成交的份额，向下取整到0.01。
+        不按报价反推：FOK市价BUY按 价格*(1+滑点) 限价，只保证 金额/限价 份
+        """
+        shares = getattr(buy_result, 'filled_shares', 0.0)
+        if shares <= 0 and getattr(buy_result, 'order_id', ''):
+            status = await self.trade_executor.get_order_status(buy_result.order_id)
+            if status:
+                try:
+                    shares = float(status.get('sizeMatched') or status.get('size_matched') or 0)
+                except (TypeError, ValueError):
+                    shares = 0.0
+        return math.floor(shares * 100 + 1e-9) / 100
+
+    async def _hedge_leg(self, token_id: str, buy_result, entry_price: float):
+        shares = 0.0
+        try:
+            shares = await self._filled_shares(buy_result)
+            if shares <= 0:
+                logger.error("[ARBITRAGE] 无法确定成交份额，需要手动处理: %s... 订单 %s",
+                             token_id[:16], getattr(buy_result, 'order_id', ''))
+                return
+            result = await self.trade_executor.place_market_order(
+                token_id=token_id,
+                side="SELL",
+                amount=shares,
+                price=entry_price * (1 - self.config.arbitrage.max_slippage),
+            )
+            if self._leg_succeeded(result):
+                logger.info("[ARBITRAGE] 对冲卖出成功: %s... %.2f股", token_id[:16], shares)
+            else:
+                logger.error("[ARBITRAGE] 对冲卖出失败，需要手动处理: %s... %.2f股", token_id[:16], shares)
+        except Exception as e:
+            logger.error("[ARBITRAGE] 对冲卖出异常，需要手动处理: %s... %s", token_id[:16], e)
+
     async def scan_all_markets(self) -> List[ArbitrageOpportunity]:
         opportunities = []
         
-        for market_slug in self.market_pairs:
+        # 所有市场的YES/NO订单簿合并为一次批量请求，扫描耗时约为一次往返而不是 2N 次
+        token_ids = list({
+            token_id
+            for pair in self.market_pairs.values()
+            for token_id in (pair.yes_token_id, pair.no_token_id)
+        })
+        quotes = await self.get_orderbook_prices_batch(token_ids)
+        
+        # 先只用卖一价之和筛出候选市场，只有候选才进入 _evaluate_pair 生成机会对象；报价已由批量获取写入 price_cache
+        max_price_sum = self._max_price_sum
+        for market_slug, pair in self.market_pairs.items():
+            yes_quote = quotes.get(pair.yes_token_id)
+            no_quote = quotes.get(pair.no_token_id)
+            if not yes_quote or not no_quote or yes_quote.ask_price + no_quote.ask_price > max_price_sum:
+                continue
             try:
-                opp = await self.scan_yes_no_arbitrage(market_slug)
+                opp = self._evaluate_pair(pair, yes_quote, no_quote)
                 if opp:
                     opportunities.append(opp)
             except Exception as e:
-                logger.warning(f"[ARBITRAGE] 扫描市场 {market_slug} 失败: {e}")
+                logger.warning("[ARBITRAGE] 扫描市场 %s 失败: %s", market_slug, e)
         
         return opportunities
 
-    async def run_continuous_scan(self, interval: float = 2.0):
-        logger.info(f"[ARBITRAGE] 开始持续扫描，间隔 {interval}秒")
+    async def run_orderbook_stream(self, on_opportunity: Callable[[ArbitrageOpportunity], Awaitable]):
+        """
+        订阅CLOB market频道，订单簿推送到达时立即评估对应市场的套利机会。
+        REST只用于启动时拉取一次快照；发现机会后交给 on_opportunity 处理，同一市场同时只处理一个。
+        """
+        for opp in await self.scan_all_markets():
+            self._dispatch_opportunity(opp, on_opportunity)
         
         while self._running:
             try:
-                opportunities = await self.scan_all_markets()
-                
-                for opp in opportunities:
-                    if opp.profit_percent >= self.config.arbitrage.min_profit_threshold * 100:
-                        await self.execute_yes_no_arbitrage(opp)
-                
-                await asyncio.sleep(interval)
-                
+                await self._stream_orderbooks(on_opportunity)
             except Exception as e:
-                logger.error(f"[ARBITRAGE] 扫描循环错误: {e}")
-                await asyncio.sleep(5)
+                logger.error(f"[ARBITRAGE] 订单簿推送连接错误: {e}")
+            
+            if self._running:
+                logger.info(f"[ARBITRAGE] {self._reconnect_delay}秒后重连订单簿推送...")
+                await asyncio.sleep(self._reconnect_delay)
+                self._reconnect_delay = min(self._reconnect_delay * 2, self._max_reconnect_delay)
+
+    async def _stream_orderbooks(self, on_opportunity):
+        if self.session is not None:
+            await self._consume_orderbooks(self.session, on_opportunity)
+            return
+        async with aiohttp.ClientSession() as session:
+            await self._consume_orderbooks(session, on_opportunity)
+
+    async def _consume_orderbooks(self, session: aiohttp.ClientSession, on_opportunity):
+        async with session.ws_connect(MARKET_WS_URL, heartbeat=10) as ws:
+            self.ws = ws
+            self._reconnect_delay = 1
+            # 重连后服务端会重新推送完整订单簿，旧的增量状态作废
+            self._ws_books.clear()
+            
+            await ws.send_json({"type": "market", "assets_ids": list(self._token_markets)})
+            logger.info(f"[ARBITRAGE] 订单簿推送已连接，订阅 {len(self._token_markets)} 个token")
+            
+            async for msg in ws:
+                if not self._running:
+                    break
+                
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    self._handle_book_message(msg.data, on_opportunity)
+                elif msg.type == aiohttp.WSMsgType.ERROR:
+                    logger.error(f"[ARBITRAGE] 订单簿推送错误: {ws.exception()}")
+                    break
+                elif msg.type == aiohttp.WSMsgType.CLOSED:
+                    logger.warning("[ARBITRAGE] 订单簿推送连接已关闭")
+                    break
+
+    def _handle_book_message(self, data: str, on_opportunity):
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            return
+        
+        events = payload if isinstance(payload, list) else [payload]
+        touched = set()
+        ws_books = self._ws_books
+        
+        for event in events:
+            if not isinstance(event, dict):
+                continue
+            event_type = event.get('event_type')
+            
+            if event_type == 'book':
+                asset_id = event.get('asset_id')
+                ws_books[asset_id] = (
+                    {float(level['price']): float(level['size']) for level in event.get('bids', ())},
+                    {float(level['price']): float(level['size']) for level in event.get('asks', ())},
+                )
+                touched.add(asset_id)
+            elif event_type == 'price_change':
+                for change in event.get('price_changes') or event.get('changes') or ():
+                    asset_id = change.get('asset_id') or event.get('asset_id')
+                    book = ws_books.get(asset_id)
+                    if book is None:
+                        continue  # 还没收到该token的完整订单簿
+                    levels = book[0] if change.get('side') == 'BUY' else book[1]
+                    price = float(change['price'])
+                    size = float(change['size'])
+                    if size > 0:
+                        levels[price] = size
+                    else:
+                        levels.pop(price, None)
+                    touched.add(asset_id)
+        
+        if not touched:
+            return
+        
+        price_cache = self.price_cache
+        book_cache = self._book_cache
+        now = time.time()
+        fetched_at = time.monotonic()
+        for asset_id in touched:
+            bids, asks = ws_books[asset_id]
+            if not bids or not asks:
+                price_cache.pop(asset_id, None)
+                book_cache.pop(asset_id, None)
+                continue
+            best_bid = max(bids)
+            best_ask = min(asks)
+            quote = PriceQuote(
+                token_id=asset_id,
+                bid_price=best_bid,
+                ask_price=best_ask,
+                bid_size=bids[best_bid],
+                ask_size=asks[best_ask],
+                timestamp=now,
+            )
+            price_cache[asset_id] = quote
+            book_cache[asset_id] = (fetched_at, quote)
+        
+        token_markets = self._token_markets
+        executing = self._executing_markets
+        last_dispatch = self._last_dispatch
+        cooldown = self._dispatch_cooldown
+        for market_slug in {token_markets[t] for t in touched if t in token_markets}:
+            if market_slug in executing or fetched_at - last_dispatch.get(market_slug, -math.inf) < cooldown:
+                continue
+            pair = self.market_pairs[market_slug]
+            opp = self._evaluate_pair(
+                pair,
+                price_cache.get(pair.yes_token_id),
+                price_cache.get(pair.no_token_id),
+            )
+            if opp:
+                self._dispatch_opportunity(opp, on_opportunity)
+
+    def _dispatch_opportunity(self, opportunity: ArbitrageOpportunity, on_opportunity):
+        if opportunity.market_slug in self._executing_markets:
+            return
+        self._executing_markets.add(opportunity.market_slug)
+        self._last_dispatch[opportunity.market_slug] = time.monotonic()
+        task = asyncio.create_task(self._run_opportunity(opportunity, on_opportunity))
+        self._opportunity_tasks.add(task)
+        task.add_done_callback(self._opportunity_tasks.discard)
+
+    async def _run_opportunity(self, opportunity: ArbitrageOpportunity, on_opportunity):
+        try:
+            await on_opportunity(opportunity)
+        except Exception as e:
+            logger.error("[ARBITRAGE] 处理套利机会失败 %s: %s", opportunity.market_slug, e)
+        finally:
+            self._executing_markets.discard(opportunity.market_slug)
 
     def get_statistics(self) -> Dict:
         return {
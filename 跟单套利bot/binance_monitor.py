@@ -1,28 +1,54 @@
 """
 Binance WebSocket价格监控
-实时获取BTC/USDT价格
+实时获取BTC/USDT价格（aggTrade归集成交流）
 """
 import asyncio
 import logging
-import json
 import time
-from typing import Callable, Optional
+from typing import Callable, Optional, Tuple
 import aiohttp
 
+from utils import _json_loads
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if msgspec is not None:
+    # 只声明用到的字段，其余字段解码时直接跳过，不构造中间dict
+    class _AggTrade(msgspec.Struct):
+        p: str = "0"
+        q: str = "0"
+        T: Optional[int] = None
+
+    _decode_trade = msgspec.json.Decoder(_AggTrade).decode
+
 logger = logging.getLogger(__name__)
 
+# 成交价回调的合并间隔（秒）：间隔内只转发最新价格，成交量累加
+PRICE_COALESCE_INTERVAL = 0.01
+
 class BinancePriceMonitor:
-    def __init__(self, on_price_update: Callable[[float, float], None]):
+    def __init__(self, on_price_update: Callable[[float, float], None],
+                 session: Optional[aiohttp.ClientSession] = None):
         self.on_price_update = on_price_update
+        self._callback_is_coro = asyncio.iscoroutinefunction(on_price_update)
         
-        self.ws_url = "wss://stream.binance.com:9443/ws/btcusdt@trade"
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.ws_url = "wss://stream.binance.com:9443/ws/btcusdt@aggTrade"
+        # 传入的共享会话由调用方负责关闭
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
         self.ws: Optional[aiohttp.ClientWebSocketResponse] = None
         
         self._running = False
         self._reconnect_delay = 1
         self._max_reconnect_delay = 30
         
+        # 待转发的最新成交 (price, 累计volume)，由 _forward_prices 按 PRICE_COALESCE_INTERVAL 转发
+        self._pending_trade: Optional[Tuple[float, float]] = None
+        self._pending_event = asyncio.Event()
+        
         self.stats = {
             'messages_received': 0,
             'reconnects': 0,
@@ -36,17 +62,28 @@ class BinancePriceMonitor:
         self._running = True
         logger.info("[BINANCE] 启动WebSocket连接...")
         
-        while self._running:
-            try:
-                await self._connect()
-            except Exception as e:
-                logger.error(f"[BINANCE] 连接错误: {e}")
-                self.stats['reconnects'] += 1
-                
-                if self._running:
-                    logger.info(f"[BINANCE] {self._reconnect_delay}秒后重连...")
-                    await asyncio.sleep(self._reconnect_delay)
-                    self._reconnect_delay = min(self._reconnect_delay * 2, self._max_reconnect_delay)
+        # 会话（连接池/DNS缓存）在所有重连之间复用，退出时统一关闭
+        if self._owns_session:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(ttl_dns_cache=300, keepalive_timeout=60)
+            )
+        forward_task = asyncio.create_task(self._forward_prices())
+        try:
+            while self._running:
+                try:
+                    await self._connect()
+                except Exception as e:
+                    logger.error(f"[BINANCE] 连接错误: {e}")
+                    self.stats['reconnects'] += 1
+                    
+                    if self._running:
+                        logger.info(f"[BINANCE] {self._reconnect_delay}秒后重连...")
+                        await asyncio.sleep(self._reconnect_delay)
+                        self._reconnect_delay = min(self._reconnect_delay * 2, self._max_reconnect_delay)
+        finally:
+            forward_task.cancel()
+            if self._owns_session:
+                await self.session.close()
 
     async def stop(self):
         self._running = False
@@ -54,16 +91,17 @@ class BinancePriceMonitor:
         if self.ws:
             await self.ws.close()
         
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
         
         logger.info("[BINANCE] 价格监控器停止")
 
     async def _connect(self):
-        self.session = aiohttp.ClientSession()
-        
         try:
-            async with self.session.ws_connect(self.ws_url) as ws:
+            # heartbeat: 客户端定时ping，比系统keepalive更快发现断线；compress: 协商permessage-deflate压缩帧
+            async with self.session.ws_connect(
+                self.ws_url, heartbeat=20, compress=15, max_msg_size=2**20
+            ) as ws:
                 self.ws = ws
                 self._reconnect_delay = 1
                 
@@ -86,27 +124,78 @@ class BinancePriceMonitor:
             raise
 
     async def _handle_message(self, data: str):
+        if msgspec is not None:
+            await self._handle_message_typed(data)
+            return
+        
         try:
-            trade = json.loads(data)
+            trade = _json_loads(data)
             
             price = float(trade.get('p', 0))
             volume = float(trade.get('q', 0))
-            timestamp = trade.get('T', time.time() * 1000) / 1000
+            # 直接使用交易所成交时间 T（毫秒），缺失时才取本地时间
+            trade_time = trade.get('T')
+            timestamp = trade_time / 1000 if trade_time is not None else time.time()
             
             if price > 0:
-                self.stats['messages_received'] += 1
-                self.stats['last_price'] = price
-                self.stats['last_update'] = time.time()
+                stats = self.stats
+                stats['messages_received'] += 1
+                stats['last_price'] = price
+                stats['last_update'] = timestamp
                 
                 if self.on_price_update:
-                    if asyncio.iscoroutinefunction(self.on_price_update):
-                        await self.on_price_update(price, volume)
-                    else:
-                        self.on_price_update(price, volume)
+                    pending = self._pending_trade
+                    if pending is not None:
+                        volume += pending[1]
+                    self._pending_trade = (price, volume)
+                    self._pending_event.set()
                         
         except Exception as e:
             logger.warning(f"[BINANCE] 解析消息失败: {e}")
 
+    async def _handle_message_typed(self, data: str):
+        """msgspec 按固定结构直接解码为 Struct，字段与 _handle_message 的dict路径一致"""
+        try:
+            trade = _decode_trade(data)
+            
+            price = float(trade.p)
+            if price <= 0:
+                return
+            volume = float(trade.q)
+            timestamp = trade.T / 1000 if trade.T is not None else time.time()
+            
+            stats = self.stats
+            stats['messages_received'] += 1
+            stats['last_price'] = price
+            stats['last_update'] = timestamp
+            
+            if self.on_price_update:
+                pending = self._pending_trade
+                if pending is not None:
+                    volume += pending[1]
+                self._pending_trade = (price, volume)
+                self._pending_event.set()
+        except Exception as e:
+            logger.warning(f"[BINANCE] 解析消息失败: {e}")
+
+    async def _forward_prices(self):
+        """突发成交时合并回调：每个间隔最多调用一次 on_price_update，传最新价格与间隔内累计成交量"""
+        while True:
+            await self._pending_event.wait()
+            await asyncio.sleep(PRICE_COALESCE_INTERVAL)
+            self._pending_event.clear()
+            pending, self._pending_trade = self._pending_trade, None
+            if pending is None:
+                continue
+            
+            try:
+                if self._callback_is_coro:
+                    await self.on_price_update(*pending)
+                else:
+                    self.on_price_update(*pending)
+            except Exception as e:
+                logger.warning(f"[BINANCE] 价格回调失败: {e}")
+
     def get_statistics(self) -> dict:
         return {
             **self.stats,
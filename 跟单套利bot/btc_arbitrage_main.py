@@ -7,9 +7,15 @@ import logging
 import signal
 import time
 import argparse
+import aiohttp
 from datetime import datetime, timezone
 from typing import Optional
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from config import get_config
 from trade_executor import TradeExecutor
 from latency_arbitrage import LatencyArbitrageStrategy, MarketSession
@@ -34,9 +40,11 @@ class BTCLatencyArbitrageBot:
         self.binance_monitor: Optional[BinancePriceMonitor] = None
         self.chainlink_monitor: Optional[ChainlinkPriceMonitor] = None
         self.market_monitor: Optional[BTCMarketMonitor] = None
+        self.http_session: Optional[aiohttp.ClientSession] = None
         
         self._dry_run = False
         self._running = False
+        self._stop_event = asyncio.Event()
         
         self.stats = {
             'start_time': 0,
@@ -59,17 +67,24 @@ class BTCLatencyArbitrageBot:
         await self.strategy.start()
         logger.info("[INIT] 套利策略初始化完成")
         
+        # 各监控器共用一个HTTP会话，共享连接池、TLS会话与DNS缓存
+        self.http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=75)
+        )
+        
         self.binance_monitor = BinancePriceMonitor(
-            on_price_update=self._on_binance_price
+            on_price_update=self._on_binance_price,
+            session=self.http_session,
         )
         logger.info("[INIT] Binance监控器初始化完成")
         
         self.chainlink_monitor = ChainlinkPriceMonitor(
-            on_price_update=self._on_chainlink_price
+            on_price_update=self._on_chainlink_price,
+            session=self.http_session,
         )
         logger.info("[INIT] Chainlink监控器初始化完成")
         
-        self.market_monitor = BTCMarketMonitor(self.config, self.clob_client)
+        self.market_monitor = BTCMarketMonitor(self.config, self.clob_client, session=self.http_session)
         self.market_monitor.on_new_market(self._on_new_market)
         logger.info("[INIT] BTC市场监控器初始化完成")
         
@@ -106,13 +121,21 @@ class BTCLatencyArbitrageBot:
 
     async def run(self):
         self._running = True
-        self.stats['start_time'] = time.time()
+        self.stats['start_time'] = time.monotonic()
         
         logger.info("\n" + "="*60)
         logger.info("[BOT] BTC延迟套利机器人启动")
         logger.info(f"[BOT] 模式: {'模拟（不下单）' if self._dry_run else '实盘'}")
         logger.info("="*60 + "\n")
         
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                # Windows 不支持 add_signal_handler，退回 KeyboardInterrupt 取消任务
+                pass
+        
         tasks = [
             asyncio.create_task(self.binance_monitor.start()),
             asyncio.create_task(self.chainlink_monitor.start()),
@@ -121,8 +144,7 @@ class BTCLatencyArbitrageBot:
         ]
         
         try:
-            while self._running:
-                await asyncio.sleep(1)
+            await self._stop_event.wait()
         except asyncio.CancelledError:
             pass
         except Exception as e:
@@ -136,6 +158,11 @@ class BTCLatencyArbitrageBot:
             await asyncio.gather(*tasks, return_exceptions=True)
             await self.shutdown()
 
+    def stop(self):
+        logger.info("\n[BOT] 收到停止信号")
+        self._running = False
+        self._stop_event.set()
+
     async def _status_loop(self):
         while self._running:
             await asyncio.sleep(60)
@@ -160,6 +187,9 @@ class BTCLatencyArbitrageBot:
         if self.market_monitor:
             await self.market_monitor.stop()
         
+        if self.http_session:
+            await self.http_session.close()
+        
         if self.strategy:
             await self.strategy.stop()
             self.strategy.print_summary()
@@ -172,7 +202,7 @@ class BTCLatencyArbitrageBot:
         logger.info("[SHUTDOWN] 关闭完成")
 
     def print_summary(self):
-        elapsed = time.time() - self.stats['start_time'] if self.stats['start_time'] else 0
+        elapsed = time.monotonic() - self.stats['start_time'] if self.stats['start_time'] else 0
         
         logger.info(f"\n{'='*60}")
         logger.info("[STATS] 运行统计")
@@ -216,4 +246,7 @@ async def main():
         logger.info("[BOT] 程序结束")
 
 if __name__ == "__main__":
+    # 优先使用 uvloop（libuv 事件循环），WebSocket 读取/定时器/gather 调度更快；未安装时退回默认循环
+    if uvloop is not None:
+        uvloop.install()
     asyncio.run(main())
@@ -6,11 +6,17 @@ import asyncio
 import logging
 import time
 import aiohttp
-import json
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from dataclasses import dataclass
+from yarl import URL
 from datetime import datetime, timezone
-import math
+
+from utils import _json_loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 logger = logging.getLogger(__name__)
 
@@ -26,12 +32,23 @@ class BTCMarket:
     accepting_orders: bool
 
 class BTCMarketMonitor:
-    def __init__(self, config, clob_client=None):
+    # endDate 字符串 -> 时间戳；同一市场每次轮询的 endDate 不变，避免重复构造 datetime
+    _end_ts_cache: Dict[str, float] = {}
+    _END_TS_CACHE_MAX = 256
+    # _fetch_market 结果的短期缓存有效期（秒），边界重试时同一slug不重复请求
+    _FETCH_CACHE_TTL = 1.5
+
+    def __init__(self, config, clob_client=None, session: Optional[aiohttp.ClientSession] = None):
         self.config = config
         self.clob_client = clob_client
         
         self.gamma_api_url = "https://gamma-api.polymarket.com"
-        self.session: Optional[aiohttp.ClientSession] = None
+        # /events?slug=... 的URL按slug预先构建并缓存，请求时不再拼接查询参数
+        self._events_url = URL(f"{self.gamma_api_url}/events")
+        self._slug_urls: Dict[str, URL] = {}
+        # 传入的共享会话由调用方负责关闭
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
         
         self.current_market: Optional[BTCMarket] = None
         self.next_market: Optional[BTCMarket] = None
@@ -40,6 +57,15 @@ class BTCMarketMonitor:
         self._running = False
         self._poll_interval = 3
         
+        # 当前5分钟区间及对应slug，区间变化时才重新生成
+        self._last_bucket = -1
+        self._current_slug = ''
+        self._next_slug = ''
+        
+        # slug -> (获取时刻monotonic, 市场)；以及进行中的请求，并发调用方共享同一次请求
+        self._fetch_cache: Dict[str, Tuple[float, BTCMarket]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        
         self.stats = {
             'markets_discovered': 0,
             'markets_traded': 0,
@@ -53,18 +79,23 @@ class BTCMarketMonitor:
         self.clob_client = clob_client
 
     def on_new_market(self, callback):
-        self._on_new_market = callback
+        # 统一成可 await 的回调：同步回调放到线程中执行，避免阻塞事件循环
+        if callback is None or asyncio.iscoroutinefunction(callback):
+            self._on_new_market = callback
+        else:
+            self._on_new_market = lambda market: asyncio.to_thread(callback, market)
 
     async def start(self):
         self._running = True
-        self.session = aiohttp.ClientSession()
+        if self._owns_session:
+            self.session = aiohttp.ClientSession()
         
         logger.info("[BTC-MARKET] 启动市场监控...")
         
         while self._running:
             try:
                 await self._discover_current_market()
-                await asyncio.sleep(self._poll_interval)
+                await asyncio.sleep(self._next_poll_delay())
             except Exception as e:
                 logger.error(f"[BTC-MARKET] 监控错误: {e}")
                 await asyncio.sleep(1)
@@ -72,22 +103,47 @@ class BTCMarketMonitor:
     async def stop(self):
         self._running = False
         
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
         
         logger.info("[BTC-MARKET] 市场监控器停止")
 
+    def _next_poll_delay(self) -> float:
+        """
+        市场只在5分钟边界切换：当前区间的市场已找到时，区间中段最多睡10秒，
+        临近边界收紧到 _poll_interval 并尽量在边界时刻醒来；未找到当前市场时按 _poll_interval 轮询
+        """
+        if not self.current_market or self.current_market.slug != self._current_slug:
+            return self._poll_interval
+        
+        until_boundary = self._last_bucket + 300 - time.time()
+        if until_boundary > 5:
+            return max(0.25, min(10.0, until_boundary - 5))
+        return max(0.25, min(self._poll_interval, until_boundary))
+
     async def _discover_current_market(self):
         try:
             now = time.time()
             
-            current_ts = math.floor(now / 300) * 300
-            next_ts = current_ts + 300
-            
-            current_slug = f"btc-updown-5m-{current_ts}"
-            next_slug = f"btc-updown-5m-{next_ts}"
+            now_int = int(now)
+            bucket = now_int - now_int % 300
+            if bucket != self._last_bucket:
+                self._last_bucket = bucket
+                self._current_slug = f"btc-updown-5m-{bucket}"
+                self._next_slug = f"btc-updown-5m-{bucket + 300}"
+            current_slug = self._current_slug
+            next_slug = self._next_slug
             
-            current_market = await self._fetch_market(current_slug)
+            # 当前与下一个市场并发查询，切换窗口内总耗时为一次往返
+            current_market, next_market = await asyncio.gather(
+                self._fetch_market(current_slug),
+                self._fetch_market(next_slug),
+                return_exceptions=True,
+            )
+            if isinstance(current_market, BaseException):
+                current_market = None
+            if isinstance(next_market, BaseException):
+                next_market = None
             
             if current_market:
                 if not self.current_market or current_market.slug != self.current_market.slug:
@@ -96,24 +152,24 @@ class BTCMarketMonitor:
                     
                     remaining = current_market.end_time - now
                     
-                    logger.info(f"\n{'='*60}")
-                    logger.info(f"[BTC-MARKET] 发现活跃市场!")
-                    logger.info(f"[BTC-MARKET] Slug: {current_market.slug}")
-                    logger.info(f"[BTC-MARKET] 开始: {datetime.fromtimestamp(current_market.start_time, tz=timezone.utc)}")
-                    logger.info(f"[BTC-MARKET] 结束: {datetime.fromtimestamp(current_market.end_time, tz=timezone.utc)}")
-                    logger.info(f"[BTC-MARKET] Up价格: {current_market.up_price:.3f}")
-                    logger.info(f"[BTC-MARKET] Down价格: {current_market.down_price:.3f}")
-                    logger.info(f"[BTC-MARKET] 剩余时间: {remaining:.0f}秒")
-                    logger.info(f"{'='*60}\n")
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(f"\n{'='*60}")
+                        logger.info(f"[BTC-MARKET] 发现活跃市场!")
+                        logger.info(f"[BTC-MARKET] Slug: {current_market.slug}")
+                        logger.info(f"[BTC-MARKET] 开始: {datetime.fromtimestamp(current_market.start_time, tz=timezone.utc)}")
+                        logger.info(f"[BTC-MARKET] 结束: {datetime.fromtimestamp(current_market.end_time, tz=timezone.utc)}")
+                        logger.info(f"[BTC-MARKET] Up价格: {current_market.up_price:.3f}")
+                        logger.info(f"[BTC-MARKET] Down价格: {current_market.down_price:.3f}")
+                        logger.info(f"[BTC-MARKET] 剩余时间: {remaining:.0f}秒")
+                        logger.info(f"{'='*60}\n")
                     
                     if self._on_new_market:
                         await self._on_new_market(current_market)
             else:
-                next_market = await self._fetch_market(next_slug)
                 if next_market:
                     self.next_market = next_market
                     wait_time = next_market.start_time - now
-                    logger.info(f"[BTC-MARKET] 等待下一个市场: {next_slug} ({wait_time:.0f}秒后开始)")
+                    logger.info("[BTC-MARKET] 等待下一个市场: %s (%.0f秒后开始)", next_slug, wait_time)
                     
         except Exception as e:
             logger.error(f"[BTC-MARKET] 发现市场失败: {e}")
@@ -121,15 +177,45 @@ class BTCMarketMonitor:
             traceback.print_exc()
 
     async def _fetch_market(self, slug: str) -> Optional[BTCMarket]:
+        now = time.monotonic()
+        cached = self._fetch_cache.get(slug)
+        if cached and now - cached[0] < self._FETCH_CACHE_TTL:
+            return cached[1]
+        
+        task = self._inflight.get(slug)
+        if task is None:
+            task = asyncio.create_task(self._request_market(slug))
+            self._inflight[slug] = task
+            task.add_done_callback(lambda _t, s=slug: self._inflight.pop(s, None))
+        
+        # shield: 某个调用方被取消时不影响共享同一请求的其他调用方
+        market = await asyncio.shield(task)
+        if market is not None:
+            if len(self._fetch_cache) >= 16:
+                self._fetch_cache.clear()
+            self._fetch_cache[slug] = (time.monotonic(), market)
+        return market
+
+    async def _request_market(self, slug: str) -> Optional[BTCMarket]:
         try:
-            url = f"{self.gamma_api_url}/events"
-            params = {'slug': slug}
+            url = self._slug_urls.get(slug)
+            if url is None:
+                if len(self._slug_urls) >= 16:
+                    self._slug_urls.clear()
+                url = self._slug_urls[slug] = self._events_url.with_query(slug=slug)
             
-            async with self.session.get(url, params=params) as resp:
+            async with self.session.get(url) as resp:
                 if resp.status != 200:
                     return None
                 
-                data = await resp.json()
+                if ijson is not None:
+                    try:
+                        return await self._stream_first_market(resp.content)
+                    finally:
+                        # 读完剩余响应体，连接才能放回连接池复用
+                        await resp.read()
+                
+                data = _json_loads(await resp.read())
             
             if not data:
                 return None
@@ -140,17 +226,35 @@ class BTCMarketMonitor:
             if not markets:
                 return None
             
-            for m in markets:
-                market = self._parse_market(m)
-                if market:
-                    return market
-            
-            return None
+            return next((m for m in map(self._parse_market, markets) if m is not None), None)
             
         except Exception as e:
-            logger.debug(f"[BTC-MARKET] 获取市场 {slug} 失败: {e}")
+            logger.debug("[BTC-MARKET] 获取市场 %s 失败: %s", slug, e)
             return None
 
+    async def _stream_first_market(self, content) -> Optional[BTCMarket]:
+        """
+        边接收边解析，只构造 markets 数组中的元素，找到第一个有效市场即返回；
+        响应体为事件列表（item.markets.item）或单个事件（markets.item）时都适用
+        """
+        builder = None
+        item_prefix = None
+        async for prefix, event, value in ijson.parse_async(content, use_float=True):
+            if builder is None:
+                if event == 'start_map' and prefix in ('item.markets.item', 'markets.item'):
+                    builder = ijson.ObjectBuilder()
+                    item_prefix = prefix
+                    builder.event(event, value)
+                continue
+            
+            builder.event(event, value)
+            if event == 'end_map' and prefix == item_prefix:
+                market = self._parse_market(builder.value)
+                if market is not None:
+                    return market
+                builder = None
+        return None
+
     def _parse_market(self, data: Dict) -> Optional[BTCMarket]:
         try:
             slug = data.get('slug', '')
@@ -165,11 +269,17 @@ class BTCMarketMonitor:
             
             end_date = data.get('endDate', '')
             
-            if end_date:
-                end_time = datetime.fromisoformat(end_date.replace('Z', '+00:00')).timestamp()
-            else:
+            if not end_date:
                 return None
             
+            cache = self._end_ts_cache
+            end_time = cache.get(end_date)
+            if end_time is None:
+                end_time = datetime.fromisoformat(end_date.replace('Z', '+00:00')).timestamp()
+                if len(cache) >= self._END_TS_CACHE_MAX:
+                    cache.clear()
+                cache[end_date] = end_time
+            
             try:
                 ts_str = slug.split('-')[-1]
                 start_time = int(ts_str)
@@ -181,7 +291,7 @@ class BTCMarketMonitor:
                 return None
             
             try:
-                token_ids = json.loads(clob_token_ids_str)
+                token_ids = _json_loads(clob_token_ids_str)
             except:
                 return None
             
@@ -193,7 +303,7 @@ class BTCMarketMonitor:
             
             outcome_prices_str = data.get('outcomePrices', '[0.5, 0.5]')
             try:
-                prices = json.loads(outcome_prices_str)
+                prices = _json_loads(outcome_prices_str)
                 up_price = float(prices[0]) if len(prices) > 0 else 0.5
                 down_price = float(prices[1]) if len(prices) > 1 else 0.5
             except:
@@ -220,8 +330,11 @@ class BTCMarketMonitor:
             return {'up': market.up_price, 'down': market.down_price}
         
         try:
-            up_book = self.clob_client.get_order_book(market.up_token_id)
-            down_book = self.clob_client.get_order_book(market.down_token_id)
+            # py-clob-client 是同步调用，放到线程中并发请求两边订单簿
+            up_book, down_book = await asyncio.gather(
+                asyncio.to_thread(self.clob_client.get_order_book, market.up_token_id),
+                asyncio.to_thread(self.clob_client.get_order_book, market.down_token_id),
+            )
             
             up_price = market.up_price
             down_price = market.down_price
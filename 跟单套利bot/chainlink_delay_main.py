@@ -6,9 +6,15 @@ import asyncio
 import logging
 import time
 import argparse
+import aiohttp
 from datetime import datetime, timezone
 from typing import Optional
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from config import get_config
 from trade_executor import TradeExecutor
 from chainlink_delay_strategy import ChainlinkDelayStrategy, MarketSession
@@ -33,6 +39,7 @@ class ChainlinkDelayBot:
         self.binance_monitor: Optional[BinancePriceMonitor] = None
         self.chainlink_monitor: Optional[ChainlinkPriceMonitor] = None
         self.market_monitor: Optional[BTCMarketMonitor] = None
+        self.http_session: Optional[aiohttp.ClientSession] = None
         
         self._dry_run = False
         self._running = False
@@ -58,17 +65,24 @@ class ChainlinkDelayBot:
         await self.strategy.start()
         logger.info("[INIT] 策略初始化完成")
         
+        # 各监控器共用一个HTTP会话，轮询 gamma-api / Chainlink 时复用keepalive连接
+        self.http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=75)
+        )
+        
         self.binance_monitor = BinancePriceMonitor(
-            on_price_update=self._on_binance_price
+            on_price_update=self._on_binance_price,
+            session=self.http_session,
         )
         logger.info("[INIT] Binance监控器初始化完成")
         
         self.chainlink_monitor = ChainlinkPriceMonitor(
-            on_price_update=self._on_chainlink_price
+            on_price_update=self._on_chainlink_price,
+            session=self.http_session,
         )
         logger.info("[INIT] Chainlink监控器初始化完成")
         
-        self.market_monitor = BTCMarketMonitor(self.config, self.clob_client)
+        self.market_monitor = BTCMarketMonitor(self.config, self.clob_client, session=self.http_session)
         self.market_monitor.on_new_market(self._on_new_market)
         logger.info("[INIT] BTC市场监控器初始化完成")
         
@@ -105,7 +119,7 @@ class ChainlinkDelayBot:
 
     async def run(self):
         self._running = True
-        self.stats['start_time'] = time.time()
+        self.stats['start_time'] = time.monotonic()
         
         logger.info("\n" + "="*60)
         logger.info("[BOT] Chainlink延迟套利机器人启动")
@@ -162,6 +176,9 @@ class ChainlinkDelayBot:
         if self.market_monitor:
             await self.market_monitor.stop()
         
+        if self.http_session:
+            await self.http_session.close()
+        
         if self.strategy:
             await self.strategy.stop()
             self.strategy.print_summary()
@@ -174,7 +191,7 @@ class ChainlinkDelayBot:
         logger.info("[SHUTDOWN] 关闭完成")
 
     def print_summary(self):
-        elapsed = time.time() - self.stats['start_time'] if self.stats['start_time'] else 0
+        elapsed = time.monotonic() - self.stats['start_time'] if self.stats['start_time'] else 0
         
         logger.info(f"\n{'='*60}")
         logger.info("[STATS] 运行统计")
@@ -220,4 +237,7 @@ async def main():
         logger.info("[BOT] 程序结束")
 
 if __name__ == "__main__":
+    # 优先使用 uvloop（libuv 事件循环），未安装时退回默认循环
+    if uvloop is not None:
+        uvloop.install()
     asyncio.run(main())
@@ -11,9 +11,11 @@ Chainlink延迟套利策略
 """
 import asyncio
 import logging
+import math
 import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Optional, Dict, List
+from typing import Deque, Dict, Optional, Tuple
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
@@ -44,13 +46,21 @@ class ChainlinkDelayStrategy:
         self.trade_executor = trade_executor
         self._dry_run = dry_run
         
-        self.binance_prices: List[PriceTick] = []
-        self.chainlink_prices: List[PriceTick] = []
+        # 有界历史，超出上限时自动丢弃最旧的记录
+        self.chainlink_prices: Deque[PriceTick] = deque(maxlen=100)
+        # 最近 window_seconds 秒内的Binance价格，按时间顺序，过期的从队首弹出；
+        # Binance tick 频率高，直接存 (timestamp, price) 元组，不为每个tick构造 PriceTick
+        self.window_seconds = 60
+        self._window: Deque[Tuple[float, float]] = deque()
         
         self.current_market: Optional[MarketSession] = None
+        # 方向 -> token_id，随 set_current_market 更新
+        self._dir_tokens: Dict[str, str] = {}
         
         self.chainlink_update_interval = 60
-        self.last_chainlink_update = 0
+        # 墙钟时间，仅用于统计展示；间隔判断用单调时钟，初始为 -inf 表示尚未收到更新
+        self.last_chainlink_update = 0.0
+        self._last_chainlink_mono = -math.inf
         
         self.trade_amount = 15.0
         self.min_price_change = 0.0005
@@ -82,26 +92,32 @@ class ChainlinkDelayStrategy:
         logger.info("[STRATEGY] Chainlink延迟套利策略停止")
 
     def update_binance_price(self, price: float, volume: float = 0.0):
-        tick = PriceTick(price=price, timestamp=time.time())
-        self.binance_prices.append(tick)
-        
-        while len(self.binance_prices) > 1000:
-            self.binance_prices.pop(0)
+        # 价格时间戳与间隔计算使用单调时钟，不受系统校时跳变影响
+        now = time.monotonic()
+        self._window.append((now, price))
+        self._trim_window(now)
+
+    def _trim_window(self, now: float):
+        window = self._window
+        cutoff = now - self.window_seconds
+        while window and window[0][0] < cutoff:
+            window.popleft()
 
     def update_chainlink_price(self, price: float):
-        tick = PriceTick(price=price, timestamp=time.time())
+        now = time.monotonic()
+        tick = PriceTick(price=price, timestamp=now)
         self.chainlink_prices.append(tick)
         
-        while len(self.chainlink_prices) > 100:
-            self.chainlink_prices.pop(0)
-        
+        self._last_chainlink_mono = now
         self.last_chainlink_update = time.time()
         self.stats['chainlink_updates'] += 1
         
-        logger.info(f"[CHAINLINK] 价格更新: ${price:,.2f}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"[CHAINLINK] 价格更新: ${price:,.2f}")
 
     def set_current_market(self, market: MarketSession):
         self.current_market = market
+        self._dir_tokens = {'UP': market.up_token_id, 'DOWN': market.down_token_id}
         logger.info(f"[STRATEGY] 设置当前市场: {market.market_slug}")
         logger.info(f"[STRATEGY] 开始时间: {datetime.fromtimestamp(market.start_time, tz=timezone.utc)}")
         logger.info(f"[STRATEGY] 结束时间: {datetime.fromtimestamp(market.end_time, tz=timezone.utc)}")
@@ -119,6 +135,7 @@ class ChainlinkDelayStrategy:
         if not self.current_market:
             return
         
+        # 市场起止时间是墙钟时间；Chainlink间隔与价格窗口用单调时钟
         now = time.time()
         market = self.current_market
         
@@ -128,40 +145,44 @@ class ChainlinkDelayStrategy:
         if market.trade_direction:
             return
         
-        time_since_last_chainlink = now - self.last_chainlink_update
+        mono_now = time.monotonic()
+        time_since_last_chainlink = mono_now - self._last_chainlink_mono
         
         if time_since_last_chainlink < 50:
             return
         
-        recent_prices = [p for p in self.binance_prices if p.timestamp >= now - 60]
+        # 行情停顿时也要淘汰过期记录
+        self._trim_window(mono_now)
+        window = self._window
         
-        if len(recent_prices) < 10:
+        if len(window) < 10:
             return
         
-        first_price = recent_prices[0].price
-        last_price = recent_prices[-1].price
+        first_price = window[0][1]
+        last_price = window[-1][1]
         price_change = (last_price - first_price) / first_price
         
-        logger.debug(f"[STRATEGY] 距Chainlink更新: {time_since_last_chainlink:.0f}s, 价格变动: {price_change*100:.3f}%")
+        logger.debug("[STRATEGY] 距Chainlink更新: %.0fs, 价格变动: %.3f%%", time_since_last_chainlink, price_change*100)
         
         if abs(price_change) < self.min_price_change:
-            logger.debug(f"[STRATEGY] 价格变动太小，跳过")
+            logger.debug("[STRATEGY] 价格变动太小，跳过")
             return
         
         if abs(price_change) > self.max_price_change:
-            logger.debug(f"[STRATEGY] 价格变动太大（可能已反应），跳过")
+            logger.debug("[STRATEGY] 价格变动太大（可能已反应），跳过")
             return
         
         direction = "UP" if price_change > 0 else "DOWN"
         
-        logger.info(f"\n{'='*60}")
-        logger.info(f"[SIGNAL] Chainlink延迟套利机会!")
-        logger.info(f"[SIGNAL] 方向: {direction}")
-        logger.info(f"[SIGNAL] 价格变动: {price_change * 100:.3f}%")
-        logger.info(f"[SIGNAL] 当前价格: ${last_price:,.2f}")
-        logger.info(f"[SIGNAL] 距Chainlink更新: {time_since_last_chainlink:.0f}秒")
-        logger.info(f"[SIGNAL] 市场剩余: {market.end_time - now:.0f}秒")
-        logger.info(f"{'='*60}\n")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"\n{'='*60}")
+            logger.info(f"[SIGNAL] Chainlink延迟套利机会!")
+            logger.info(f"[SIGNAL] 方向: {direction}")
+            logger.info(f"[SIGNAL] 价格变动: {price_change * 100:.3f}%")
+            logger.info(f"[SIGNAL] 当前价格: ${last_price:,.2f}")
+            logger.info(f"[SIGNAL] 距Chainlink更新: {time_since_last_chainlink:.0f}秒")
+            logger.info(f"[SIGNAL] 市场剩余: {market.end_time - now:.0f}秒")
+            logger.info(f"{'='*60}\n")
         
         self.stats['signals_generated'] += 1
         
@@ -173,23 +194,20 @@ class ChainlinkDelayStrategy:
         
         market = self.current_market
         
-        if direction == "UP":
-            token_id = market.up_token_id
-            expected_price = market.current_up_price
-        else:
-            token_id = market.down_token_id
-            expected_price = market.current_down_price
+        token_id = self._dir_tokens[direction]
+        # 当前价格可能在会话期间更新，不放进预计算的映射
+        expected_price = market.current_up_price if direction == "UP" else market.current_down_price
         
         confidence = min(abs(price_change) / self.min_price_change, 2.0)
         trade_amount = min(self.trade_amount * confidence, self.trade_amount * 1.5)
         
-        logger.info(f"[TRADE] 执行Chainlink延迟套利:")
-        logger.info(f"[TRADE] 方向: {direction}")
-        logger.info(f"[TRADE] 金额: ${trade_amount:.2f}")
-        logger.info(f"[TRADE] 预期价格: {expected_price:.3f}")
+        logger.info("[TRADE] 执行Chainlink延迟套利:")
+        logger.info("[TRADE] 方向: %s", direction)
+        logger.info("[TRADE] 金额: $%.2f", trade_amount)
+        logger.info("[TRADE] 预期价格: %.3f", expected_price)
         
         if self._dry_run:
-            logger.info(f"[TRADE] 模拟模式 - 不执行实际下单")
+            logger.info("[TRADE] 模拟模式 - 不执行实际下单")
             market.trade_direction = direction
             market.trade_amount = trade_amount
             market.trade_price = expected_price
@@ -211,9 +229,9 @@ class ChainlinkDelayStrategy:
                 
                 self.stats['trades_executed'] += 1
                 
-                logger.info(f"[TRADE] 下单成功! 订单ID: {result.order_id}")
-                logger.info(f"[TRADE] 成交价格: {result.avg_price:.4f}")
-                logger.info(f"[TRADE] 成交金额: ${result.filled_size:.2f}")
+                logger.info("[TRADE] 下单成功! 订单ID: %s", result.order_id)
+                logger.info("[TRADE] 成交价格: %.4f", result.avg_price)
+                logger.info("[TRADE] 成交金额: $%.2f", result.filled_size)
             else:
                 error = result.error_message if result else "Unknown error"
                 logger.warning(f"[TRADE] 下单失败: {error}")
@@ -10,16 +10,30 @@ from typing import Callable, Optional
 
 logger = logging.getLogger(__name__)
 
+# 主API可能的响应结构，按探测顺序排列
+_PRIMARY_DECODERS = (
+    lambda d: float(d['answer']) / 1e8,
+    lambda d: float(d['price']),
+    lambda d: float(d['data']['answer']) / 1e8,
+    lambda d: float(d['data']['price']),
+)
+
 class ChainlinkPriceMonitor:
-    def __init__(self, on_price_update: Callable[[float], None]):
+    def __init__(self, on_price_update: Callable[[float], None],
+                 session: Optional[aiohttp.ClientSession] = None):
         self.on_price_update = on_price_update
+        self._callback_is_coro = asyncio.iscoroutinefunction(on_price_update)
         
         self.api_url = "https://data.chain.link/streams/btc-usd"
         self.fallback_url = "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=usd"
         
-        self.session: Optional[aiohttp.ClientSession] = None
+        # 传入的共享会话由调用方负责关闭
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
         self._running = False
         self.poll_interval = 1
+        # 上次成功解析主API响应的解码器，响应结构变化时重新探测
+        self._decoder: Optional[Callable[[dict], float]] = None
         
         self.stats = {
             'updates_received': 0,
@@ -32,7 +46,8 @@ class ChainlinkPriceMonitor:
 
     async def start(self):
         self._running = True
-        self.session = aiohttp.ClientSession()
+        if self._owns_session:
+            self.session = aiohttp.ClientSession()
         
         logger.info("[CHAINLINK] 启动价格轮询...")
         
@@ -46,7 +61,7 @@ class ChainlinkPriceMonitor:
                     self.stats['last_update'] = time.time()
                     
                     if self.on_price_update:
-                        if asyncio.iscoroutinefunction(self.on_price_update):
+                        if self._callback_is_coro:
                             await self.on_price_update(price)
                         else:
                             self.on_price_update(price)
@@ -60,7 +75,7 @@ class ChainlinkPriceMonitor:
     async def stop(self):
         self._running = False
         
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
         
         logger.info("[CHAINLINK] 价格监控器停止")
@@ -71,16 +86,9 @@ class ChainlinkPriceMonitor:
                 if resp.status == 200:
                     data = await resp.json()
                     
-                    if isinstance(data, dict):
-                        if 'answer' in data:
-                            return float(data['answer']) / 1e8
-                        elif 'price' in data:
-                            return float(data['price'])
-                        elif 'data' in data and isinstance(data['data'], dict):
-                            if 'answer' in data['data']:
-                                return float(data['data']['answer']) / 1e8
-                            elif 'price' in data['data']:
-                                return float(data['data']['price'])
+                    price = self._decode_primary(data)
+                    if price is not None:
+                        return price
         except Exception as e:
             logger.debug(f"[CHAINLINK] 主API失败: {e}")
         
@@ -95,6 +103,23 @@ class ChainlinkPriceMonitor:
         
         return None
 
+    def _decode_primary(self, data) -> Optional[float]:
+        decoder = self._decoder
+        if decoder is not None:
+            try:
+                return decoder(data)
+            except (KeyError, TypeError):
+                self._decoder = None
+        
+        for decoder in _PRIMARY_DECODERS:
+            try:
+                price = decoder(data)
+            except (KeyError, TypeError):
+                continue
+            self._decoder = decoder
+            return price
+        return None
+
     def get_statistics(self) -> dict:
         return {
             **self.stats,
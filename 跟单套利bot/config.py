@@ -5,14 +5,16 @@ Polymarket套利机器人 - 配置模块
 import os
 import sys
 import logging
+from functools import lru_cache
 from dotenv import load_dotenv
 from dataclasses import dataclass
 from typing import List, Optional
 
 load_dotenv()
 
+# 生产环境可设 LOG_LEVEL=WARNING，下单热路径上的 INFO 日志直接跳过
 logging.basicConfig(
-    level=logging.INFO,
+    level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
     format='%(asctime)s [%(levelname)s] %(message)s',
     datefmt='%H:%M:%S'
 )
@@ -30,6 +32,8 @@ class ArbitrageConfig:
     price_change_threshold: float = 0.001
     lookback_seconds: int = 5
     min_confidence: float = 0.6
+    book_cache_ttl_ms: float = 200.0
+    history_size: int = 10000
 
 @dataclass
 class RiskConfig:
@@ -74,6 +78,8 @@ class Config:
             price_check_interval=float(os.getenv("PRICE_CHECK_INTERVAL", "2")),
             order_timeout=int(os.getenv("ORDER_TIMEOUT", "30")),
             max_slippage=float(os.getenv("MAX_SLIPPAGE", "0.01")),
+            book_cache_ttl_ms=float(os.getenv("BOOK_CACHE_TTL_MS", "200")),
+            history_size=int(os.getenv("OPPORTUNITY_HISTORY_SIZE", "10000")),
         )
         
         self.risk = RiskConfig(
@@ -157,5 +163,7 @@ class Config:
         self._clob_client_instance = client
         return client
 
+@lru_cache(maxsize=1)
 def get_config() -> Config:
+    # 进程内单例：环境变量只解析一次，CLOB客户端实例也随之复用
     return Config()
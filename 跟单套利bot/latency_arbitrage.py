@@ -16,20 +16,26 @@ import asyncio
 import logging
 import time
 import json
+from collections import deque
 from dataclasses import dataclass
-from typing import Optional, Dict, List, Callable
+from typing import Optional, Deque, Dict, List, Callable, Tuple
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# tick时间戳与回看窗口使用单调时钟；市场起止时间是墙钟时间，仍用 time.time()
+_monotonic = time.monotonic
+
+_BANNER = '=' * 60
+
+@dataclass(slots=True)
 class PriceTick:
     source: str
     price: float
     timestamp: float
     volume: float = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class MarketSession:
     market_slug: str
     up_token_id: str
@@ -47,11 +53,12 @@ class LatencyArbitrageStrategy:
         self.trade_executor = trade_executor
         self._dry_run = dry_run
         
-        self.binance_prices: List[PriceTick] = []
-        self.chainlink_prices: List[PriceTick] = []
+        # 有界历史，超出上限时自动丢弃最旧的记录
+        self.chainlink_prices: Deque[PriceTick] = deque(maxlen=100)
         
         self.current_market: Optional[MarketSession] = None
-        self.market_history: List[MarketSession] = []
+        # 只保留最近的市场会话，长时间运行时内存有界
+        self.market_history: Deque[MarketSession] = deque(maxlen=1024)
         
         self.stats = {
             'signals_generated': 0,
@@ -64,9 +71,18 @@ class LatencyArbitrageStrategy:
         self._running = False
         self._callbacks: List[Callable] = []
         
+        # 新tick只置位事件，由常驻的分析任务处理；分析期间到达的多个tick合并为一次分析
+        self._price_event = asyncio.Event()
+        self._analysis_task: Optional[asyncio.Task] = None
+        
         self.price_change_threshold = getattr(config.arbitrage, 'price_change_threshold', 0.001)
         self.lookback_seconds = getattr(config.arbitrage, 'lookback_seconds', 5)
         self.min_confidence = getattr(config.arbitrage, 'min_confidence', 0.6)
+        self.min_trade_size = config.arbitrage.min_trade_size
+        self.max_trade_size = config.arbitrage.max_trade_size
+        
+        # 回看窗口 (timestamp, price)，按时间顺序，过期的从队首弹出；首尾即窗口起止价格
+        self._window: Deque[Tuple[float, float]] = deque()
         
         logger.info(f"[STRATEGY] 延迟套利策略初始化")
         logger.info(f"[STRATEGY] 价格变动阈值: {self.price_change_threshold * 100:.2f}%")
@@ -77,49 +93,57 @@ class LatencyArbitrageStrategy:
 
     async def start(self):
         self._running = True
+        self._analysis_task = asyncio.create_task(self._analysis_loop())
         logger.info("[STRATEGY] 延迟套利策略启动")
 
     async def stop(self):
         self._running = False
+        if self._analysis_task:
+            self._analysis_task.cancel()
+            self._analysis_task = None
         logger.info("[STRATEGY] 延迟套利策略停止")
 
     def update_binance_price(self, price: float, volume: float = 0.0):
-        tick = PriceTick(
-            source='binance',
-            price=price,
-            timestamp=time.time(),
-            volume=volume,
-        )
-        self.binance_prices.append(tick)
-        
-        while len(self.binance_prices) > 1000:
-            self.binance_prices.pop(0)
+        now = _monotonic()
+        self._window.append((now, price))
+        self._trim_window(now)
         
         if self._running and self.current_market:
+            self._price_event.set()
+
+    async def _analysis_loop(self):
+        price_event = self._price_event
+        while self._running:
+            await price_event.wait()
+            price_event.clear()
             try:
-                asyncio.create_task(self._analyze_price_movement())
+                await self._analyze_price_movement()
             except Exception as e:
-                logger.warning(f"[STRATEGY] 价格分析任务创建失败: {e}")
+                logger.warning(f"[STRATEGY] 价格分析失败: {e}")
+
+    def _trim_window(self, now: float):
+        window = self._window
+        cutoff = now - self.lookback_seconds
+        while window and window[0][0] < cutoff:
+            window.popleft()
 
     def update_chainlink_price(self, price: float):
         tick = PriceTick(
             source='chainlink',
             price=price,
-            timestamp=time.time(),
+            timestamp=_monotonic(),
         )
         self.chainlink_prices.append(tick)
-        
-        while len(self.chainlink_prices) > 100:
-            self.chainlink_prices.pop(0)
 
     def set_current_market(self, market: MarketSession):
         if self.current_market:
             self.market_history.append(self.current_market)
         
         self.current_market = market
-        logger.info(f"[STRATEGY] 设置当前市场: {market.market_slug}")
-        logger.info(f"[STRATEGY] 开始时间: {datetime.fromtimestamp(market.start_time, tz=timezone.utc)}")
-        logger.info(f"[STRATEGY] 结束时间: {datetime.fromtimestamp(market.end_time, tz=timezone.utc)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"[STRATEGY] 设置当前市场: {market.market_slug}")
+            logger.info(f"[STRATEGY] 开始时间: {datetime.fromtimestamp(market.start_time, tz=timezone.utc)}")
+            logger.info(f"[STRATEGY] 结束时间: {datetime.fromtimestamp(market.end_time, tz=timezone.utc)}")
 
     async def _analyze_price_movement(self):
         if not self.current_market:
@@ -137,40 +161,47 @@ class LatencyArbitrageStrategy:
         if remaining_time < 10:
             return
         
-        recent_prices = [
-            p for p in self.binance_prices 
-            if p.timestamp >= now - self.lookback_seconds
-        ]
+        # 行情停顿时也要淘汰过期记录
+        self._trim_window(_monotonic())
+        window = self._window
         
-        if len(recent_prices) < 3:
+        if len(window) < 3:
             return
         
-        first_price = recent_prices[0].price
-        last_price = recent_prices[-1].price
+        first_price = window[0][1]
+        last_price = window[-1][1]
         price_change = (last_price - first_price) / first_price
         
         if market.start_price is None:
             market.start_price = first_price
-            logger.info(f"[STRATEGY] 市场起始价格: ${first_price:,.2f}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"[STRATEGY] 市场起始价格: ${first_price:,.2f}")
         
-        if abs(price_change) < self.price_change_threshold:
+        abs_change = abs(price_change)
+        threshold = self.price_change_threshold
+        if abs_change < threshold:
             return
         
         direction = "UP" if price_change > 0 else "DOWN"
-        confidence = min(abs(price_change) / self.price_change_threshold, 1.0)
+        confidence = min(abs_change / threshold, 1.0)
         
         if confidence < self.min_confidence:
             return
         
-        logger.info(f"\n{'='*60}")
-        logger.info(f"[SIGNAL] 检测到价格变动!")
-        logger.info(f"[SIGNAL] 方向: {direction}")
-        logger.info(f"[SIGNAL] 变动幅度: {price_change * 100:.3f}%")
-        logger.info(f"[SIGNAL] 信心度: {confidence:.2f}")
-        logger.info(f"[SIGNAL] 当前价格: ${last_price:,.2f}")
-        logger.info(f"[SIGNAL] 市场已运行: {time_in_market:.1f}秒")
-        logger.info(f"[SIGNAL] 剩余时间: {remaining_time:.1f}秒")
-        logger.info(f"{'='*60}\n")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "\n%s\n"
+                "[SIGNAL] 检测到价格变动!\n"
+                "[SIGNAL] 方向: %s\n"
+                "[SIGNAL] 变动幅度: %.3f%%\n"
+                "[SIGNAL] 信心度: %.2f\n"
+                "[SIGNAL] 当前价格: $%s\n"
+                "[SIGNAL] 市场已运行: %.1f秒\n"
+                "[SIGNAL] 剩余时间: %.1f秒\n"
+                "%s\n",
+                _BANNER, direction, price_change * 100, confidence, format(last_price, ',.2f'),
+                time_in_market, remaining_time, _BANNER,
+            )
         
         self.stats['signals_generated'] += 1
         
@@ -191,14 +222,14 @@ class LatencyArbitrageStrategy:
         
         trade_size = self._calculate_trade_size(confidence)
         
-        logger.info(f"[TRADE] 准备下单:")
-        logger.info(f"[TRADE] 方向: {direction}")
-        logger.info(f"[TRADE] Token: {token_id[:20]}...")
-        logger.info(f"[TRADE] 金额: ${trade_size:.2f}")
-        logger.info(f"[TRADE] 预期价格: {expected_price:.3f}")
+        logger.info("[TRADE] 准备下单:")
+        logger.info("[TRADE] 方向: %s", direction)
+        logger.info("[TRADE] Token: %s...", token_id[:20])
+        logger.info("[TRADE] 金额: $%.2f", trade_size)
+        logger.info("[TRADE] 预期价格: %.3f", expected_price)
         
         if self._dry_run:
-            logger.info(f"[TRADE] 模拟模式 - 不执行实际下单")
+            logger.info("[TRADE] 模拟模式 - 不执行实际下单")
             self.stats['trades_executed'] += 1
             return
         
@@ -212,7 +243,7 @@ class LatencyArbitrageStrategy:
             
             if result:
                 self.stats['trades_executed'] += 1
-                logger.info(f"[TRADE] 下单成功!")
+                logger.info("[TRADE] 下单成功!")
                 
                 for callback in self._callbacks:
                     await callback({
@@ -229,28 +260,31 @@ class LatencyArbitrageStrategy:
             logger.error(f"[TRADE] 下单异常: {e}")
 
     def _calculate_trade_size(self, confidence: float) -> float:
-        base_size = self.config.arbitrage.min_trade_size
-        max_size = self.config.arbitrage.max_trade_size
+        base_size = self.min_trade_size
+        max_size = self.max_trade_size
         
         size = base_size + (max_size - base_size) * confidence
         return min(size, max_size)
 
     def record_result(self, won: bool, profit: float):
+        stats = self.stats
         if won:
-            self.stats['wins'] += 1
+            stats['wins'] += 1
         else:
-            self.stats['losses'] += 1
+            stats['losses'] += 1
         
-        self.stats['total_profit'] += profit
+        stats['total_profit'] += profit
         
-        win_rate = self.stats['wins'] / max(self.stats['trades_executed'], 1) * 100
-        logger.info(f"[STATS] 胜率: {win_rate:.1f}% ({self.stats['wins']}/{self.stats['trades_executed']})")
-        logger.info(f"[STATS] 总利润: ${self.stats['total_profit']:.2f}")
+        wins = stats['wins']
+        trades = stats['trades_executed']
+        logger.info("[STATS] 胜率: %.1f%% (%d/%d)", wins / max(trades, 1) * 100, wins, trades)
+        logger.info("[STATS] 总利润: $%.2f", stats['total_profit'])
 
     def get_statistics(self) -> Dict:
+        stats = self.stats
         return {
-            **self.stats,
-            'win_rate': self.stats['wins'] / max(self.stats['trades_executed'], 1),
+            **stats,
+            'win_rate': stats['wins'] / max(stats['trades_executed'], 1),
             'current_market': self.current_market.market_slug if self.current_market else None,
         }
 
@@ -20,6 +20,13 @@ import logging
 import time
 from typing import List
 
+import aiohttp
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from config import Config, get_config, logger
 
 class ArbitrageBot:
@@ -29,9 +36,12 @@ class ArbitrageBot:
         self.trade_executor = None
         self.arbitrage_engine = None
         self.market_monitor = None
+        # 监控器、套利引擎推送与交易执行器共用一个连接池
+        self.http_session = None
         
         self._running = False
         self._dry_run = False
+        self._stop_event = asyncio.Event()
         
         self.stats = {
             'opportunities_found': 0,
@@ -53,18 +63,25 @@ class ArbitrageBot:
         from arbitrage_engine import ArbitrageEngine
         from market_monitor import MarketMonitor
         
+        self.http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=60,
+            )
+        )
+        
         logger.info("[INIT] 初始化交易执行器...")
-        self.trade_executor = TradeExecutor(self.config, self.clob_client)
+        self.trade_executor = TradeExecutor(self.config, self.clob_client, session=self.http_session)
         
         logger.info("[INIT] 初始化套利引擎...")
         self.arbitrage_engine = ArbitrageEngine(
             self.config,
             self.clob_client,
             self.trade_executor,
+            session=self.http_session,
         )
         
         logger.info("[INIT] 初始化市场监控器...")
-        self.market_monitor = MarketMonitor(self.config, self.clob_client)
+        self.market_monitor = MarketMonitor(self.config, self.clob_client, session=self.http_session)
         
         await self.market_monitor.start()
         await self.arbitrage_engine.start()
@@ -144,63 +161,72 @@ class ArbitrageBot:
         start_time = time.time()
         iteration = 0
         
-        def handle_exit(sig, frame):
-            logger.info("\n[SHUTDOWN] 接收到退出信号...")
-            self._running = False
-        
-        signal.signal(signal.SIGINT, handle_exit)
-        signal.signal(signal.SIGTERM, handle_exit)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                # Windows 不支持 add_signal_handler，退回 signal.signal 并切回事件循环线程处理
+                signal.signal(sig, lambda s, f: loop.call_soon_threadsafe(self.stop))
         
         logger.info("[BOT] 开始套利循环... (Ctrl+C 退出)\n")
         
+        # 订单簿通过WebSocket推送，价格变化时由套利引擎即时评估并回调 _handle_opportunity
+        stream_task = asyncio.create_task(
+            self.arbitrage_engine.run_orderbook_stream(self._handle_opportunity)
+        )
+        
         interval = self.config.arbitrage.price_check_interval
         
-        while self._running:
-            try:
-                iteration += 1
+        # 收到退出信号或推送任务结束时立即醒来，不必等满一个 interval
+        stop_wait = asyncio.create_task(self._stop_event.wait())
+        while self._running and not stream_task.done():
+            iteration += 1
+            if iteration % max(1, int(60 / interval)) == 0:
                 elapsed = time.time() - start_time
-                
-                logger.info(f"[SCAN] 第 {iteration} 轮扫描 (已运行 {elapsed/60:.1f} 分钟)")
-                
-                opportunities = await self.arbitrage_engine.scan_all_markets()
-                
-                if opportunities:
-                    self.stats['opportunities_found'] += len(opportunities)
-                    logger.info(f"[SCAN] 发现 {len(opportunities)} 个套利机会")
-                    
-                    for opp in opportunities:
-                        if opp.profit_percent >= self.config.arbitrage.min_profit_threshold * 100:
-                            if self._dry_run:
-                                logger.info(f"\n[DRY-RUN] 发现套利机会（模拟模式不下单）:")
-                                logger.info(f"  市场: {opp.market_slug}")
-                                logger.info(f"  YES价格: {opp.yes_price:.4f}")
-                                logger.info(f"  NO价格: {opp.no_price:.4f}")
-                                logger.info(f"  价格总和: {opp.price_sum:.4f}")
-                                logger.info(f"  利润率: {opp.profit_percent:.2f}%")
-                                logger.info(f"  建议金额: ${opp.recommended_size:.2f}")
-                                
-                                self.stats['trades_executed'] += 1
-                                profit = opp.recommended_size * (1 - opp.price_sum)
-                                self.stats['total_profit'] += profit
-                                self.stats['total_volume'] += opp.recommended_size * 2
-                            else:
-                                success = await self.arbitrage_engine.execute_yes_no_arbitrage(opp)
-                                if success:
-                                    self.stats['trades_executed'] += 1
-                                    profit = opp.recommended_size * (1 - opp.price_sum)
-                                    self.stats['total_profit'] += profit
-                                    self.stats['total_volume'] += opp.recommended_size * 2
-                else:
-                    logger.info("[SCAN] 本轮未发现套利机会")
-                
-                await asyncio.sleep(interval)
-                
-            except Exception as e:
-                logger.error(f"[BOT] 套利循环错误: {e}")
-                await asyncio.sleep(5)
+                logger.info(f"[SCAN] 运行中 (已运行 {elapsed/60:.1f} 分钟，发现机会 {self.stats['opportunities_found']} 个)")
+            await asyncio.wait({stop_wait, stream_task}, timeout=interval, return_when=asyncio.FIRST_COMPLETED)
+        stop_wait.cancel()
+        
+        if stream_task.done() and not stream_task.cancelled() and stream_task.exception():
+            logger.error(f"[BOT] 套利循环错误: {stream_task.exception()}")
+        
+        await self.arbitrage_engine.stop()
+        stream_task.cancel()
+        try:
+            await stream_task
+        except asyncio.CancelledError:
+            pass
         
         await self.shutdown()
     
+    def stop(self):
+        logger.info("\n[SHUTDOWN] 接收到退出信号...")
+        self._running = False
+        self._stop_event.set()
+    
+    async def _handle_opportunity(self, opp):
+        # 引擎只回调已满足利润阈值的机会
+        self.stats['opportunities_found'] += 1
+        
+        if self._dry_run:
+            logger.info(f"\n[DRY-RUN] 发现套利机会（模拟模式不下单）:")
+            logger.info(f"  市场: {opp.market_slug}")
+            logger.info(f"  YES价格: {opp.yes_price:.4f}")
+            logger.info(f"  NO价格: {opp.no_price:.4f}")
+            logger.info(f"  价格总和: {opp.price_sum:.4f}")
+            logger.info(f"  利润率: {opp.profit_percent:.2f}%")
+            logger.info(f"  建议金额: ${opp.recommended_size:.2f}")
+            success = True
+        else:
+            success = await self.arbitrage_engine.execute_yes_no_arbitrage(opp)
+        
+        if success:
+            self.stats['trades_executed'] += 1
+            profit = opp.recommended_size * (1 - opp.price_sum)
+            self.stats['total_profit'] += profit
+            self.stats['total_volume'] += opp.recommended_size * 2
+    
     async def shutdown(self):
         logger.info("\n[SHUTDOWN] 正在关闭...")
         
@@ -212,6 +238,13 @@ class ArbitrageBot:
         if self.market_monitor:
             await self.market_monitor.stop()
         
+        if self.trade_executor:
+            await self.trade_executor.close_session()
+        
+        if self.http_session:
+            await self.http_session.close()
+            self.http_session = None
+        
         logger.info("[SHUTDOWN] 关闭完成")
     
     def print_summary(self):
@@ -267,4 +300,7 @@ async def main():
 
 
 if __name__ == "__main__":
+    # 优先使用 uvloop（libuv 事件循环），未安装时退回默认循环
+    if uvloop is not None:
+        uvloop.install()
     asyncio.run(main())
@@ -9,6 +9,8 @@ import time
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+from utils import _json_loads
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -23,13 +25,16 @@ class MarketInfo:
     end_date: str
 
 class MarketMonitor:
-    def __init__(self, config, clob_client=None):
+    def __init__(self, config, clob_client=None, session: Optional[aiohttp.ClientSession] = None):
         self.config = config
         self.clob_client = clob_client
         self.gamma_api_url = config.GAMMA_API_URL
+        self._markets_url = f"{self.gamma_api_url}/markets"
         
         self.markets: Dict[str, MarketInfo] = {}
-        self.session: Optional[aiohttp.ClientSession] = None
+        # 传入的共享会话由调用方负责关闭
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
         
         self.stats = {
             'markets_scanned': 0,
@@ -40,11 +45,16 @@ class MarketMonitor:
 
     async def start(self):
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            # 复用keepalive连接并缓存DNS，重复请求 Gamma API 时省去握手与解析
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=50, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=60,
+                )
+            )
         logger.info("[MONITOR] 市场监控器启动")
 
     async def stop(self):
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
             self.session = None
         logger.info("[MONITOR] 市场监控器停止")
@@ -58,7 +68,7 @@ class MarketMonitor:
             return []
         
         try:
-            markets = self.clob_client.get_simplified_markets()
+            markets = await asyncio.to_thread(self.clob_client.get_simplified_markets)
             if markets and 'data' in markets:
                 return markets['data'][:limit]
             return []
@@ -68,12 +78,11 @@ class MarketMonitor:
 
     async def fetch_markets_via_gamma(self, limit: int = 100) -> List[Dict]:
         try:
-            url = f"{self.gamma_api_url}/markets"
             params = {'limit': limit, 'active': 'true'}
             
-            async with self.session.get(url, params=params) as response:
+            async with self.session.get(self._markets_url, params=params) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = _json_loads(await response.read())
                     return data if isinstance(data, list) else []
                 else:
                     logger.error(f"[MONITOR] Gamma API请求失败: HTTP {response.status}")
@@ -84,12 +93,11 @@ class MarketMonitor:
 
     async def fetch_market_by_slug(self, slug: str) -> Optional[Dict]:
         try:
-            url = f"{self.gamma_api_url}/markets"
             params = {'slug': slug}
             
-            async with self.session.get(url, params=params) as response:
+            async with self.session.get(self._markets_url, params=params) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = _json_loads(await response.read())
                     if data and len(data) > 0:
                         return data[0]
                 return None
@@ -103,26 +111,15 @@ class MarketMonitor:
             if not tokens or len(tokens) < 2:
                 return None
             
-            yes_token = None
-            no_token = None
-            
-            for token in tokens:
-                outcome = token.get('outcome', '').upper()
-                token_id = token.get('token_id', '')
-                
-                if outcome == 'YES':
-                    yes_token = token_id
-                elif outcome == 'NO':
-                    no_token = token_id
+            outcomes = {t.get('outcome', '').upper(): t.get('token_id', '') for t in tokens}
+            yes_token = outcomes.get('YES')
+            no_token = outcomes.get('NO')
             
             if yes_token and no_token:
                 return yes_token, no_token
             
-            token_ids = [t.get('token_id', '') for t in tokens]
-            if len(token_ids) >= 2:
-                return token_ids[0], token_ids[1]
-            
-            return None
+            # 没有YES/NO标记时按顺序取前两个token
+            return tokens[0].get('token_id', ''), tokens[1].get('token_id', '')
             
         except Exception as e:
             logger.warning(f"[MONITOR] 解析市场tokens失败: {e}")
@@ -131,14 +128,19 @@ class MarketMonitor:
     async def scan_and_register_markets(self, arbitrage_engine, max_markets: int = 50):
         logger.info(f"[MONITOR] 开始扫描市场，最多 {max_markets} 个...")
         
-        markets_data = []
+        # 优先使用CLOB结果（parse_market_tokens 只认CLOB的 tokens 结构）；
+        # Gamma 同时预取，仅在CLOB为空或失败时使用，省去串行回退的一次往返
+        gamma_task = asyncio.create_task(self.fetch_markets_via_gamma(limit=max_markets))
         
+        markets_data = []
         if self.clob_client:
             markets_data = await self.fetch_markets_via_clob(limit=max_markets)
         
-        if not markets_data:
-            logger.info("[MONITOR] CLOB获取失败，尝试Gamma API...")
-            markets_data = await self.fetch_markets_via_gamma(limit=max_markets)
+        if markets_data:
+            gamma_task.cancel()
+        else:
+            logger.info("[MONITOR] CLOB获取失败，使用Gamma API结果...")
+            markets_data = await gamma_task
         
         if not markets_data:
             logger.warning("[MONITOR] 无法获取市场数据")
@@ -198,10 +200,17 @@ class MarketMonitor:
     async def register_specific_markets(self, arbitrage_engine, market_slugs: List[str]):
         logger.info(f"[MONITOR] 注册指定市场: {market_slugs}")
         
+        # 所有市场并发获取，启动耗时为最慢的一次请求而不是逐个累加
+        results = await asyncio.gather(
+            *(self.fetch_market_by_slug(slug) for slug in market_slugs),
+            return_exceptions=True,
+        )
+        
         registered = 0
-        for slug in market_slugs:
+        for slug, market_data in zip(market_slugs, results):
             try:
-                market_data = await self.fetch_market_by_slug(slug)
+                if isinstance(market_data, BaseException):
+                    raise market_data
                 if not market_data:
                     logger.warning(f"[MONITOR] 未找到市场: {slug}")
                     continue
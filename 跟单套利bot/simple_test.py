@@ -1,31 +1,77 @@
 """简单测试 - 验证价格监控和信号检测"""
 import asyncio
+import signal
 import time
 import logging
 import aiohttp
-import json
 import math
 from datetime import datetime, timezone
 
+from utils import KeepAliveConnector, PriceRing, _json_loads
+
+try:
+    import picows
+except ImportError:
+    picows = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s [%(levelname)s] %(message)s',
 )
 logger = logging.getLogger(__name__)
 
+if picows is not None:
+    class _BinanceListener(picows.WSListener):
+        """picows 在收到帧时同步回调，不经过 async for / Future 调度"""
+        def __init__(self, bot):
+            self.bot = bot
+
+        def on_ws_connected(self, transport):
+            logger.info("[BINANCE] WebSocket连接成功 (picows)")
+
+        def on_ws_frame(self, transport, frame):
+            if not self.bot._running:
+                transport.disconnect()
+                return
+            if frame.msg_type == picows.WSMsgType.TEXT:
+                if self.bot._armed:
+                    self.bot._on_trade(frame.get_payload_as_bytes())
+            elif frame.msg_type == picows.WSMsgType.PING:
+                transport.send_pong(frame.get_payload_as_bytes())
+            elif frame.msg_type == picows.WSMsgType.CLOSE:
+                transport.disconnect()
+
 class SimpleBTCArbitrage:
     def __init__(self):
-        self.binance_prices = []
+        # 价格/时间戳按列存放的定长环形缓冲区，写满后覆盖最旧记录
+        self.binance_prices = PriceRing(128)
         self.current_market = None
         self.price_change_threshold = 0.001
         self.lookback_seconds = 5
         self._running = False
+        self._stop: asyncio.Event = None
+        # 有可交易市场且未进入收尾阶段时才处理成交；未就绪时连JSON都不解析
+        self._armed = False
         
     async def monitor_binance(self):
         ws_url = "wss://stream.binance.com:9443/ws/btcusdt@trade"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.ws_connect(ws_url) as ws:
+        # 优先用 picows（帧到达即回调），未安装时退回 aiohttp
+        if picows is not None:
+            transport, _ = await picows.ws_connect(lambda: _BinanceListener(self), ws_url)
+            try:
+                await transport.wait_disconnected()
+            finally:
+                transport.disconnect()
+            return
+        
+        async with aiohttp.ClientSession(connector=KeepAliveConnector()) as session:
+            async with session.ws_connect(ws_url, compress=0, autoping=True, heartbeat=15) as ws:
                 logger.info("[BINANCE] WebSocket连接成功")
                 
                 async for msg in ws:
@@ -33,24 +79,23 @@ class SimpleBTCArbitrage:
                         break
                     
                     if msg.type == aiohttp.WSMsgType.TEXT:
-                        data = json.loads(msg.data)
-                        price = float(data.get('p', 0))
-                        
-                        if price > 0:
-                            self.binance_prices.append({
-                                'price': price,
-                                'timestamp': time.time()
-                            })
-                            
-                            while len(self.binance_prices) > 100:
-                                self.binance_prices.pop(0)
-                            
-                            await self.analyze_price()
+                        self._on_trade(msg.data)
+    
+    def _on_trade(self, raw):
+        if not self._armed:
+            return
+        data = _json_loads(raw)
+        price = float(data.get('p', 0))
+        
+        if price > 0:
+            self.binance_prices.append(price, time.monotonic())
+            
+            self.analyze_price()
     
     async def monitor_market(self):
         gamma_api = "https://gamma-api.polymarket.com"
         
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(connector=KeepAliveConnector()) as session:
             while self._running:
                 try:
                     now = time.time()
@@ -61,7 +106,7 @@ class SimpleBTCArbitrage:
                     params = {'slug': slug}
                     
                     async with session.get(url, params=params) as resp:
-                        data = await resp.json()
+                        data = _json_loads(await resp.read())
                     
                     if data:
                         event = data[0] if isinstance(data, list) else data
@@ -86,33 +131,36 @@ class SimpleBTCArbitrage:
                                                     'up_price': 0.5,
                                                     'down_price': 0.5
                                                 }
+                                                self._armed = True
                                                 logger.info(f"\n{'='*60}")
                                                 logger.info(f"[MARKET] 发现活跃市场: {m.get('slug')}")
                                                 logger.info(f"[MARKET] 剩余时间: {remaining:.0f}秒")
                                                 logger.info(f"{'='*60}\n")
                     
-                    await asyncio.sleep(5)
+                    # slug 由5分钟区间决定：当前区间的市场已找到时直接睡到下个区间边界，未找到时每秒重试
+                    if self.current_market and self.current_market['slug'] == slug:
+                        await asyncio.sleep(max(0.25, current_ts + 300 - time.time()))
+                    else:
+                        await asyncio.sleep(1)
                     
                 except Exception as e:
                     logger.error(f"[MARKET] 监控错误: {e}")
                     await asyncio.sleep(1)
     
-    async def analyze_price(self):
+    def analyze_price(self):
         if not self.current_market:
             return
         
-        now = time.time()
-        
-        if now > self.current_market['end_time'] - 10:
+        # 市场结束时间是墙钟时间；价格窗口用单调时钟，不受系统校时跳变影响
+        if time.time() > self.current_market['end_time'] - 10:
+            self._armed = False
             return
         
-        recent = [p for p in self.binance_prices if p['timestamp'] >= now - self.lookback_seconds]
+        count, first, last = self.binance_prices.window_since(time.monotonic() - self.lookback_seconds)
         
-        if len(recent) < 3:
+        if count < 3:
             return
         
-        first = recent[0]['price']
-        last = recent[-1]['price']
         change = (last - first) / first
         
         if abs(change) >= self.price_change_threshold:
@@ -128,26 +176,47 @@ class SimpleBTCArbitrage:
     
     async def run(self):
         self._running = True
+        # 在运行中的事件循环里创建，退出前主协程不再定时醒来
+        self._stop = asyncio.Event()
+        
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                signal.signal(sig, lambda s, f: loop.call_soon_threadsafe(self.stop))
         
         logger.info("="*60)
         logger.info("[BOT] BTC延迟套利测试启动")
         logger.info("="*60)
         
-        tasks = [
-            asyncio.create_task(self.monitor_binance()),
-            asyncio.create_task(self.monitor_market()),
-        ]
+        # Python 3.12+ 的 eager 任务工厂：新任务在创建时同步跑到第一个 await，少一轮调度
+        eager_task_factory = getattr(asyncio, 'eager_task_factory', None)
+        if eager_task_factory is not None:
+            loop.set_task_factory(eager_task_factory)
         
+        # 任一监控任务异常时 TaskGroup 取消其余任务；正常退出时由这里取消后统一等待结束
         try:
-            while self._running:
-                await asyncio.sleep(1)
-        except asyncio.CancelledError:
-            pass
-        finally:
-            for task in tasks:
-                task.cancel()
-            await asyncio.gather(*tasks, return_exceptions=True)
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    tg.create_task(self.monitor_binance()),
+                    tg.create_task(self.monitor_market()),
+                ]
+                await self._stop.wait()
+                for task in tasks:
+                    task.cancel()
+        except* Exception as eg:
+            for e in eg.exceptions:
+                logger.error("[BOT] 监控任务异常退出: %s", e)
+    
+    def stop(self):
+        logger.info("[BOT] 接收到退出信号...")
+        self._running = False
+        if self._stop is not None:
+            self._stop.set()
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        uvloop.install()
     bot = SimpleBTCArbitrage()
     asyncio.run(bot.run())
@@ -5,17 +5,44 @@ Polymarket套利机器人 - 交易执行模块 (优化版)
 import asyncio
 import time
 import logging
-from typing import Optional, Dict, Any
-from dataclasses import dataclass
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
+from dataclasses import dataclass, field
 import aiohttp
+from py_clob_client.clob_types import MarketOrderArgs, OrderArgs, OrderType
+from py_clob_client.order_builder.constants import BUY, SELL
+
+from utils import KeepAliveConnector, _json_loads
+
+try:
+    from py_clob_client.clob_types import PostOrdersArgs
+except ImportError:
+    PostOrdersArgs = None
 
 logger = logging.getLogger(__name__)
 
+CLOB_BASE_URL = "https://clob.polymarket.com"
+_SIDE = {"BUY": BUY, "SELL": SELL, "buy": BUY, "sell": SELL}
+# 旧版 py_clob_client 没有 FAK，只收录当前版本存在的类型
+_ORDER_TYPES = {
+    name: getattr(OrderType, name)
+    for name in ("GTC", "FOK", "GTD", "FAK")
+    if hasattr(OrderType, name)
+}
+# 空闲连接保活间隔（秒），需小于连接池的 keepalive_timeout
+KEEPALIVE_INTERVAL = 25
+# 挂单最长跟踪时间（秒）
+PENDING_MAX_AGE = 3600
+
 @dataclass
 class OrderResult:
     success: bool
     order_id: str = ""
     filled_size: float = 0.0
+    # 实际成交的份额（来自下单响应），市价BUY按限价只保证 金额/限价 份
+    filled_shares: float = 0.0
     avg_price: float = 0.0
     error_message: str = ""
 
@@ -24,20 +51,52 @@ class TokenInfo:
     tick_size: float
     neg_risk: bool
     fee_rate: float
-    last_updated: float
+    # 缓存过期时刻（time.monotonic_ns），命中判断只做一次整数比较
+    expires_at_ns: int
+    tick_inv: float = field(init=False)
+
+    def __post_init__(self):
+        self.tick_inv = 1.0 / self.tick_size if self.tick_size > 0 else 100.0
+
+def _align_price(price: float, info: TokenInfo) -> float:
+    """按tick对齐价格，并限制在 [tick, 1 - tick] 的有效区间内"""
+    inv = info.tick_inv
+    aligned = round(price * inv) / inv
+    return min(max(aligned, info.tick_size), 1.0 - info.tick_size)
+
+def _align_size(size: float) -> float:
+    return round(size * 100) / 100
+
+def _response_shares(response: Dict, side: str) -> float:
+    """从下单响应取成交份额：BUY 收到的是 takingAmount，SELL 付出的是 makingAmount"""
+    key = 'takingAmount' if side.upper() == "BUY" else 'makingAmount'
+    try:
+        return float(response.get(key) or 0)
+    except (TypeError, ValueError):
+        return 0.0
 
 class FastTradeExecutor:
-    def __init__(self, config, clob_client):
+    def __init__(self, config, clob_client, session: Optional[aiohttp.ClientSession] = None):
         self.config = config
         self.clob_client = clob_client
         
         self.pending_orders: Dict[str, Dict] = {}
-        self.order_history: list = []
+        self.order_history: deque = deque(maxlen=10_000)
         
         self.token_cache: Dict[str, TokenInfo] = {}
         self.cache_ttl = 3600
+        # 进行中的token参数请求，并发调用方共享同一次请求
+        self._token_inflight: Dict[str, asyncio.Task] = {}
+        
+        # 传入的共享会话由调用方负责关闭
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        self._keepalive_task: Optional[asyncio.Task] = None
         
-        self.session: Optional[aiohttp.ClientSession] = None
+        # clob_client 的签名/下单是同步调用：签名与HTTP提交分用两个线程池，
+        # 一笔订单提交等待响应时不占用下一笔订单的签名线程
+        self._sign_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="clob-sign")
+        self._io_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="clob-post")
         
         self.stats = {
             'orders_placed': 0,
@@ -52,31 +111,80 @@ class FastTradeExecutor:
 
     async def init_session(self):
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            self.session = aiohttp.ClientSession(
+                connector=KeepAliveConnector(
+                    limit=64, ttl_dns_cache=300, keepalive_timeout=75, enable_cleanup_closed=True,
+                ),
+                timeout=aiohttp.ClientTimeout(total=2, sock_connect=0.5),
+            )
+
+    async def prewarm(self):
+        """提前完成到CLOB的TLS握手，并在后台定时保活，避免信号触发后首个请求付握手延迟"""
+        await self.init_session()
+        if self._keepalive_task is not None:
+            return
+        await self._ping_clob()
+        self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+
+    async def _ping_clob(self):
+        try:
+            async with self.session.head(CLOB_BASE_URL) as resp:
+                await resp.release()
+        except Exception as e:
+            logger.debug("[TRADE] CLOB连接保活失败: %s", e)
+
+    async def _keepalive_loop(self):
+        while self.session and not self.session.closed:
+            await asyncio.sleep(KEEPALIVE_INTERVAL)
+            await self._ping_clob()
+
+    async def _sign(self, create, order_args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._sign_executor, create, order_args)
+
+    async def _post(self, signed_order, order_type):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._io_executor,
+            functools.partial(self.clob_client.post_order, signed_order, orderType=order_type),
+        )
 
     async def close_session(self):
-        if self.session:
+        if self._keepalive_task:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        if self.session and self._owns_session:
             await self.session.close()
             self.session = None
+        # 不等待进行中的签名/提交，线程在当前调用结束后退出
+        self._sign_executor.shutdown(wait=False)
+        self._io_executor.shutdown(wait=False)
 
     async def prefetch_token_info(self, token_id: str) -> TokenInfo:
-        if token_id in self.token_cache:
-            cached = self.token_cache[token_id]
-            if time.time() - cached.last_updated < self.cache_ttl:
-                self.stats['cache_hits'] += 1
-                return cached
+        cached = self.token_cache.get(token_id)
+        if cached is not None and cached.expires_at_ns > time.monotonic_ns():
+            self.stats['cache_hits'] += 1
+            return cached
         
         self.stats['cache_misses'] += 1
         
-        await self.init_session()
+        task = self._token_inflight.get(token_id)
+        if task is None:
+            task = asyncio.create_task(self._batch_token_info(token_id))
+            self._token_inflight[token_id] = task
+            task.add_done_callback(lambda _t, t=token_id: self._token_inflight.pop(t, None))
         
-        base_url = "https://clob.polymarket.com"
+        # shield: 某个调用方被取消时不影响共享同一请求的其他调用方
+        return await asyncio.shield(task)
+
+    async def _batch_token_info(self, token_id: str) -> TokenInfo:
+        await self.init_session()
         
         async def fetch(endpoint):
-            url = f"{base_url}{endpoint}"
+            url = f"{CLOB_BASE_URL}{endpoint}"
             async with self.session.get(url) as resp:
                 if resp.status == 200:
-                    return await resp.json()
+                    return _json_loads(await resp.read())
                 return None
         
         tick_size = 0.01
@@ -103,22 +211,72 @@ class FastTradeExecutor:
             tick_size=tick_size,
             neg_risk=neg_risk,
             fee_rate=fee_rate,
-            last_updated=time.time()
+            expires_at_ns=time.monotonic_ns() + self.cache_ttl * 1_000_000_000,
         )
         
         self.token_cache[token_id] = info
-        logger.info(f"[TRADE] 预获取token参数: {token_id[:20]}... tick={tick_size}, neg_risk={neg_risk}")
+        logger.info("[TRADE] 预获取token参数: %s... tick=%s, neg_risk=%s", token_id[:20], tick_size, neg_risk)
         
         return info
 
     async def prefetch_market(self, up_token_id: str, down_token_id: str):
         start = time.time()
+        await self.prewarm()
         await asyncio.gather(
             self.prefetch_token_info(up_token_id),
             self.prefetch_token_info(down_token_id),
         )
         elapsed = time.time() - start
-        logger.info(f"[TRADE] 市场参数预加载完成: {elapsed*1000:.0f}ms")
+        logger.info("[TRADE] 市场参数预加载完成: %.0fms", elapsed*1000)
+
+    async def _signed_market_order(self, token_id: str, side: str, amount: float, price: float):
+        """按tick对齐参数并签名，返回 (signed_order, amount, price)"""
+        token_info = await self.prefetch_token_info(token_id)
+        price = _align_price(price, token_info)
+        amount = _align_size(amount)
+        
+        side_const = _SIDE.get(side) or (BUY if side.upper() == "BUY" else SELL)
+        
+        logger.info("[TRADE] 创建市价单: %s $%.2f @ %.4f", side, amount, price)
+        
+        order_args = MarketOrderArgs(
+            token_id=token_id,
+            amount=amount,
+            side=side_const,
+            price=price,
+        )
+        signed_order = await self._sign(self.clob_client.create_market_order, order_args)
+        return signed_order, amount, price
+
+    def _market_order_result(self, response, side: str, amount: float, price: float, start: float) -> OrderResult:
+        elapsed = time.time() - start
+        
+        failed = isinstance(response, BaseException)
+        if not failed and response and response.get('orderID'):
+            order_id = response.get('orderID', '')
+            self.stats['orders_placed'] += 1
+            self.stats['orders_filled'] += 1
+            self.stats['total_volume'] += amount
+            
+            logger.info("[TRADE] 订单成交: %s (耗时: %.0fms)", order_id, elapsed*1000)
+            
+            return OrderResult(
+                success=True,
+                order_id=order_id,
+                filled_size=amount,
+                filled_shares=_response_shares(response, side),
+                avg_price=price,
+            )
+        
+        if failed:
+            error_msg = str(response)
+        elif response:
+            error_msg = response.get('error') or response.get('errorMsg') or 'Unknown error'
+        else:
+            error_msg = 'No response'
+        logger.warning("[TRADE] 订单未成交: %s (耗时: %.0fms)", error_msg, elapsed*1000)
+        self.stats['orders_failed'] += 1
+        return OrderResult(success=False, error_message=error_msg)
 
     async def place_market_order_fast(
         self,
@@ -130,59 +288,71 @@ class FastTradeExecutor:
         start = time.time()
         
         try:
-            from py_clob_client.clob_types import MarketOrderArgs, OrderType
-            from py_clob_client.order_builder.constants import BUY, SELL
-            
-            token_info = await self.prefetch_token_info(token_id)
-            
-            side_const = BUY if side.upper() == "BUY" else SELL
-            
-            order_args = MarketOrderArgs(
-                token_id=token_id,
-                amount=amount,
-                side=side_const,
-                price=price,
-            )
-            
-            logger.info(f"[TRADE] 创建市价单: {side} ${amount:.2f} @ {price:.4f}")
-            
-            signed_order = self.clob_client.create_market_order(order_args)
+            signed_order, amount, price = await self._signed_market_order(token_id, side, amount, price)
             
             if not signed_order:
                 logger.error("[TRADE] 创建订单签名失败")
                 self.stats['orders_failed'] += 1
                 return OrderResult(success=False, error_message="签名失败")
             
-            response = self.clob_client.post_order(signed_order, orderType=OrderType.FOK)
-            
-            elapsed = time.time() - start
-            
-            if response and response.get('orderID'):
-                order_id = response.get('orderID', '')
-                self.stats['orders_placed'] += 1
-                self.stats['orders_filled'] += 1
-                self.stats['total_volume'] += amount
-                
-                logger.info(f"[TRADE] 订单成交: {order_id} (耗时: {elapsed*1000:.0f}ms)")
-                
-                return OrderResult(
-                    success=True,
-                    order_id=order_id,
-                    filled_size=amount,
-                    avg_price=price,
-                )
-            else:
-                error_msg = response.get('error', 'Unknown error') if response else 'No response'
-                logger.warning(f"[TRADE] 订单未成交: {error_msg} (耗时: {elapsed*1000:.0f}ms)")
-                self.stats['orders_failed'] += 1
-                return OrderResult(success=False, error_message=error_msg)
+            response = await self._post(signed_order, OrderType.FOK)
+            return self._market_order_result(response, side, amount, price, start)
                 
         except Exception as e:
             elapsed = time.time() - start
-            logger.error(f"[TRADE] 下单异常: {e} (耗时: {elapsed*1000:.0f}ms)")
+            logger.error("[TRADE] 下单异常: %s (耗时: %.0fms)", e, elapsed*1000)
             self.stats['orders_failed'] += 1
             return OrderResult(success=False, error_message=str(e))
 
+    async def place_market_order_pair(self, legs: List[Tuple[str, str, float, float]]) -> List[OrderResult]:
+        """
+        多条腿 (token_id, side, amount, price) 并发签名后一次批量提交（FOK），各腿同时到达撮合；
+        客户端不支持 post_orders 时退回并发逐笔提交
+        """
+        start = time.time()
+        
+        signed = await asyncio.gather(
+            *(self._signed_market_order(*leg) for leg in legs),
+            return_exceptions=True,
+        )
+        
+        results: List[Optional[OrderResult]] = [None] * len(legs)
+        ready = []
+        for i, item in enumerate(signed):
+            if isinstance(item, BaseException) or not item[0]:
+                error_msg = str(item) if isinstance(item, BaseException) else "签名失败"
+                logger.error("[TRADE] 创建订单签名失败: %s", error_msg)
+                self.stats['orders_failed'] += 1
+                results[i] = OrderResult(success=False, error_message=error_msg)
+            else:
+                ready.append((i, item))
+        
+        if not ready:
+            return results
+        
+        try:
+            if PostOrdersArgs is not None and hasattr(self.clob_client, 'post_orders'):
+                loop = asyncio.get_running_loop()
+                responses = await loop.run_in_executor(
+                    self._io_executor,
+                    self.clob_client.post_orders,
+                    [PostOrdersArgs(order=order, orderType=OrderType.FOK) for _, (order, _a, _p) in ready],
+                )
+            else:
+                responses = await asyncio.gather(
+                    *(self._post(order, OrderType.FOK) for _, (order, _a, _p) in ready),
+                    return_exceptions=True,
+                )
+        except Exception as e:
+            responses = [e] * len(ready)
+        
+        if not isinstance(responses, list) or len(responses) != len(ready):
+            responses = [responses if isinstance(responses, BaseException) else None] * len(ready)
+        
+        for (i, (_order, amount, price)), response in zip(ready, responses):
+            results[i] = self._market_order_result(response, legs[i][1], amount, price, start)
+        return results
+
     async def place_market_order(
         self,
         token_id: str,
@@ -203,12 +373,11 @@ class FastTradeExecutor:
         start = time.time()
         
         try:
-            from py_clob_client.clob_types import OrderArgs, OrderType
-            from py_clob_client.order_builder.constants import BUY, SELL
-            
             token_info = await self.prefetch_token_info(token_id)
+            price = _align_price(price, token_info)
+            size = _align_size(size)
             
-            side_const = BUY if side.upper() == "BUY" else SELL
+            side_const = _SIDE.get(side) or (BUY if side.upper() == "BUY" else SELL)
             
             order_args = OrderArgs(
                 token_id=token_id,
@@ -217,17 +386,17 @@ class FastTradeExecutor:
                 side=side_const,
             )
             
-            logger.info(f"[TRADE] 创建限价单: {side} {size:.2f}股 @ {price:.4f}")
+            logger.info("[TRADE] 创建限价单: %s %.2f股 @ %.4f", side, size, price)
             
-            signed_order = self.clob_client.create_order(order_args)
+            signed_order = await self._sign(self.clob_client.create_order, order_args)
             
             if not signed_order:
                 logger.error("[TRADE] 创建订单签名失败")
                 self.stats['orders_failed'] += 1
                 return OrderResult(success=False, error_message="签名失败")
             
-            order_type_enum = getattr(OrderType, order_type, OrderType.GTC)
-            response = self.clob_client.post_order(signed_order, orderType=order_type_enum)
+            order_type_enum = _ORDER_TYPES.get(order_type, OrderType.GTC)
+            response = await self._post(signed_order, order_type_enum)
             
             elapsed = time.time() - start
             
@@ -235,7 +404,7 @@ class FastTradeExecutor:
                 order_id = response.get('orderID', '')
                 self.stats['orders_placed'] += 1
                 
-                logger.info(f"[TRADE] 限价单已挂出: {order_id} (耗时: {elapsed*1000:.0f}ms)")
+                logger.info("[TRADE] 限价单已挂出: %s (耗时: %.0fms)", order_id, elapsed*1000)
                 
                 self.pending_orders[order_id] = {
                     'token_id': token_id,
@@ -253,13 +422,13 @@ class FastTradeExecutor:
                 )
             else:
                 error_msg = response.get('error', 'Unknown error') if response else 'No response'
-                logger.warning(f"[TRADE] 限价单失败: {error_msg}")
+                logger.warning("[TRADE] 限价单失败: %s", error_msg)
                 self.stats['orders_failed'] += 1
                 return OrderResult(success=False, error_message=error_msg)
                 
         except Exception as e:
             elapsed = time.time() - start
-            logger.error(f"[TRADE] 限价单异常: {e} (耗时: {elapsed*1000:.0f}ms)")
+            logger.error("[TRADE] 限价单异常: %s (耗时: %.0fms)", e, elapsed*1000)
             self.stats['orders_failed'] += 1
             return OrderResult(success=False, error_message=str(e))
 
@@ -270,11 +439,11 @@ class FastTradeExecutor:
             if order_id in self.pending_orders:
                 del self.pending_orders[order_id]
             
-            logger.info(f"[TRADE] 订单已取消: {order_id}")
+            logger.info("[TRADE] 订单已取消: %s", order_id)
             return True
             
         except Exception as e:
-            logger.error(f"[TRADE] 取消订单失败: {e}")
+            logger.error("[TRADE] 取消订单失败: %s", e)
             return False
 
     async def cancel_all_orders(self) -> int:
@@ -283,23 +452,30 @@ class FastTradeExecutor:
             cancelled_count = len(self.pending_orders)
             self.pending_orders.clear()
             
-            logger.info(f"[TRADE] 已取消所有订单: {cancelled_count}个")
+            logger.info("[TRADE] 已取消所有订单: %s个", cancelled_count)
             return cancelled_count
             
         except Exception as e:
-            logger.error(f"[TRADE] 批量取消失败: {e}")
+            logger.error("[TRADE] 批量取消失败: %s", e)
             return 0
 
     async def get_order_status(self, order_id: str) -> Optional[Dict]:
         try:
-            order = self.clob_client.get_order(order_id)
-            return order
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._io_executor, self.clob_client.get_order, order_id)
         except Exception as e:
-            logger.warning(f"[TRADE] 获取订单状态失败: {e}")
+            logger.warning("[TRADE] 获取订单状态失败: %s", e)
             return None
 
     async def check_pending_orders(self):
+        # 超过 PENDING_MAX_AGE 仍未结束的挂单不再跟踪，避免状态查询失败时条目一直累积
+        cutoff = time.time() - PENDING_MAX_AGE
         for order_id, order_info in list(self.pending_orders.items()):
+            if order_info['placed_at'] < cutoff:
+                self.pending_orders.pop(order_id, None)
+                logger.warning("[TRADE] 挂单超时不再跟踪: %s", order_id)
+                continue
+            
             status = await self.get_order_status(order_id)
             
             if status:
@@ -309,12 +485,12 @@ class FastTradeExecutor:
                     self.stats['orders_filled'] += 1
                     filled_size = float(status.get('sizeMatched', 0))
                     self.stats['total_volume'] += filled_size * order_info['price']
-                    del self.pending_orders[order_id]
-                    logger.info(f"[TRADE] 订单已成交: {order_id}")
+                    self.pending_orders.pop(order_id, None)
+                    logger.info("[TRADE] 订单已成交: %s", order_id)
                     
                 elif order_status in ['CANCELLED', 'EXPIRED']:
-                    del self.pending_orders[order_id]
-                    logger.info(f"[TRADE] 订单已结束: {order_id} ({order_status})")
+                    self.pending_orders.pop(order_id, None)
+                    logger.info("[TRADE] 订单已结束: %s (%s)", order_id, order_status)
 
     def get_statistics(self) -> Dict:
         return {
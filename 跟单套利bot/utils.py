@@ -0,0 +1,77 @@
+"""
+机器人共用的小工具：JSON解码、网络连接器与价格环形缓冲区（不依赖 py_clob_client）
+"""
+import json
+import logging
+import socket
+from array import array
+from bisect import bisect_left
+
+import aiohttp
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+
+class KeepAliveConnector(aiohttp.TCPConnector):
+    """新建连接时开启 TCP_NODELAY 与 TCP keepalive，空闲连接断开能被系统及时发现"""
+
+    async def _wrap_create_connection(self, *args, **kwargs):
+        transport, proto = await super()._wrap_create_connection(*args, **kwargs)
+        sock = transport.get_extra_info('socket')
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+                if hasattr(socket, 'TCP_KEEPIDLE'):
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30)
+            except OSError as e:
+                logger.debug("[NET] 设置socket选项失败: %s", e)
+        return transport, proto
+
+
+class PriceRing:
+    """
+    定长环形缓冲区，价格/时间戳/成交量按列分别存放在 array('d') 中（结构数组），
+    写满后覆盖最旧的记录；时间戳按写入顺序递增，回看窗口用二分查找定位
+    """
+    __slots__ = ('capacity', 'prices', 'timestamps', 'volumes', 'count')
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.prices = array('d', bytes(8 * capacity))
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.volumes = array('d', bytes(8 * capacity))
+        self.count = 0  # 累计写入条数，count % capacity 为下一个写入位置
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def append(self, price: float, timestamp: float, volume: float = 0.0):
+        i = self.count % self.capacity
+        self.prices[i] = price
+        self.timestamps[i] = timestamp
+        self.volumes[i] = volume
+        self.count += 1
+
+    def window_since(self, cutoff: float):
+        """返回 (窗口内条数, 窗口内最早价格, 最新价格)，窗口为 timestamp >= cutoff"""
+        count = self.count
+        if not count:
+            return 0, 0.0, 0.0
+        capacity = self.capacity
+        timestamps = self.timestamps
+        start = bisect_left(
+            range(count - len(self), count), cutoff,
+            key=lambda j: timestamps[j % capacity],
+        ) + count - len(self)
+        return (
+            count - start,
+            self.prices[start % capacity],
+            self.prices[(count - 1) % capacity],
+        )